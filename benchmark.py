@@ -0,0 +1,519 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import tempfile
+import threading
+import contextlib
+import subprocess
+import tracemalloc
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_PATH = os.path.join('.benchmarks', 'history.jsonl')
+
+# Synthetic repository sizes (activity spread over the last 30 months)
+PROFILES = {
+    "small": {"commits": 300, "issues": 120, "prs": 80, "releases": 6, "contributors": 8},
+    "medium": {"commits": 3000, "issues": 1500, "prs": 1000, "releases": 40, "contributors": 80},
+    "huge": {"commits": 25000, "issues": 10000, "prs": 8000, "releases": 250, "contributors": 600}
+}
+
+# Regressions: any growth in requests or pages, or time/peak memory growing by more than these shares
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.20
+
+LABELS = ["bug", "enhancement", "feature", "regression", "documentation", "question", "dependencies"]
+MESSAGES = [
+    "fix: handle empty input", "feat: add option", "refactor parser", "chore(deps): bump lodash",
+    "docs: update readme", "breaking change: drop node 14", "revert \"feat: add option\"",
+    "test: cover edge case", "perf: cache lookups", "merge pull request #1 from fork/branch"
+]
+
+# ==================== SYNTHETIC REPOSITORIES ====================
+def iso(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ') if moment else None
+
+def parse_date(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+def build_repository(profile, now):
+    """Synthetic repository of a profile's size, the same on every run (dates relative to now)"""
+    sizes = PROFILES[profile]
+    rng = random.Random(profile)
+    window_start = now - timedelta(days=913)
+    people = [f"dev{i}" for i in range(sizes["contributors"])]
+
+    def moment(after=None):
+        start = after or window_start
+        return start + (now - start) * rng.random()
+
+    commits = []
+    for i in range(sizes["commits"]):
+        authored = moment()
+        commits.append({
+            "sha": hashlib.sha1(f"{profile}:{i}".encode()).hexdigest(),
+            "authored_at": authored,
+            "committed_at": min(now, authored + timedelta(minutes=rng.randint(0, 600))),
+            "author": rng.choice(people) if rng.random() < 0.95 else None,
+            "message": rng.choice(MESSAGES),
+            "additions": int(rng.paretovariate(1.2) * 10),
+            "deletions": int(rng.paretovariate(1.3) * 5)
+        })
+    commits.sort(key=lambda c: c["committed_at"], reverse=True)
+
+    # Issues and pull requests share one number sequence, as on GitHub
+    kinds = ["issue"] * sizes["issues"] + ["pr"] * sizes["prs"]
+    rng.shuffle(kinds)
+    items = []
+    for number, kind in enumerate(kinds, 1):
+        created = moment()
+        item = {"number": number, "kind": kind, "created_at": created, "author": rng.choice(people)}
+        if kind == "issue":
+            item["closed_at"] = moment(created) if rng.random() < 0.7 else None
+            item["comments"] = sorted(moment(created) for _ in range(rng.choice([0, 0, 1, 2, 3, 5])))
+            item["reopened"] = [moment(created)] if rng.random() < 0.05 else []
+            item["labels"] = rng.sample(LABELS, rng.choice([0, 1, 1, 2]))
+            changes = [created, item["closed_at"], *item["comments"], *item["reopened"]]
+        else:
+            item["merged_at"] = moment(created) if rng.random() < 0.6 else None
+            item["closed_at"] = item["merged_at"] or (moment(created) if rng.random() < 0.3 else None)
+            item["reviewers"] = [rng.choice(people) if rng.random() < 0.98 else None for _ in range(rng.choice([0, 1, 1, 2, 3]))]
+            item["review_comments"] = rng.randint(0, 6)
+            changes = [created, item["closed_at"]]
+        item["updated_at"] = max(change for change in changes if change)
+        items.append(item)
+    items.sort(key=lambda i: i["updated_at"], reverse=True)
+
+    releases = sorted((moment() for _ in range(sizes["releases"])), reverse=True)
+    return {
+        "created_at": now - timedelta(days=2200),
+        "pushed_at": commits[0]["committed_at"] if commits else now - timedelta(days=2200),
+        "updated_at": now - timedelta(days=1),
+        "commits": commits,
+        "commits_by_sha": {commit["sha"]: commit for commit in commits},
+        "items": items,
+        "items_by_number": {item["number"]: item for item in items},
+        "releases": [{"published_at": published, "body": "Breaking change: new API" if rng.random() < 0.1 else "Bug fixes"}
+                     for published in releases],
+        "contributors": people
+    }
+
+# ==================== STAND-IN API SERVER ====================
+class StandInAPI(ThreadingHTTPServer):
+    """Local stand-in for the GitHub REST and GraphQL endpoints collect.py uses.
+
+    Serves one synthetic repository per profile as benchmark/<profile>, counting the requests
+    and list pages it answers (read from /_benchmark/stats, which isn't counted).
+    """
+
+    daemon_threads = True
+    request_queue_size = 64
+
+    def __init__(self, now):
+        super().__init__(("127.0.0.1", 0), APIRequestHandler)
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.now = now
+        self.repositories = {}
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.pages = 0
+
+    def repository(self, profile):
+        with self.lock:
+            if profile not in self.repositories:
+                self.repositories[profile] = build_repository(profile, self.now)
+            return self.repositories[profile]
+
+    def count(self, page):
+        with self.lock:
+            self.requests += 1
+            self.pages += page
+
+class APIRequestHandler(BaseHTTPRequestHandler):
+    """One stand-in API request (REST GET or GraphQL POST)"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, as api.github.com
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = dict(parse_qsl(parts.query))
+        path = parts.path.strip("/").split("/")
+
+        if path == ["_benchmark", "stats"]:
+            return self.send_json({"requests": self.server.requests, "pages": self.server.pages})
+        if len(path) < 3 or path[:2] != ["repos", "benchmark"] or path[2] not in PROFILES:
+            return self.send_json({"message": "Not Found"}, 404)
+
+        repo = self.server.repository(path[2])
+        base = f"{self.server.url}/repos/benchmark/{path[2]}"
+        route = path[3:]
+
+        if not route:
+            return self.send_json(self.repo_json(path[2], repo), page=False)
+        if route == ["commits"]:
+            commits = [c for c in repo["commits"]
+                       if ("since" not in query or c["committed_at"] >= parse_date(query["since"]))
+                       and ("until" not in query or c["committed_at"] <= parse_date(query["until"]))]
+            return self.send_page(commits, query, lambda c: self.commit_json(base, c))
+        if route[0] == "commits" and len(route) == 2:
+            commit = repo["commits_by_sha"][route[1]]
+            stats = {"additions": commit["additions"], "deletions": commit["deletions"],
+                     "total": commit["additions"] + commit["deletions"]}
+            return self.send_json({**self.commit_json(base, commit), "stats": stats, "files": []}, page=False)
+        if route == ["issues"]:
+            issues = [i for i in repo["items"] if self.matches_state(i, query)
+                      and ("since" not in query or i["updated_at"] >= parse_date(query["since"]))]
+            return self.send_page(issues, query, lambda i: self.issue_json(base, i))
+        if route[0] == "issues":
+            item = repo["items_by_number"][int(route[1])]
+            if len(route) == 2:
+                return self.send_json(self.issue_json(base, item), page=False)
+            if route[2] == "comments":
+                comments = [{"id": n, "created_at": iso(at), "user": {"login": "reviewer"}, "body": ""}
+                            for n, at in enumerate(item.get("comments", []))]
+                return self.send_page(comments, query)
+            events = [{"id": n, "event": "reopened", "created_at": iso(at)} for n, at in enumerate(item.get("reopened", []))]
+            if item["closed_at"]:
+                events.append({"id": len(events), "event": "closed", "created_at": iso(item["closed_at"])})
+            return self.send_page(events, query)
+        if route == ["pulls"]:
+            pulls = [i for i in repo["items"] if i["kind"] == "pr" and self.matches_state(i, query)]
+            return self.send_page(pulls, query, lambda p: self.pull_json(base, p))
+        if route[0] == "pulls":
+            pull = repo["items_by_number"][int(route[1])]
+            if len(route) == 2:
+                return self.send_json({**self.pull_json(base, pull), "review_comments": pull["review_comments"]}, page=False)
+            reviews = [{"id": n, "user": {"login": login} if login else None, "state": "APPROVED"}
+                       for n, login in enumerate(pull["reviewers"])]
+            return self.send_page(reviews, query)
+        if route == ["contributors"]:
+            return self.send_page([{"login": login, "contributions": 1} for login in repo["contributors"]], query)
+        if route == ["releases"]:
+            releases = [{"id": n, "tag_name": f"v{n}", "published_at": iso(r["published_at"]), "body": r["body"]}
+                        for n, r in enumerate(repo["releases"])]
+            return self.send_page(releases, query)
+        return self.send_json({"message": "Not Found"}, 404)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        variables = body["variables"]
+        repo = self.server.repository(variables["name"])
+        offset = int(variables.get("cursor") or 0)
+        first = variables["first"]
+
+        if "history(" in body["query"]:
+            since, until = parse_date(variables["since"]), parse_date(variables["until"])
+            commits = [c for c in repo["commits"] if since <= c["committed_at"] <= until]
+            nodes = [{
+                "oid": c["sha"], "committedDate": iso(c["committed_at"]), "authoredDate": iso(c["authored_at"]),
+                "message": c["message"], "additions": c["additions"], "deletions": c["deletions"],
+                "author": {"user": {"login": c["author"]} if c["author"] else None}
+            } for c in commits[offset:offset + first]]
+            history = {"pageInfo": self.page_info(offset, first, len(commits)), "nodes": nodes}
+            data = {"repository": {"defaultBranchRef": {"target": {"history": history}}}}
+        else:
+            since = parse_date(variables["since"])
+            issues = [i for i in repo["items"] if i["kind"] == "issue" and i["updated_at"] >= since]
+            nodes = [{
+                "number": i["number"], "createdAt": iso(i["created_at"]), "updatedAt": iso(i["updated_at"]),
+                "closedAt": iso(i["closed_at"]), "state": "CLOSED" if i["closed_at"] else "OPEN",
+                "labels": {"pageInfo": {"hasNextPage": False}, "nodes": [{"name": label} for label in i["labels"]]},
+                "comments": {"nodes": [{"createdAt": iso(at)} for at in i["comments"][:1]]},
+                "timelineItems": {"pageInfo": {"hasNextPage": False}, "nodes": [{"createdAt": iso(at)} for at in i["reopened"]]}
+            } for i in issues[offset:offset + first]]
+            data = {"repository": {"issues": {"pageInfo": self.page_info(offset, first, len(issues)), "nodes": nodes}}}
+
+        self.send_json({"data": data}, resource="graphql")
+
+    def page_info(self, offset, first, total):
+        return {"hasNextPage": offset + first < total, "endCursor": str(offset + first)}
+
+    def matches_state(self, item, query):
+        state = query.get("state", "open")
+        return state == "all" or state == ("closed" if item["closed_at"] else "open")
+
+    def repo_json(self, profile, repo):
+        return {
+            "id": 1, "name": profile, "full_name": f"benchmark/{profile}", "owner": {"login": "benchmark"},
+            "url": f"{self.server.url}/repos/benchmark/{profile}", "default_branch": "main",
+            "created_at": iso(repo["created_at"]), "updated_at": iso(repo["updated_at"]), "pushed_at": iso(repo["pushed_at"]),
+            "open_issues_count": sum(not i["closed_at"] for i in repo["items"]),
+            "stargazers_count": 1000, "forks_count": 100, "watchers_count": 1000
+        }
+
+    def commit_json(self, base, commit):
+        person = {"name": commit["author"] or "someone", "email": f"{commit['author'] or 'someone'}@example.com"}
+        return {
+            "sha": commit["sha"], "url": f"{base}/commits/{commit['sha']}",
+            "commit": {
+                "author": {**person, "date": iso(commit["authored_at"])},
+                "committer": {**person, "date": iso(commit["committed_at"])},
+                "message": commit["message"]
+            },
+            "author": {"login": commit["author"]} if commit["author"] else None
+        }
+
+    def issue_json(self, base, item):
+        issue = {
+            "number": item["number"], "url": f"{base}/issues/{item['number']}", "title": f"Item {item['number']}",
+            "state": "closed" if item["closed_at"] else "open", "user": {"login": item["author"]},
+            "created_at": iso(item["created_at"]), "updated_at": iso(item["updated_at"]), "closed_at": iso(item["closed_at"]),
+            "labels": [{"name": label} for label in item.get("labels", [])], "comments": len(item.get("comments", []))
+        }
+        if item["kind"] == "pr":
+            issue["pull_request"] = {"url": f"{base}/pulls/{item['number']}"}
+        return issue
+
+    def pull_json(self, base, item):
+        return {
+            "number": item["number"], "url": f"{base}/pulls/{item['number']}", "title": f"Item {item['number']}",
+            "state": "closed" if item["closed_at"] else "open", "user": {"login": item["author"]},
+            "created_at": iso(item["created_at"]), "updated_at": iso(item["updated_at"]),
+            "closed_at": iso(item["closed_at"]), "merged_at": iso(item["merged_at"])
+        }
+
+    def send_page(self, items, query, render=None):
+        """One page of a REST listing, with GitHub's Link header to the next and last pages"""
+        per_page = int(query.get("per_page", 30))
+        page = int(query.get("page", 1))
+        last = max(1, -(-len(items) // per_page))
+        links = []
+        if page < last:
+            path = urlsplit(self.path).path
+            links.append(f'<{self.server.url}{path}?{urlencode({**query, "page": page + 1})}>; rel="next"')
+            links.append(f'<{self.server.url}{path}?{urlencode({**query, "page": last})}>; rel="last"')
+        chunk = items[(page - 1) * per_page:page * per_page]
+        self.send_json([render(item) for item in chunk] if render else chunk, headers={"Link": ", ".join(links)} if links else {})
+
+    def send_json(self, data, status=200, page=True, resource="core", headers=None):
+        if self.path != "/_benchmark/stats":
+            self.server.count(page and status == 200)
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("x-ratelimit-limit", "100000")
+        self.send_header("x-ratelimit-remaining", "100000")
+        self.send_header("x-ratelimit-reset", str(int(time.time()) + 3600))
+        self.send_header("x-ratelimit-resource", resource)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+# ==================== COLLECTOR RUNS ====================
+def server_stats(server_url):
+    with urllib.request.urlopen(f"{server_url}/_benchmark/stats") as response:
+        return json.load(response)
+
+def measure(server_url, prepare, run):
+    """Wall time, requests and list pages of one run, then peak Python memory over a second (traced) run"""
+    inputs = prepare()
+    before = server_stats(server_url)
+    started = time.perf_counter()
+    run(inputs)
+    seconds = time.perf_counter() - started
+    after = server_stats(server_url)
+
+    inputs = prepare()
+    tracemalloc.start()
+    run(inputs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "seconds": round(seconds, 3),
+        "requests": after["requests"] - before["requests"],
+        "pages": after["pages"] - before["pages"],
+        "peak_mb": round(peak / (1024 * 1024), 2)
+    }
+
+def run_collectors(profile, server_url):
+    """Benchmark each collector function of collect.py on one profile's repository (runs in its own process)
+
+    collect.py's client points at the stand-in server, in an empty working directory for its state
+    files. Its request pacing is switched off, so times measure the collectors themselves rather
+    than the pacing.
+    """
+    os.chdir(tempfile.mkdtemp(prefix="health-benchmark-"))
+    import collect
+    from ratelimit import RequestBudget
+
+    detail_workers = 8
+    unpaced = RequestBudget(tokens=["benchmark"], hourly_limit=10**9, max_concurrent=detail_workers, min_interval=0)
+    collect.configure(tokens=["benchmark"], detail_workers=detail_workers, use_cache=False,
+                      api_url=server_url, request_budget=unpaced)
+
+    repo_name = f"benchmark/{profile}"
+    repo = collect.client().get_repo(repo_name)
+    start = collect.time_periods["period_1"]["start"]
+    end = collect.time_periods["period_4"]["end"]
+    fetched = {}
+
+    def records(key, fetch):
+        """Input records for the detail collectors (fetched once, copied for each run)"""
+        if key not in fetched:
+            fetched[key] = fetch()
+        return [dict(record) for record in fetched[key]]
+
+    def issue_records():
+        return records("issues", lambda: collect.fetch_issue_records_rest(repo, start))
+
+    def pr_records():
+        return records("prs", lambda: collect.fetch_pr_records(repo, collect.time_periods))
+
+    def collect_repo(_):
+        collect.collect_repo(repo_name)
+        collect.discard_checkpoint(repo_name)
+
+    nothing = lambda: None
+    collectors = [
+        ("commits (GraphQL)", nothing, lambda _: collect.fetch_commit_records_graphql(repo, start, end)),
+        ("commits (REST)", nothing, lambda _: collect.fetch_commit_records_rest(repo, start, end)),
+        ("issues (GraphQL)", nothing, lambda _: collect.fetch_issue_records_graphql(repo, start)),
+        ("issues (REST)", nothing, lambda _: collect.fetch_issue_records_rest(repo, start)),
+        ("pull requests", nothing, lambda _: collect.fetch_pr_records(repo, collect.time_periods)),
+        ("issue comments", issue_records, lambda r: collect.prefetch_details(repo, {"window": r}, collect.issue_first_response, "issue comments")),
+        ("issue events", issue_records, lambda r: collect.prefetch_details(repo, {"window": r}, collect.issue_reopen_dates, "issue events")),
+        ("pr reviews", pr_records, lambda r: collect.prefetch_details(repo, {"window": r}, collect.pr_review_details, "pr reviews")),
+        ("releases", nothing, lambda _: collect.fetch_release_records(repo, start)),
+        ("repo totals", nothing, lambda _: collect.fetch_repo_counts(repo)),
+        ("collect_repo (all)", nothing, collect_repo)
+    ]
+
+    results = {}
+    for name, prepare, run in collectors:
+        # The REST commit fallback makes one request per commit and sleeps 20ms after each
+        if name == "commits (REST)" and profile != "small":
+            continue
+        results[name] = measure(server_url, prepare, run)
+    return results
+
+# ==================== HISTORY ====================
+def current_commit():
+    """(commit, has uncommitted changes) of the working tree, or ("unknown", False) outside git"""
+    try:
+        commit = subprocess.run(["git", "-C", PACKAGE_DIR, "rev-parse", "--short", "HEAD"],
+                                check=True, capture_output=True, text=True).stdout.strip()
+        status = subprocess.run(["git", "-C", PACKAGE_DIR, "status", "--porcelain", "--untracked-files=no"],
+                                check=True, capture_output=True, text=True).stdout
+    except (subprocess.CalledProcessError, OSError):
+        return "unknown", False
+    return commit, bool(status.strip())
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def baseline_entry(history, profile, baseline=None):
+    """Latest earlier run of a profile (of a commit starting with baseline, when given)"""
+    for entry in reversed(history):
+        if entry["profile"] == profile and (baseline is None or entry["commit"].startswith(baseline)):
+            return entry
+    return None
+
+def regressions(results, baseline):
+    """Descriptions of every collector that got more expensive than the baseline run"""
+    found = []
+    for name, now in results.items():
+        before = baseline["collectors"].get(name)
+        if before is None:
+            continue
+        for metric in ("requests", "pages"):
+            if now[metric] > before[metric]:
+                found.append(f"{name}: {metric} {before[metric]:,} -> {now[metric]:,}")
+        if now["seconds"] > before["seconds"] * (1 + TIME_TOLERANCE) and now["seconds"] - before["seconds"] > 0.1:
+            found.append(f"{name}: time {before['seconds']:.2f}s -> {now['seconds']:.2f}s")
+        if now["peak_mb"] > before["peak_mb"] * (1 + MEMORY_TOLERANCE) and now["peak_mb"] - before["peak_mb"] > 1:
+            found.append(f"{name}: peak memory {before['peak_mb']:.1f} MB -> {now['peak_mb']:.1f} MB")
+    return found
+
+def change(now, before):
+    if before is None:
+        return ""
+    if before == 0:
+        return "" if now == 0 else " (new)"
+    return f" ({(now - before) / before:+.0%})" if now != before else " (=)"
+
+# ==================== BENCHMARK RUN ====================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark collect.py offline against a synthetic stand-in GitHub API")
+    parser.add_argument("--profile", action="append", choices=list(PROFILES),
+                        help="repository size to benchmark (repeatable; default: small and medium)")
+    parser.add_argument("--history", default=HISTORY_PATH, help=f"results history file (default {HISTORY_PATH})")
+    parser.add_argument("--baseline", metavar="COMMIT", help="compare with the latest run of this commit (default: the latest run)")
+    parser.add_argument("--no-save", action="store_true", help="don't add this run to the history")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if any collector regressed")
+    parser.add_argument("--worker", nargs=2, metavar=("PROFILE", "SERVER"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        profile, server_url = args.worker
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = run_collectors(profile, server_url)
+        print(json.dumps(results))
+        sys.exit(0)
+
+    server = StandInAPI(datetime.now(timezone.utc))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    commit, dirty = current_commit()
+    history = load_history(args.history)
+    found = []
+
+    print(f"Benchmarking collect.py at {commit}{' (with uncommitted changes)' if dirty else ''} against {server.url}")
+    for profile in args.profile or ["small", "medium"]:
+        worker = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", profile, server.url],
+                                capture_output=True, text=True)
+        if worker.returncode != 0:
+            sys.exit(f"{profile}: benchmark run failed\n{worker.stderr}")
+        results = json.loads(worker.stdout.strip().splitlines()[-1])
+        baseline = baseline_entry(history, profile, args.baseline)
+
+        sizes = PROFILES[profile]
+        print(f"\n{profile}: {sizes['commits']:,} commits, {sizes['issues']:,} issues, {sizes['prs']:,} PRs"
+              + (f" (compared with {baseline['commit']}, {baseline['recorded_at'][:16]})" if baseline else ""))
+        print("-" * 96)
+        print(f"{'Collector':<20} {'Time':>16} {'Requests':>18} {'Pages':>16} {'Peak memory':>20}")
+        print("-" * 96)
+        for name, result in results.items():
+            before = (baseline or {}).get("collectors", {}).get(name) or {}
+            seconds = f"{result['seconds']:.2f}s" + change(result["seconds"], before.get("seconds"))
+            requests = f"{result['requests']:,}" + change(result["requests"], before.get("requests"))
+            pages = f"{result['pages']:,}" + change(result["pages"], before.get("pages"))
+            peak = f"{result['peak_mb']:.1f} MB" + change(result["peak_mb"], before.get("peak_mb"))
+            print(f"{name:<20} {seconds:>16} {requests:>18} {pages:>16} {peak:>20}")
+        print("-" * 96)
+
+        if baseline:
+            found += [f"{profile} {regression}" for regression in regressions(results, baseline)]
+        entry = {"commit": commit, "dirty": dirty, "recorded_at": datetime.now(timezone.utc).isoformat(),
+                 "python": sys.version.split()[0], "profile": profile, "collectors": results}
+        history.append(entry)
+        if not args.no_save:
+            os.makedirs(os.path.dirname(args.history) or '.', exist_ok=True)
+            with open(args.history, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+
+    server.shutdown()
+    if found:
+        print("\nRegressions:")
+        for regression in found:
+            print(f"  {regression}")
+    if not args.no_save:
+        print(f"\n✓ Results added to {args.history}")
+    if found and args.check:
+        sys.exit(1)
@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+CACHE_PATH = os.path.join('.cache', 'http_cache.sqlite')
+DEFAULT_MAX_MB = 500
+
+# ==================== RESPONSE CACHE ====================
+def cache_key(url, identity=""):
+    """Cache key: who asked (token fingerprint), scheme, host and path plus sorted query parameters
+
+    Responses of different API servers (github.com, Enterprise, a stand-in) or tokens never share
+    an entry, and parameter order never causes a miss.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    key = f"{parts.scheme}://{parts.netloc}{parts.path}"
+    return f"{identity}@{key}?{query}" if query else f"{identity}@{key}"
+
+def token_fingerprint(tokens):
+    """Short digest identifying the tokens requests are sent with (never stored in clear)"""
+    return hashlib.sha256("\n".join(sorted(token or "" for token in tokens)).encode()).hexdigest()[:16]
+
+class ResponseCache:
+    """Persistent cache of GitHub GET responses, revalidated with ETag/Last-Modified.
+
+    Entries are keyed by URL and token fingerprint (see cache_key) and evicted least recently
+    used first once the cache grows past max_bytes (sizes are UTF-8 bytes of the body).
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT NOT NULL,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._db.commit()
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self.hits = 0
+
+    def lookup(self, url, identity=""):
+        """Cached entry for url as fetched by identity (dict with key, etag, last_modified, headers, body) or None"""
+        key = cache_key(url, identity)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, headers, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"key": key, "etag": row[0], "last_modified": row[1], "headers": json.loads(row[2]), "body": row[3]}
+
+    def conditional_headers(self, entry):
+        """Request headers that turn a GET into a conditional request for a cached entry"""
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, headers, body, identity=""):
+        """Store a 200 response to identity if it carries a validator (ETag or Last-Modified)"""
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+
+        size = len(body.encode())
+        now = time.time()
+        key = cache_key(url, identity)
+        with self._lock:
+            old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, json.dumps(headers), body, size, now, now)
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._db.commit()
+
+    def revalidated(self, entry, fresh_headers):
+        """Record a 304: mark the entry used and fresh (for purge) and return its headers with the fresh rate-limit values"""
+        self.hits += 1
+        now = time.time()
+        with self._lock:
+            self._db.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, entry["key"]))
+            self._db.commit()
+        headers = dict(entry["headers"])
+        headers.update({k: v for k, v in fresh_headers.items() if k.startswith("x-ratelimit-")})
+        return headers
+
+    def _evict(self):
+        """Drop least recently used entries until the cache is back under 90% of max_bytes"""
+        target = self.max_bytes * 0.9
+        rows = self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_bytes -= size
+
+    def stats(self):
+        """Entry count, total size and age range of the cache"""
+        with self._lock:
+            count, oldest, newest = self._db.execute(
+                "SELECT COUNT(*), MIN(stored_at), MAX(stored_at) FROM responses"
+            ).fetchone()
+        return {"entries": count, "bytes": self._total_bytes, "oldest": oldest, "newest": newest}
+
+    def purge(self, older_than_days=None, match=None):
+        """Delete entries (all, or those not stored or revalidated for N days and/or whose key contains match); returns count"""
+        clauses, params = [], []
+        if older_than_days is not None:
+            clauses.append("stored_at < ?")
+            params.append(time.time() - older_than_days * 86400)
+        if match:
+            clauses.append("instr(key, ?) > 0")
+            params.append(match)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            deleted = self._db.execute(f"DELETE FROM responses{where}", params).rowcount
+            self._db.commit()
+            self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        return deleted
+
+# ==================== CACHED RESPONSE ====================
+class CachedResponse:
+    """Cached body served in place of a 304 (mimics PyGithub's RequestsResponse)"""
+
+    def __init__(self, headers, body):
+        self.status = 200
+        self.headers = headers
+        self._body = body
+
+    def getheaders(self):
+        return self.headers.items()
+
+    def read(self):
+        return self._body
+
+# ==================== INSPECT / PURGE ====================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or purge the GitHub response cache")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("stats", help="show entry count and size")
+    purge_parser = subparsers.add_parser("purge", help="delete cached responses")
+    purge_parser.add_argument("--older-than", type=float, metavar="DAYS", help="only entries not stored or revalidated in the last DAYS")
+    purge_parser.add_argument("--match", metavar="TEXT", help="only entries whose URL contains TEXT (e.g. a repo name)")
+    args = parser.parse_args()
+
+    cache = ResponseCache()
+
+    if args.command == "stats":
+        stats = cache.stats()
+        print(f"Cache: {cache.path}")
+        print(f"Entries: {stats['entries']:,}")
+        print(f"Size: {stats['bytes'] / (1024 * 1024):.1f} MB (limit {cache.max_bytes / (1024 * 1024):.0f} MB)")
+        if stats["entries"]:
+            print(f"Oldest: {time.strftime('%Y-%m-%d %H:%M', time.localtime(stats['oldest']))}")
+            print(f"Newest: {time.strftime('%Y-%m-%d %H:%M', time.localtime(stats['newest']))}")
+    else:
+        deleted = cache.purge(older_than_days=args.older_than, match=args.match)
+        print(f"✓ Purged {deleted:,} cached responses")
@@ -0,0 +1,143 @@
+import json
+import time
+import argparse
+import numpy as np
+from storage import iter_repo_data, STORE_PATH
+from score import CATEGORY_WEIGHTS, THRESHOLDS, BAND_THRESHOLDS, batch_fields, score_fields
+
+# Ground truth classifications named differently from the band they should score in
+LABEL_BANDS = {
+    "Active": "Healthy",
+    "Abandoned": "Critical"
+}
+
+# Largest number of (configuration, repo) scores held in memory at once
+CHUNK_SCORES = 2_000_000
+
+# ==================== LABELS ====================
+def expected_band(label):
+    """Health band a ground truth classification should score in ("Active (Healthy)" -> "Healthy")"""
+    label = label.split(" (")[0]
+    return LABEL_BANDS.get(label, label)
+
+def band_ranges():
+    """Band -> (lowest, highest) health score it covers"""
+    ranges = {}
+    upper = 100
+    for threshold, band in BAND_THRESHOLDS:
+        ranges[band] = (threshold, upper)
+        upper = threshold
+    ranges["Critical"] = (0, upper)
+    return ranges
+
+# ==================== CONFIGURATIONS ====================
+def sample_configurations(count, rng, spread=2.0):
+    """Random configurations as (weights, thresholds) arrays of shape (count, 1); row 0 is the current one
+
+    Weights are drawn uniformly from all combinations summing to 1. Each threshold is scaled by
+    up to spread times either way, and the maintenance penalty is drawn in steps of 5 from -50 to 0.
+    """
+    weights = dict(zip(CATEGORY_WEIGHTS, rng.dirichlet(np.ones(len(CATEGORY_WEIGHTS)), count).T))
+    thresholds = {
+        name: value * np.exp(rng.uniform(-np.log(spread), np.log(spread), count))
+        for name, value in THRESHOLDS.items() if name != "maintenance_penalty"
+    }
+    thresholds["maintenance_penalty"] = rng.integers(-10, 1, count) * 5.0
+
+    for name, value in CATEGORY_WEIGHTS.items():
+        weights[name][0] = value
+    for name, value in THRESHOLDS.items():
+        thresholds[name][0] = value
+
+    return ({name: values[:, None] for name, values in weights.items()},
+            {name: values[:, None] for name, values in thresholds.items()})
+
+def configuration(weights, thresholds, index):
+    """One configuration's settings as plain dicts (whole numbers as ints, like the settings in score.py)"""
+    def setting(value):
+        value = round(float(value), 3)
+        return int(value) if value.is_integer() else value
+    return ({name: setting(values[index, 0]) for name, values in weights.items()},
+            {name: setting(values[index, 0]) for name, values in thresholds.items()})
+
+# ==================== EVALUATION ====================
+def evaluate(repos, weights, thresholds):
+    """(accuracy, miss) per configuration: share of repos scored in their expected band, and the
+    average number of points repos fall outside it (breaks ties between equally accurate settings)"""
+    columns, days = batch_fields(repos)
+    ranges = band_ranges()
+    expected = np.array([expected_band(repo["classification"]) for repo in repos], dtype=object)
+    low = np.array([ranges[band][0] for band in expected])
+    high = np.array([ranges[band][1] for band in expected])
+
+    count = len(next(iter(weights.values())))
+    chunk = max(1, CHUNK_SCORES // len(repos))
+    accuracy = np.empty(count)
+    miss = np.empty(count)
+    for start in range(0, count, chunk):
+        rows = slice(start, start + chunk)
+        scores, _ = score_fields(
+            columns, days,
+            {name: values[rows] for name, values in weights.items()},
+            {name: values[rows] for name, values in thresholds.items()}
+        )
+        health = scores["health_score"]
+        accuracy[rows] = (scores["health_band"] == expected).mean(axis=1)
+        miss[rows] = (np.maximum(0, low - health) + np.maximum(0, health - high)).mean(axis=1)
+    return accuracy, miss
+
+def calibrate(repos, count=5000, seed=0, spread=2.0):
+    """Evaluate count configurations against the labelled repos; returns them ranked best first"""
+    weights, thresholds = sample_configurations(count, np.random.default_rng(seed), spread)
+    accuracy, miss = evaluate(repos, weights, thresholds)
+    results = []
+    for rank, index in enumerate(np.lexsort((miss, -accuracy)).tolist(), 1):
+        settings = configuration(weights, thresholds, index)
+        results.append({"rank": rank, "current": index == 0, "accuracy": float(accuracy[index]),
+                        "miss": float(miss[index]), "weights": settings[0], "thresholds": settings[1]})
+    return results
+
+# ==================== CALIBRATION RUN ====================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search scoring weights and thresholds against the classification labels")
+    parser.add_argument("--samples", type=int, default=5000, help="configurations to evaluate (default 5000)")
+    parser.add_argument("--spread", type=float, default=2.0, help="scale thresholds by up to this factor either way (default 2)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top", type=int, default=10, help="configurations to show (default 10)")
+    parser.add_argument("--store", default=STORE_PATH, help=f"collected data (default {STORE_PATH})")
+    parser.add_argument("--json", metavar="PATH", help="also write every evaluated configuration, ranked, to PATH")
+    args = parser.parse_args()
+
+    repos = [repo for repo in iter_repo_data(args.store) if repo.get("classification")]
+    if not repos:
+        raise SystemExit("No repos with a classification label to calibrate against "
+                         "(add them to repo_data.json, then run python3 storage.py import)")
+
+    started = time.time()
+    results = calibrate(repos, args.samples, args.seed, args.spread)
+    elapsed = time.time() - started
+    current = next(result for result in results if result["current"])
+
+    print(f"Evaluated {len(results):,} configurations against {len(repos)} labelled repos in {elapsed:.2f}s")
+    print(f"Current settings: {current['accuracy']:.1%} band agreement "
+          f"({current['miss']:.1f} points outside on average), rank {current['rank']:,}")
+    print("-" * 100)
+    print(f"{'Rank':>5} {'Agree':>6} {'Miss':>5}  {'Vel':>5} {'Collab':>6} {'Qual':>5} {'Evol':>5}  Thresholds")
+    print("-" * 100)
+    for result in results[:args.top]:
+        w = result["weights"]
+        limits = ", ".join(f"{name}={value:g}" for name, value in result["thresholds"].items())
+        print(f"{result['rank']:>5} {result['accuracy']:>6.1%} {result['miss']:>5.1f}  "
+              f"{w['velocity']:>5.2f} {w['collaboration']:>6.2f} {w['quality']:>5.2f} {w['evolvability']:>5.2f}  {limits}"
+              f"{'  (current)' if result['current'] else ''}")
+    print("-" * 100)
+
+    best = results[0]
+    print("\nBest settings (for score.py):")
+    print(f"CATEGORY_WEIGHTS = {json.dumps(best['weights'], indent=4)}")
+    print(f"THRESHOLDS = {json.dumps(best['thresholds'], indent=4)}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✓ Wrote {len(results):,} ranked configurations to {args.json}")
@@ -0,0 +1,162 @@
+import os
+import json
+import threading
+import functools
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+STATS_PATH = 'collection_stats.json'
+
+# Latency histogram bucket upper bounds (milliseconds); slower requests count in the last bucket
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000]
+BUCKET_LABELS = [f"<={ms}ms" for ms in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+
+# Requests made outside any repository, function or period scope
+NO_REPO = "(none)"
+NO_FUNCTION = "(other)"
+WHOLE_WINDOW = "window"  # Fetches that cover every period at once
+
+_context = threading.local()
+
+# ==================== CALL CONTEXT ====================
+def context():
+    """Repository, function and period the current thread is making requests for"""
+    return dict(getattr(_context, "fields", {}))
+
+@contextmanager
+def scope(**fields):
+    """Attribute this thread's requests to a repo, function and/or period (nested scopes override)"""
+    previous = getattr(_context, "fields", {})
+    _context.fields = {**previous, **fields}
+    try:
+        yield
+    finally:
+        _context.fields = previous
+
+def tracked(func):
+    """Decorator: requests made while func runs are accounted to it (innermost tracked function wins)"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with scope(function=func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+# ==================== CALL STATISTICS ====================
+def new_entry():
+    return {
+        "requests": 0,
+        "pages": 0,
+        "bytes": 0,
+        "not_modified": 0,
+        "errors": 0,
+        "retries": 0,
+        "latency_seconds": 0.0,
+        "waited_seconds": 0.0,
+        "slept_seconds": 0.0,
+        "rate_limit": {},
+        "latency_histogram": {label: 0 for label in BUCKET_LABELS}
+    }
+
+def add_entry(total, entry):
+    """Add one entry's counts into another"""
+    for key, value in entry.items():
+        if isinstance(value, dict):
+            for name, count in value.items():
+                total[key][name] = total[key].get(name, 0) + count
+        else:
+            total[key] += value
+    return total
+
+class CallStats:
+    """Every GitHub API response, accounted per repository, function and period.
+
+    Records request and page counts, bytes received, a latency histogram, retries (by urllib3
+    inside a request and by collect.py after a rate-limit or server error), time spent waiting for the
+    request budget or sleeping before a retry, and the rate-limit quota consumed per resource
+    (304 Not Modified responses are free).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # (repo, function, period) -> entry
+        self.started_at = datetime.now(timezone.utc)
+
+    def reset(self):
+        """Forget every recorded call (start of a new collection run)"""
+        with self._lock:
+            self._entries = {}
+            self.started_at = datetime.now(timezone.utc)
+
+    def _entry(self):
+        fields = context()
+        key = (fields.get("repo", NO_REPO), fields.get("function", NO_FUNCTION), fields.get("period", WHOLE_WINDOW))
+        if key not in self._entries:
+            self._entries[key] = new_entry()
+        return self._entries[key]
+
+    def record(self, resource, status, seconds, size=0, page=False, retries=0, waited=0.0):
+        """Account one response to the current thread's repo, function and period"""
+        bucket = next((label for label, ms in zip(BUCKET_LABELS, LATENCY_BUCKETS_MS) if seconds * 1000 <= ms), BUCKET_LABELS[-1])
+        with self._lock:
+            entry = self._entry()
+            entry["requests"] += 1
+            entry["pages"] += page
+            entry["bytes"] += size
+            entry["not_modified"] += status == 304
+            entry["errors"] += status >= 400
+            entry["retries"] += retries
+            entry["latency_seconds"] += seconds
+            entry["waited_seconds"] += waited
+            entry["latency_histogram"][bucket] += 1
+            if status != 304:
+                entry["rate_limit"][resource] = entry["rate_limit"].get(resource, 0) + 1
+
+    def record_retry(self, slept):
+        """Account a retry after a rate-limit or server error and the time slept before it"""
+        with self._lock:
+            entry = self._entry()
+            entry["retries"] += 1
+            entry["slept_seconds"] += slept
+
+    def report(self):
+        """All statistics as a JSON-ready dict: totals, per function, and per repo -> function -> period"""
+        with self._lock:
+            entries = {key: json.loads(json.dumps(entry)) for key, entry in self._entries.items()}
+
+        totals = new_entry()
+        functions = {}
+        repos = {}
+        for (repo, function, period), entry in sorted(entries.items()):
+            add_entry(totals, entry)
+            add_entry(functions.setdefault(function, new_entry()), entry)
+            repo_stats = repos.setdefault(repo, {"totals": new_entry(), "functions": {}})
+            add_entry(repo_stats["totals"], entry)
+            function_stats = repo_stats["functions"].setdefault(function, {"totals": new_entry(), "periods": {}})
+            add_entry(function_stats["totals"], entry)
+            function_stats["periods"][period] = entry
+
+        return {
+            "started_at": self.started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "latency_buckets_ms": LATENCY_BUCKETS_MS,
+            "totals": totals,
+            "functions": functions,
+            "repos": repos
+        }
+
+    def write(self, path=STATS_PATH):
+        """Write the report as JSON (temporary file then rename)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def summary(self):
+        """Lines summarising requests, data and time per function, most time first"""
+        functions = self.report()["functions"]
+        lines = ["API calls by function:"]
+        for name, entry in sorted(functions.items(), key=lambda item: -item[1]["latency_seconds"] - item[1]["waited_seconds"]):
+            lines.append(f"  {name:<32} {entry['requests']:>7,} requests {entry['pages']:>6,} pages "
+                         f"{entry['bytes'] / (1024 * 1024):>8.1f} MB {entry['latency_seconds']:>8.1f}s in requests "
+                         f"{entry['waited_seconds'] + entry['slept_seconds']:>8.1f}s waiting")
+        return lines
@@ -1,72 +1,367 @@
 import os
 import json
 import time
+import argparse
+import subprocess
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
-from github import Github, Auth, RateLimitExceededException
+from github import Github, Auth, GithubException, RateLimitExceededException
+import transport
+import gitlog
+import callstats
+import sampling
+import keywords
+from ratelimit import RequestBudget
+from cache import ResponseCache, DEFAULT_MAX_MB
+from storage import RepoStore
 
-# Load the token from .env file
-load_dotenv()
-token = os.getenv('GITHUB_TOKEN')
+# ==================== GITHUB CLIENT ====================
+# Shared by every collection in the process and set up by configure() (or from .env on first use):
+# one GitHub client and connection pool, the request budget and the response cache. Every response
+# is accounted per repo, function and period in call_stats (written to collection_stats.json)
+g = None
+budget = None
+cache = None
+call_stats = callstats.CallStats()
+client_lock = threading.Lock()
 
-# Connect to GitHub
-auth = Auth.Token(token)
-g = Github(auth=auth)
+# Commit metrics come from local clones (no API requests) when a clone directory is given,
+# cloned from the server of the API in use (e.g. a GitHub Enterprise host)
+git_clone_dir = None
+api_base_url = gitlog.DEFAULT_API_URL
 
-# Read the list of repos
-with open('repos.txt', 'r') as file:
-    repos = [line.strip() for line in file if line.strip()]
+# Per-issue comments/events and per-PR reviews are fetched this many at a time within each repo
+detail_pool_size = 8
+
+# "fixed": the newest SAMPLE_LIMIT items of each period; "adaptive": items spread over each period,
+# fetched until each metric's confidence interval is within tolerance (see sampling.py)
+sampling_mode = "fixed"
+
+# Commit messages and release notes are labelled by the vocabularies in keywords.json (or the defaults)
+classifier = None
+
+def load_tokens():
+    """Tokens from the environment or .env file (GITHUB_TOKENS adds more comma-separated tokens to the pool)"""
+    load_dotenv()
+    token = os.getenv('GITHUB_TOKEN')
+    tokens = [t.strip() for t in [token or ''] + os.getenv('GITHUB_TOKENS', '').split(',') if t.strip()]
+    return list(dict.fromkeys(tokens))
+
+def configure(tokens=None, workers=1, detail_workers=8, use_cache=True, cache_size=DEFAULT_MAX_MB,
+              git_clones=None, api_url=None, request_budget=None, sampling="fixed", vocabularies=None):
+    """Set up the shared GitHub client for collecting up to workers repos at once; returns the client
+
+    Every request from every worker draws from one shared budget, which paces requests from the
+    rate-limit headers and rotates across the tokens; GETs are revalidated against the response cache.
+    Replaces any earlier client, so call it before collecting. api_url points at another API server,
+    e.g. GitHub Enterprise (https://HOST/api/v3); default GITHUB_API_URL, else api.github.com.
+    sampling is "fixed" or "adaptive" (see sampling_mode); vocabularies is a keywords.json to label
+    commit messages and release notes with (default: keywords.json, if it exists).
+    """
+    global g, budget, cache, git_clone_dir, api_base_url, detail_pool_size, sampling_mode, classifier
+    tokens = tokens or load_tokens()
+    if not tokens:
+        raise ValueError("No GitHub token: set GITHUB_TOKEN (in the environment or .env)")
+    
+    budget = request_budget or RequestBudget(tokens=tokens, max_concurrent=workers * detail_workers)
+    cache = ResponseCache(max_bytes=cache_size * 1024 * 1024) if use_cache else None
+    transport.install(budget, cache, call_stats)
+    git_clone_dir = git_clones
+    api_base_url = api_url or os.getenv('GITHUB_API_URL', gitlog.DEFAULT_API_URL)
+    detail_pool_size = detail_workers
+    sampling_mode = sampling
+    classifier = keywords.KeywordClassifier(keywords.load_vocabularies(vocabularies or keywords.KEYWORDS_PATH))
+    
+    # One client and connection pool shared by all workers (the budget does the pacing)
+    g = Github(auth=Auth.Token(tokens[0]), base_url=api_base_url,
+               pool_size=workers * detail_workers, seconds_between_requests=None, seconds_between_writes=None)
+    return g
+
+def client():
+    """The shared GitHub client (configured from the environment with default settings on first use)"""
+    with client_lock:
+        if g is None:
+            configure()
+    return g
+
+def message_classifier():
+    """The shared keyword classifier (from keywords.json, else the default vocabularies, on first use)"""
+    global classifier
+    with client_lock:
+        if classifier is None:
+            classifier = keywords.KeywordClassifier(keywords.load_vocabularies())
+    return classifier
+
+def budget_phase(name):
+    """Attribute this thread's requests to a budget phase (no-op before a client is configured)"""
+    return budget.phase(name) if budget is not None else nullcontext()
 
 # ==================== TIME PERIOD DEFINITIONS ====================
-# Define time periods (6-month intervals over 24 months)
-now = datetime.now(timezone.utc)
-
-time_periods = {
-    "period_1": {
-        "name": "18-24 months ago",
-        "start": now - timedelta(days=730),
-        "end": now - timedelta(days=547)
-    },
-    "period_2": {
-        "name": "12-18 months ago", 
-        "start": now - timedelta(days=547),
-        "end": now - timedelta(days=365)
-    },
-    "period_3": {
-        "name": "6-12 months ago",
-        "start": now - timedelta(days=365),
-        "end": now - timedelta(days=183)
-    },
-    "period_4": {
-        "name": "0-6 months ago (recent)",
-        "start": now - timedelta(days=183),
-        "end": now
+def make_time_periods(now=None):
+    """Four 6-month periods over the 24 months up to now, and the start of the last 3 months"""
+    now = now or datetime.now(timezone.utc)
+    
+    # Period boundaries sit on UTC midnight so request URLs (since=...) stay the same for a whole day
+    # and reruns can be answered from the response cache
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    periods = {
+        "period_1": {
+            "name": "18-24 months ago",
+            "start": today - timedelta(days=730),
+            "end": today - timedelta(days=547)
+        },
+        "period_2": {
+            "name": "12-18 months ago", 
+            "start": today - timedelta(days=547),
+            "end": today - timedelta(days=365)
+        },
+        "period_3": {
+            "name": "6-12 months ago",
+            "start": today - timedelta(days=365),
+            "end": today - timedelta(days=183)
+        },
+        "period_4": {
+            "name": "0-6 months ago (recent)",
+            "start": today - timedelta(days=183),
+            "end": now
+        }
     }
-}
+    
+    # Additional time reference for recent activity metrics
+    return periods, today - timedelta(days=90)
+
+def refresh_time_periods(now=None):
+    """Move the periods up to now (collect_repos does this at the start of every run)"""
+    global time_periods, three_months_ago
+    time_periods, three_months_ago = make_time_periods(now)
 
-# Additional time reference for recent activity metrics
-three_months_ago = datetime.now(timezone.utc) - timedelta(days=90)
+time_periods, three_months_ago = make_time_periods()
 
 # Sampling limit for API efficiency (caps issue/PR iterations to prevent rate limit exhaustion)
 SAMPLE_LIMIT = 300  # Ensures statistical validity per Cohen (1988) power analysis
 
+# Incremental collection: per-repo raw records kept between runs, and how far back to re-read commits
+# (commits merged from older branches can carry commit dates before the last collection)
+STATE_DIR = '.collect_state'
+INCREMENTAL_OVERLAP_DAYS = 7
+
+# Checkpoints: an unfinished repo's progress is written at most this often (seconds), and on errors or Ctrl-C
+CHECKPOINT_INTERVAL = 30
+stop_requested = threading.Event()
+
+# Server errors (5xx) are retried this many times, waiting twice as long each time (from 2 seconds)
+SERVER_ERROR_RETRIES = 4
+
+# GraphQL statuses meaning the API itself is unavailable (e.g. on an older GitHub Enterprise Server); schema errors come as 400
+GRAPHQL_UNAVAILABLE_STATUSES = (400, 404, 410)
+
+# Commits per GraphQL history page (100 is the API maximum)
+GRAPHQL_PAGE_SIZE = 100
+
+COMMIT_HISTORY_QUERY = """
+query($owner: String!, $name: String!, $since: GitTimestamp, $until: GitTimestamp, $first: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: $first, since: $since, until: $until, after: $cursor) {
+            pageInfo { hasNextPage endCursor }
+            nodes {
+              oid
+              committedDate
+              authoredDate
+              message
+              additions
+              deletions
+              author { user { login } }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Issues per GraphQL page (smaller than commit pages: each issue also brings its first comment and reopen events)
+GRAPHQL_ISSUE_PAGE_SIZE = 50
+
+ISSUE_QUERY = """
+query($owner: String!, $name: String!, $since: DateTime, $first: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    issues(first: $first, after: $cursor, filterBy: {since: $since}, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        createdAt
+        updatedAt
+        closedAt
+        state
+        labels(first: 100) { pageInfo { hasNextPage } nodes { name } }
+        comments(first: 1) { nodes { createdAt } }
+        timelineItems(first: 100, itemTypes: [REOPENED_EVENT]) {
+          pageInfo { hasNextPage }
+          nodes { ... on ReopenedEvent { createdAt } }
+        }
+      }
+    }
+  }
+}
+"""
+
 # ==================== RATE LIMIT HANDLING ====================
+def graphql_error_types(e):
+    """Types of the errors in a GraphQL error response (e.g. RATE_LIMITED, NOT_FOUND), empty for other errors"""
+    errors = e.data.get("errors") if isinstance(e.data, dict) else None
+    return {error.get("type") for error in errors or []}
+
+def is_rate_limited(e):
+    return isinstance(e, RateLimitExceededException) or "RATE_LIMITED" in graphql_error_types(e)
+
+def graphql_unavailable(e):
+    """Whether a GraphQL error means the query can't work here (missing endpoint or schema), rather than a passing failure"""
+    return e.status in GRAPHQL_UNAVAILABLE_STATUSES and not is_rate_limited(e)
+
 def with_retry(func):
-    """Wrapper to handle rate limit exhaustion with automatic retry"""
+    """Wrapper to retry after a rate limit error (the budget then holds requests until quota is available) or a server error"""
+    server_errors = 0
     while True:
         try:
             return func()
-        except RateLimitExceededException:
-            reset_time = g.get_rate_limit().core.reset
-            wait_seconds = (reset_time - datetime.now(timezone.utc)).total_seconds() + 60
-            print(f"\nRate limit exceeded. Waiting {wait_seconds/60:.1f} minutes until reset...")
-            time.sleep(wait_seconds)
+        except GithubException as e:
+            if is_rate_limited(e):
+                print("\nRate limit exceeded. Retrying in 1 minute...")
+                call_stats.record_retry(60)
+                time.sleep(60)
+            elif e.status >= 500 and server_errors < SERVER_ERROR_RETRIES:
+                wait = 2 ** (server_errors + 1)
+                server_errors += 1
+                print(f"\nServer error ({e.status}). Retrying in {wait} seconds...")
+                call_stats.record_retry(wait)
+                time.sleep(wait)
+            else:
+                raise
 
 # ==================== HELPER FUNCTIONS ====================
-def collect_period_commits(repo, start_date, end_date, repo_name=""):
-    """Single-pass commit collection extracting all needed data"""
+def fetch_commit_records(repo, start_date, end_date, repo_name="", checkpoint=None):
+    """Single commit fetch over the full window, held as compact records (local clone, else GraphQL first, REST fallback)"""
+    if git_clone_dir:
+        try:
+            return fetch_commit_records_clone(repo_name, start_date, end_date)
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"\n{repo_name}: local clone unavailable ({e}), falling back to the API")
+    try:
+        return fetch_commit_records_graphql(repo, start_date, end_date, repo_name, checkpoint)
+    except GithubException as e:
+        # Passing failures were already retried page by page; they fail the repo, keeping its checkpoint
+        if not graphql_unavailable(e):
+            raise
+        print(f"\n{repo_name}: GraphQL commit history unavailable ({e.status}), falling back to REST")
+        return fetch_commit_records_rest(repo, start_date, end_date, repo_name, checkpoint)
+
+@callstats.tracked
+def fetch_commit_records_graphql(repo, start_date, end_date, repo_name="", checkpoint=None):
+    """Batched commit fetch: stats for 100 commits per GraphQL history page"""
+    owner, name = repo.full_name.split("/")
+    variables = {
+        "owner": owner,
+        "name": name,
+        "since": start_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        "until": end_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        "first": GRAPHQL_PAGE_SIZE,
+        "cursor": None
+    }
+    
+    # Continue from the last checkpointed page of an interrupted fetch
+    progress = checkpoint_progress(checkpoint, "commits", "graphql")
+    variables["cursor"] = progress["cursor"]
+    commit_records = progress["records"]
+    
+    while True:
+        _, data = with_retry(lambda: repo.requester.graphql_query(COMMIT_HISTORY_QUERY, variables))
+        branch = data["data"]["repository"]["defaultBranchRef"]
+        if branch is None:
+            break  # Empty repository
+        history = branch["target"]["history"]
+        
+        for node in history["nodes"]:
+            author = node["author"]["user"] if node["author"] else None
+            commit_records.append({
+                "sha": node["oid"],
+                "committed_at": datetime.fromisoformat(node["committedDate"]),
+                "authored_at": datetime.fromisoformat(node["authoredDate"]),
+                "author": author["login"] if author else None,
+                "message": node["message"].lower(),
+                "additions": node["additions"],
+                "deletions": node["deletions"]
+            })
+        
+        # Live progress indicator
+        print(f"\r{repo_name}: Processing commits: {len(commit_records)}...", end="", flush=True)
+        
+        if not history["pageInfo"]["hasNextPage"]:
+            break
+        variables["cursor"] = history["pageInfo"]["endCursor"]
+        checkpoint_page(checkpoint, progress, variables["cursor"])
+    
+    return commit_records
+
+def fetch_commit_records_clone(repo_name, start_date, end_date):
+    """Local commit fetch: git log --numstat on a clone kept up to date in git_clone_dir, no API requests"""
+    path = gitlog.sync_clone(git_clone_dir, repo_name, api_base_url)
+    
+    commit_records = []
+    
+    for record in gitlog.iter_commit_records(path, start_date, end_date):
+        commit_records.append(record)
+        
+        # Live progress indicator
+        if len(commit_records) % 1000 == 0:
+            print(f"\r{repo_name}: Processing commits: {len(commit_records)}...", end="", flush=True)
+    
+    return commit_records
+
+@callstats.tracked
+def fetch_commit_records_rest(repo, start_date, end_date, repo_name="", checkpoint=None):
+    """Per-commit fetch: one full-commit GET per commit for its stats"""
     commits = repo.get_commits(since=start_date, until=end_date)
     
+    # Continue from the last checkpointed page of an interrupted fetch
+    progress = checkpoint_progress(checkpoint, "commits", "rest")
+    commit_records = progress["records"]
+    
+    for page in rest_pages(commits, checkpoint, progress):
+        for commit in page:
+            # Live progress indicator
+            if len(commit_records) % 100 == 0 and commit_records:
+                print(f"\r{repo_name}: Processing commits: {len(commit_records)}...", end="", flush=True)
+            
+            # Get stats with rate limit handling & burst prevention
+            stats = with_retry(lambda: commit.stats)
+            time.sleep(0.02)  # Prevent burst detection
+            
+            commit_records.append({
+                "sha": commit.sha,
+                "committed_at": commit.commit.committer.date,
+                "authored_at": commit.commit.author.date,
+                "author": commit.author.login if commit.author else None,
+                "message": commit.commit.message.lower(),
+                "additions": stats.additions,
+                "deletions": stats.deletions
+            })
+    
+    return commit_records
+
+def commits_in_period(commit_records, start_date, end_date):
+    """Commit records whose commit date falls inside the period (bounds inclusive, as with since/until)"""
+    return [c for c in commit_records if start_date <= c["committed_at"] <= end_date]
+
+def collect_period_commits(commit_records, start_date, end_date):
+    """Single-pass commit classification over the period's records"""
     commit_count = 0
     total_additions = 0
     total_deletions = 0
@@ -75,35 +370,23 @@ def collect_period_commits(repo, start_date, end_date, repo_name=""):
     feature_commits = 0
     maintenance_commits = 0
     
-    refactor_keywords = ['refactor', 'restructure', 'cleanup', 'clean up', 'reorganise', 'reorganize', 'simplify', 'improve code']
-    dependency_keywords = ['dep', 'deps', 'dependency', 'dependencies', 'bump', 'package.json', 'requirements.txt', 'cargo.toml', 'pom.xml', 'build.gradle', 'gemfile', 'pipfile']
-    feature_keywords = ['feat', 'feature', 'add', 'new', 'implement', 'enhancement']
-    maintenance_keywords = ['fix', 'bug', 'patch', 'hotfix', 'typo', 'docs', 'documentation']
+    # Label every message of the period in one pass (vocabularies in keywords.py / keywords.json)
+    commits = commits_in_period(commit_records, start_date, end_date)
+    labels_by_commit = message_classifier().label_batch(commit["message"] for commit in commits)
     
-    for commit in commits:
+    for commit, labels in zip(commits, labels_by_commit):
         commit_count += 1
+        total_additions += commit["additions"]
+        total_deletions += commit["deletions"]
         
-        # Live progress indicator
-        if commit_count % 100 == 0:
-            print(f"\r{repo_name}: Processing commits: {commit_count}...", end="", flush=True)
-        
-        # Get stats with rate limit handling & burst prevention
-        stats = with_retry(lambda: commit.stats)
-        total_additions += stats.additions
-        total_deletions += stats.deletions
-        time.sleep(0.02)  # Prevent burst detection
-        
-        # Check message keywords
-        message = commit.commit.message.lower()
-        
-        if any(keyword in message for keyword in refactor_keywords):
+        if "refactoring" in labels:
             refactoring_commits += 1
         
-        if any(keyword in message for keyword in dependency_keywords):
+        if "dependency" in labels:
             dependency_commits += 1
         
-        is_feature = any(keyword in message for keyword in feature_keywords)
-        is_maintenance = any(keyword in message for keyword in maintenance_keywords)
+        is_feature = "feature" in labels
+        is_maintenance = "maintenance" in labels
         
         if is_feature and not is_maintenance:
             feature_commits += 1
@@ -135,30 +418,280 @@ def get_period_metrics(period_data):
         "churn_rate": total_changes / commit_count if commit_count > 0 else 0
     }
 
-def calculate_pr_metrics(repo, start_date, end_date):
-    """Calculate PR merge times and patterns (sampled for API efficiency)"""
-    prs = repo.get_pulls(state='closed', sort='updated', direction='desc')
+def fetch_issue_records(repo, start_date, repo_name="", checkpoint=None):
+    """Single issue pass over the window: every issue updated since start_date (GraphQL first, REST fallback)"""
+    try:
+        return fetch_issue_records_graphql(repo, start_date, checkpoint)
+    except GithubException as e:
+        # Passing failures were already retried page by page; they fail the repo, keeping its checkpoint
+        if not graphql_unavailable(e):
+            raise
+        print(f"\n{repo_name}: GraphQL issues unavailable ({e.status}), falling back to REST")
+        return fetch_issue_records_rest(repo, start_date, checkpoint)
+
+@callstats.tracked
+def fetch_issue_records_graphql(repo, start_date, checkpoint=None):
+    """Batched issue fetch: first comment time and reopen events come with each page of 50 issues"""
+    owner, name = repo.full_name.split("/")
+    variables = {
+        "owner": owner,
+        "name": name,
+        "since": start_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        "first": GRAPHQL_ISSUE_PAGE_SIZE,
+        "cursor": None
+    }
     
-    merge_times = []
-    merged_count = 0
-    closed_without_merge = 0
-    processed = 0
+    # Continue from the last checkpointed page of an interrupted fetch
+    progress = checkpoint_progress(checkpoint, "issues", "graphql")
+    variables["cursor"] = progress["cursor"]
+    issue_records = progress["records"]
     
-    for pr in prs:
-        if processed >= SAMPLE_LIMIT:
-            break
+    while True:
+        _, data = with_retry(lambda: repo.requester.graphql_query(ISSUE_QUERY, variables))
+        issues = data["data"]["repository"]["issues"]
+        
+        for node in issues["nodes"]:
+            first_comment = node["comments"]["nodes"]
+            record = {
+                "number": node["number"],
+                "created_at": datetime.fromisoformat(node["createdAt"]),
+                "updated_at": datetime.fromisoformat(node["updatedAt"]),
+                "closed_at": datetime.fromisoformat(node["closedAt"]) if node["closedAt"] else None,
+                "state": node["state"].lower(),
+                "labels": [label["name"].lower() for label in node["labels"]["nodes"]],
+                "first_response_at": datetime.fromisoformat(first_comment[0]["createdAt"]) if first_comment else None
+            }
+            
+            # Issues with more labels or reopen events than one page holds get them over REST instead
+            if node["labels"]["pageInfo"]["hasNextPage"]:
+                record["labels"] = [label.name.lower() for label in repo.get_issue(node["number"]).labels]
+            if not node["timelineItems"]["pageInfo"]["hasNextPage"]:
+                record["reopened_at"] = [datetime.fromisoformat(event["createdAt"]) for event in node["timelineItems"]["nodes"]]
             
-        # Only look at PRs updated in our time period
-        if pr.updated_at < start_date:
+            issue_records.append(record)
+        
+        if not issues["pageInfo"]["hasNextPage"]:
             break
-        if pr.updated_at > end_date:
-            continue
+        variables["cursor"] = issues["pageInfo"]["endCursor"]
+        checkpoint_page(checkpoint, progress, variables["cursor"])
+    
+    return issue_records
+
+@callstats.tracked
+def fetch_issue_records_rest(repo, start_date, checkpoint=None):
+    """Issue listing over REST (pull requests excluded); comments and events are fetched per issue later"""
+    issues = repo.get_issues(state='all', since=start_date, sort='updated', direction='desc')
+    
+    # Continue from the last checkpointed page of an interrupted fetch
+    progress = checkpoint_progress(checkpoint, "issues", "rest")
+    issue_records = progress["records"]
+    
+    for page in rest_pages(issues, checkpoint, progress):
+        for issue in page:
+            # Skip pull requests
+            if issue.pull_request:
+                continue
             
-        processed += 1
+            issue_records.append({
+                "number": issue.number,
+                "created_at": issue.created_at,
+                "updated_at": issue.updated_at,
+                "closed_at": issue.closed_at,
+                "state": issue.state,
+                "labels": [label.name.lower() for label in issue.labels],
+                "issue": issue  # Kept for per-issue comments/events requests
+            })
+    
+    return issue_records
+
+def bucket_issues_by_period(issue_records, periods_dict):
+    """Split the window's issues into the per-period selections each issue calculator works on"""
+    by_created = sorted(issue_records, key=lambda i: i["created_at"], reverse=True)
+    by_updated = sorted(issue_records, key=lambda i: i["updated_at"], reverse=True)
+    
+    issues_by_period = {}
+    
+    for period_key, period_bounds in periods_dict.items():
+        start_date = period_bounds["start"]
+        end_date = period_bounds["end"]
         
-        if pr.merged_at:
+        # Newest issue created before the period but updated since its start: the point where a
+        # per-period created-desc scan (since=start_date) stopped, after counting that issue's closure
+        boundary = next((i for i in by_created if i["created_at"] < start_date and i["updated_at"] >= start_date), None)
+        
+        issues_by_period[period_key] = {
+            "created": [i for i in by_created if start_date <= i["created_at"] <= end_date],
+            "updated": [i for i in by_updated if start_date <= i["updated_at"] <= end_date],
+            "boundary": boundary
+        }
+    
+    return issues_by_period
+
+@callstats.tracked
+def fetch_pr_records(repo, periods_dict, since=None, checkpoint=None):
+    """Single descending PR pass (newest update first) over the window, or only PRs updated since a date"""
+    prs = repo.get_pulls(state='all', sort='updated', direction='desc')
+    earliest_key = min(periods_dict, key=lambda k: periods_dict[k]["start"])
+    earliest_bounds = periods_dict[earliest_key]
+    stop_date = since or earliest_bounds["start"]
+    
+    # Continue from the last checkpointed page of an interrupted fetch
+    progress = checkpoint_progress(checkpoint, "prs", "rest")
+    pr_records = progress["records"]
+    earliest_records = [p for p in pr_records if earliest_bounds["start"] <= p["updated_at"] <= earliest_bounds["end"]]
+    earliest_all = len(earliest_records)
+    earliest_closed = sum(p["state"] == 'closed' for p in earliest_records)
+    
+    for page in rest_pages(prs, checkpoint, progress):
+        for pr in page:
+            # Stop once past the earliest period (or the given date)
+            if pr.updated_at < stop_date:
+                return pr_records
+            
+            pr_records.append({
+                "number": pr.number,
+                "state": pr.state,
+                "created_at": pr.created_at,
+                "updated_at": pr.updated_at,
+                "merged_at": pr.merged_at,
+                "pr": pr  # Kept for per-PR reviews requests
+            })
+            
+            # Stop early once the earliest period's samples are full (adaptive samples need every PR)
+            if sampling_mode == "fixed" and earliest_bounds["start"] <= pr.updated_at <= earliest_bounds["end"]:
+                earliest_all += 1
+                earliest_closed += pr.state == 'closed'
+                if earliest_all >= SAMPLE_LIMIT and earliest_closed >= SAMPLE_LIMIT:
+                    return pr_records
+    
+    return pr_records
+
+def bucket_prs_by_period(pr_records, periods_dict, limit=SAMPLE_LIMIT):
+    """Split PRs into per-period samples for merge-time (closed PRs) and review (all PRs) metrics (limit None: every PR)"""
+    prs_by_period = {period_key: {"closed": [], "all": []} for period_key in periods_dict}
+    
+    for record in sorted(pr_records, key=lambda p: p["updated_at"], reverse=True):
+        # Only PRs updated in a period count towards its samples (capped per period)
+        for period_key, period_bounds in periods_dict.items():
+            if not period_bounds["start"] <= record["updated_at"] <= period_bounds["end"]:
+                continue
+            period_prs = prs_by_period[period_key]
+            if limit is None or len(period_prs["all"]) < limit:
+                period_prs["all"].append(record)
+            if record["state"] == 'closed' and (limit is None or len(period_prs["closed"]) < limit):
+                period_prs["closed"].append(record)
+    
+    return prs_by_period
+
+@callstats.tracked
+def fetch_release_records(repo, start_date):
+    """Releases newest first, back to the first one published before start_date (always keeps the latest)"""
+    release_records = []
+    
+    for release in repo.get_releases():
+        release_records.append({
+            "published_at": release.published_at,
+            "body": (release.body or '').lower()
+        })
+        if release.published_at < start_date:
+            break
+    
+    return release_records
+
+# ==================== PER-ITEM DETAILS ====================
+@callstats.tracked
+def issue_first_response(repo, record):
+    """Time of an issue's first comment (fetched once, then kept on the record)"""
+    if "first_response_at" not in record:
+        issue = record.get("issue") or repo.get_issue(record["number"])
+        comments = issue.get_comments()
+        try:
+            record["first_response_at"] = comments[0].created_at
+        except (IndexError, StopIteration):
+            record["first_response_at"] = None
+    return record["first_response_at"]
+
+@callstats.tracked
+def issue_reopen_dates(repo, record):
+    """Times an issue was reopened (fetched once, then kept on the record)"""
+    if "reopened_at" not in record:
+        issue = record.get("issue") or repo.get_issue(record["number"])
+        record["reopened_at"] = [event.created_at for event in issue.get_events() if event.event == 'reopened']
+    return record["reopened_at"]
+
+@callstats.tracked
+def pr_review_details(repo, record):
+    """Reviewer logins (None for deleted users) and review comment count (fetched once, then kept on the record)"""
+    if "reviewers" not in record:
+        pr = record.get("pr") or repo.get_pull(record["number"])
+        reviewers = [review.user.login if review.user else None for review in pr.get_reviews()]
+        record["review_comments"] = pr.review_comments
+        record["reviewers"] = reviewers  # Set last: a checkpoint written in between sees the PR as not yet fetched
+    return record["reviewers"], record["review_comments"]
+
+def prefetch_details(repo, records_by_period, fetch_details, phase, checkpoint=None):
+    """Fetch per-item details for each period's records with a bounded worker pool (metrics then read them in order)"""
+    # The same record can be sampled by more than one period; fetch it once (accounted to the first)
+    unique_records = {}
+    for period_key, records in records_by_period.items():
+        for record in records:
+            unique_records.setdefault(id(record), (period_key, record))
+    unique_records = list(unique_records.values())
+    
+    # Worker threads account their requests to this thread's repo
+    repo_scope = callstats.context()
+    
+    def fetch(item):
+        period_key, record = item
+        with budget_phase(phase), callstats.scope(**repo_scope, period=period_key):
+            return fetch_details(repo, record)
+    
+    # Details are kept on the records, so checkpointing the records checkpoints the details fetched so far
+    pool = ThreadPoolExecutor(max_workers=detail_pool_size)
+    try:
+        for _ in pool.map(fetch, unique_records):
+            save_checkpoint(checkpoint)  # Also re-raises the first failure
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+def period_samples(repo, records_by_period, key, fetch_details, phase, measure, kind, checkpoint=None):
+    """Each period's sample of records, with their details fetched (sampling_mode decides which records)
+
+    Fixed: the first SAMPLE_LIMIT records of each period as given. Adaptive: records spread over
+    the period by key, fetched a batch at a time until measure(period_key, sample, population)
+    returns an (estimate, interval) tight enough for its kind ("mean" or "proportion").
+    """
+    if sampling_mode == "fixed":
+        samples = {period_key: records[:SAMPLE_LIMIT] for period_key, records in records_by_period.items()}
+        prefetch_details(repo, samples, fetch_details, phase, checkpoint)
+        return samples
+    
+    samples = {}
+    for period_key, records in records_by_period.items():
+        samples[period_key] = sampling.adaptive_sample(
+            sampling.spread_order(records, key),
+            lambda batch: prefetch_details(repo, {period_key: batch}, fetch_details, phase, checkpoint),
+            lambda sample: measure(period_key, sample, len(records)),
+            kind,
+            SAMPLE_LIMIT
+        )
+    return samples
+
+def metric_estimate(metrics, field):
+    """(value, confidence interval) of one calculated metric"""
+    return metrics[field], metrics[field + "_ci"]
+
+def calculate_pr_metrics(period_prs, population=None):
+    """Calculate PR merge times and patterns (sampled for API efficiency; population: closed PRs in the period, if known)"""
+    merge_times = []
+    merged_count = 0
+    closed_without_merge = 0
+    
+    # Closed PRs updated in our time period
+    for record in period_prs["closed"]:
+        if record["merged_at"]:
             # Calculate time from opened to merged (in hours)
-            time_to_merge = (pr.merged_at - pr.created_at).total_seconds() / 3600
+            time_to_merge = (record["merged_at"] - record["created_at"]).total_seconds() / 3600
             merge_times.append(time_to_merge)
             merged_count += 1
         else:
@@ -170,39 +703,28 @@ def calculate_pr_metrics(repo, start_date, end_date):
         "merged_count": merged_count,
         "closed_without_merge": closed_without_merge,
         "avg_merge_time_hours": round(avg_merge_time, 2),
+        "avg_merge_time_hours_ci": sampling.mean_interval(merge_times, len(period_prs["closed"]), population),
         "merge_times_sample": [round(t, 2) for t in merge_times[:5]]  # First 5 for inspection
     }
 
-def calculate_issue_response_times(repo, start_date, end_date):
-    """Calculate time to first response for issues (sampled for API efficiency)"""
-    issues = repo.get_issues(state='all', since=start_date, sort='created', direction='desc')
-    
+def calculate_issue_response_times(repo, period_issues, population=None):
+    """Calculate time to first response for issues (sampled for API efficiency; population: issues created in the period)"""
     response_times = []
     issues_without_response = 0
     issues_counted = 0
     
-    for issue in issues:
+    # Only issues created in our time period, newest first
+    for record in period_issues["created"]:
         if issues_counted >= SAMPLE_LIMIT:
             break
             
-        # Only issues created in our time period
-        if issue.created_at > end_date:
-            continue
-        if issue.created_at < start_date:
-            break
-            
-        # Skip pull requests
-        if issue.pull_request:
-            continue
-            
         issues_counted += 1
-        comments = issue.get_comments()
+        first_response_at = issue_first_response(repo, record)
         
-        try:
-            first_comment = comments[0]
-            time_to_response = (first_comment.created_at - issue.created_at).total_seconds() / 3600
+        if first_response_at:
+            time_to_response = (first_response_at - record["created_at"]).total_seconds() / 3600
             response_times.append(time_to_response)
-        except (IndexError, StopIteration):
+        else:
             issues_without_response += 1
     
     avg_response_time = sum(response_times) / len(response_times) if response_times else 0
@@ -212,43 +734,34 @@ def calculate_issue_response_times(repo, start_date, end_date):
         "issues_with_response": len(response_times),
         "issues_without_response": issues_without_response,
         "avg_response_time_hours": round(avg_response_time, 2),
+        "avg_response_time_hours_ci": sampling.mean_interval(response_times, issues_counted, population),
         "response_times_sample": [round(t, 2) for t in response_times[:5]]
     }
 
-def calculate_pr_review_metrics(repo, start_date, end_date):
-    """Calculate PR review participation (sampled for API efficiency)"""
-    prs = repo.get_pulls(state='all', sort='updated', direction='desc')
-    
+def calculate_pr_review_metrics(repo, period_prs, population=None):
+    """Calculate PR review participation (sampled for API efficiency; population: PRs updated in the period, if known)"""
+    review_counts = []
     total_reviewers = set()
     total_reviews = 0
     prs_with_reviews = 0
     prs_without_reviews = 0
     review_comments = 0
-    processed = 0
     
-    for pr in prs:
-        if processed >= SAMPLE_LIMIT:
-            break
-            
-        if pr.updated_at < start_date:
-            break
-        if pr.updated_at > end_date:
-            continue
-            
-        processed += 1
-        
+    # All PRs updated in our time period
+    for record in period_prs["all"]:
         # Get reviews for this PR
-        reviews = pr.get_reviews()
+        reviewers, pr_review_comments = pr_review_details(repo, record)
         review_count = 0
         
-        for review in reviews:
+        for reviewer in reviewers:
             review_count += 1
             total_reviews += 1
-            if review.user:
-                total_reviewers.add(review.user.login)
+            if reviewer:
+                total_reviewers.add(reviewer)
         
         # Count review comments
-        review_comments += pr.review_comments
+        review_comments += pr_review_comments
+        review_counts.append(review_count)
         
         if review_count > 0:
             prs_with_reviews += 1
@@ -264,21 +777,21 @@ def calculate_pr_review_metrics(repo, start_date, end_date):
         "unique_reviewers": len(total_reviewers),
         "total_reviews": total_reviews,
         "review_comments": review_comments,
-        "avg_reviews_per_pr": round(total_reviews / total_prs, 2) if total_prs > 0 else 0
+        "avg_reviews_per_pr": round(total_reviews / total_prs, 2) if total_prs > 0 else 0,
+        "avg_reviews_per_pr_ci": sampling.mean_interval(review_counts, total_prs, population)
     }
 
-def calculate_contributor_metrics(repo, periods_dict):
+def calculate_contributor_metrics(commit_records, periods_dict):
     """Calculate contributor growth and retention across all periods"""
     # Track contributors by period
     contributors_by_period = {}
     
     for period_key, period_bounds in periods_dict.items():
         contributors_set = set()
-        commits = repo.get_commits(since=period_bounds["start"], until=period_bounds["end"])
         
-        for commit in commits:
-            if commit.author:
-                contributors_set.add(commit.author.login)
+        for commit in commits_in_period(commit_records, period_bounds["start"], period_bounds["end"]):
+            if commit["author"]:
+                contributors_set.add(commit["author"])
         
         contributors_by_period[period_key] = contributors_set
     
@@ -312,10 +825,8 @@ def calculate_contributor_metrics(repo, periods_dict):
     
     return metrics_by_period
 
-def calculate_bug_feature_metrics(repo, start_date, end_date):
-    """Classify issues as bugs vs features (sampled for API efficiency)"""
-    issues = repo.get_issues(state='all', since=start_date, sort='created', direction='desc')
-    
+def calculate_bug_feature_metrics(period_issues, population=None):
+    """Classify issues as bugs vs features (sampled for API efficiency; population: issues created in the period)"""
     bugs_opened = 0
     bugs_closed = 0
     features_opened = 0
@@ -323,33 +834,24 @@ def calculate_bug_feature_metrics(repo, start_date, end_date):
     other_issues = 0
     processed = 0
     
-    for issue in issues:
+    for record in period_issues["created"]:
         if processed >= SAMPLE_LIMIT:
             break
-            
-        if issue.created_at > end_date:
-            continue
-        if issue.created_at < start_date:
-            break
-            
-        # Skip pull requests
-        if issue.pull_request:
-            continue
         
         processed += 1
         
         # Check labels
-        labels = [label.name.lower() for label in issue.labels]
+        labels = record["labels"]
         is_bug = any(term in label for label in labels for term in ['bug', 'defect', 'error'])
         is_feature = any(term in label for label in labels for term in ['feature', 'enhancement', 'improvement'])
         
         if is_bug:
             bugs_opened += 1
-            if issue.state == 'closed':
+            if record["state"] == 'closed':
                 bugs_closed += 1
         elif is_feature:
             features_opened += 1
-            if issue.state == 'closed':
+            if record["state"] == 'closed':
                 features_closed += 1
         else:
             other_issues += 1
@@ -361,35 +863,32 @@ def calculate_bug_feature_metrics(repo, start_date, end_date):
         "bugs_opened": bugs_opened,
         "bugs_closed": bugs_closed,
         "bug_closure_rate": round(bug_closure_rate, 2),
+        "bug_closure_rate_ci": sampling.proportion_interval(bugs_closed, bugs_opened, processed, population, digits=2),
         "features_opened": features_opened,
         "features_closed": features_closed,
         "feature_closure_rate": round(feature_closure_rate, 2),
+        "feature_closure_rate_ci": sampling.proportion_interval(features_closed, features_opened, processed, population, digits=2),
         "other_issues": other_issues
     }
 
-def calculate_issue_accumulation(repo, start_date, end_date):
+def calculate_issue_accumulation(period_issues, start_date, end_date):
     """Calculate issue backlog growth/shrinkage (full collection - no sampling needed)"""
-    issues = repo.get_issues(state='all', since=start_date, sort='created', direction='desc')
-    
     opened = 0
     closed = 0
     
-    for issue in issues:
-        # Skip pull requests
-        if issue.pull_request:
-            continue
-            
+    # Issues created in period, plus the issue the scan stopped at once past the period
+    scanned = list(period_issues["created"])
+    if period_issues["boundary"]:
+        scanned.append(period_issues["boundary"])
+    
+    for record in scanned:
         # Issues created in period
-        if start_date <= issue.created_at <= end_date:
+        if start_date <= record["created_at"] <= end_date:
             opened += 1
         
         # Issues closed in period
-        if issue.closed_at and start_date <= issue.closed_at <= end_date:
+        if record["closed_at"] and start_date <= record["closed_at"] <= end_date:
             closed += 1
-        
-        # Stop when we're past the period
-        if issue.created_at < start_date:
-            break
     
     net_accumulation = opened - closed
     
@@ -400,37 +899,26 @@ def calculate_issue_accumulation(repo, start_date, end_date):
         "accumulation_rate": round(net_accumulation / opened, 2) if opened > 0 else 0
     }
 
-def detect_breaking_changes(repo, start_date, end_date):
+def detect_breaking_changes(release_records, commit_records, start_date, end_date):
     """Detect breaking changes from release notes and commit messages"""
-    releases = repo.get_releases()
-    
-    breaking_releases = 0
-    total_releases = 0
-    breaking_keywords = ['breaking', 'breaking change', 'bc break', 'backwards incompatible', 'major version', 'migration required', 'deprecated']
+    breaking = message_classifier().select("breaking")
+    releases = []
     
-    for release in releases:
-        if release.published_at < start_date:
+    for release in release_records:
+        if release["published_at"] < start_date:
             break
-        if release.published_at > end_date:
+        if release["published_at"] > end_date:
             continue
-            
-        total_releases += 1
-        
-        # Check release notes for breaking change indicators
-        body = (release.body or '').lower()
-        if any(keyword in body for keyword in breaking_keywords):
-            breaking_releases += 1
+        releases.append(release)
     
-    # Also check commit messages
-    commits = repo.get_commits(since=start_date, until=end_date)
-    breaking_commits = 0
-    total_commits = 0
+    # Check release notes for breaking change indicators
+    total_releases = len(releases)
+    breaking_releases = sum(1 for labels in breaking.label_batch(release["body"] for release in releases) if labels)
     
-    for commit in commits:
-        total_commits += 1
-        message = commit.commit.message.lower()
-        if any(keyword in message for keyword in breaking_keywords):
-            breaking_commits += 1
+    # Also check commit messages
+    commits = commits_in_period(commit_records, start_date, end_date)
+    total_commits = len(commits)
+    breaking_commits = sum(1 for labels in breaking.label_batch(commit["message"] for commit in commits) if labels)
     
     return {
         "total_releases": total_releases,
@@ -440,42 +928,31 @@ def detect_breaking_changes(repo, start_date, end_date):
         "breaking_change_rate": round(breaking_commits / total_commits, 3) if total_commits > 0 else 0
     }
 
-def calculate_regression_rate(repo, start_date, end_date):
-    """Detect regression through reopened issues (sampled for API efficiency)"""
-    issues = repo.get_issues(state='all', since=start_date, sort='updated', direction='desc')
-    
+def calculate_regression_rate(repo, period_issues, start_date, end_date, population=None):
+    """Detect regression through reopened issues (sampled for API efficiency; population: issues updated in the period)"""
     reopened_count = 0
     total_issues = 0
     
-    for issue in issues:
+    # Issues updated in our time period, most recently updated first
+    for record in period_issues["updated"]:
         if total_issues >= SAMPLE_LIMIT:
             break
-            
-        if issue.updated_at < start_date:
-            break
-        if issue.updated_at > end_date:
-            continue
-            
-        # Skip pull requests
-        if issue.pull_request:
-            continue
         
         total_issues += 1
         
         # Check timeline for reopen events
-        events = issue.get_events()
-        for event in events:
-            if event.event == 'reopened':
-                if start_date <= event.created_at <= end_date:
-                    reopened_count += 1
-                    break  # Count each issue only once
+        for reopened_at in issue_reopen_dates(repo, record):
+            if start_date <= reopened_at <= end_date:
+                reopened_count += 1
+                break  # Count each issue only once
     
     regression_rate = reopened_count / total_issues if total_issues > 0 else 0
     
     return {
         "total_issues": total_issues,
         "reopened_issues": reopened_count,
-        "regression_rate": round(regression_rate, 3)
+        "regression_rate": round(regression_rate, 3),
+        "regression_rate_ci": sampling.proportion_interval(reopened_count, total_issues, total_issues, population)
     }
 
 def calculate_refactoring_and_dependencies(period_data):
@@ -517,25 +994,295 @@ def calculate_feature_and_growth_metrics(period_data):
         "growth_rate": round(net_loc_change / total_commits, 2) if total_commits > 0 else 0
     }
 
-# ==================== MAIN COLLECTION LOOP ====================
-# Load existing data if present
-try:
-    with open('repo_data.json', 'r') as f:
-        all_repo_data = json.load(f)
-    collected_names = {r['name'] for r in all_repo_data}
-    print(f"Found existing data: {len(all_repo_data)} repos already collected\n")
-except (FileNotFoundError, json.JSONDecodeError):
-    all_repo_data = []
-    collected_names = set()
-
-# Get data for each repo
-for repo_name in repos:
-    if repo_name in collected_names:
-        print(f"Skipping: {repo_name} (already collected)")
-        continue
+# ==================== INCREMENTAL STATE ====================
+def state_path(repo_name):
+    """Per-repo state file holding the raw records behind the last collection"""
+    return os.path.join(STATE_DIR, repo_name.replace('/', '__') + '.json')
+
+def encode_record(record):
+    """JSON-ready copy of a record: dates (keys ending _at) as ISO strings, PyGithub objects dropped"""
+    encoded = {}
+    for key, value in list(record.items()):
+        if key in ("issue", "pr"):
+            continue
+        if key.endswith("_at") and isinstance(value, list):
+            value = [v.isoformat() for v in value]
+        elif key.endswith("_at") and value is not None:
+            value = value.isoformat()
+        encoded[key] = value
+    return encoded
+
+def decode_record(record):
+    """Inverse of encode_record"""
+    decoded = dict(record)
+    for key, value in record.items():
+        if key.endswith("_at") and isinstance(value, list):
+            decoded[key] = [datetime.fromisoformat(v) for v in value]
+        elif key.endswith("_at") and value is not None:
+            decoded[key] = datetime.fromisoformat(value)
+    return decoded
+
+def load_repo_state(repo_name):
+    """Raw records and repo markers from the last collection, or None if there are none"""
+    try:
+        with open(state_path(repo_name), 'r') as f:
+            state = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    
+    for key in ("commits", "issues", "prs", "releases"):
+        state[key] = [decode_record(r) for r in state[key]]
+    return decode_record(state)
+
+def save_repo_state(repo_name, state):
+    """Write a repo's state file (temporary file then rename)"""
+    os.makedirs(STATE_DIR, exist_ok=True)
+    encoded = encode_record(state)
+    for key in ("commits", "issues", "prs", "releases"):
+        encoded[key] = [encode_record(r) for r in state[key]]
+    
+    path = state_path(repo_name)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(encoded, f)
+    os.replace(path + '.tmp', path)
+
+def merge_records(stored_records, fresh_records, key):
+    """Stored records updated with freshly fetched ones (fresh wins on the same key)"""
+    merged = {r[key]: r for r in stored_records}
+    for record in fresh_records:
+        merged[record[key]] = record
+    return list(merged.values())
+
+def repo_unchanged(repo, state):
+    """Cheap check: no pushes, repo updates or issue/PR count changes since the last collection"""
+    return (repo.pushed_at == state["pushed_at"]
+            and repo.updated_at == state["updated_at"]
+            and repo.open_issues_count == state["open_issues_count"])
+
+@callstats.tracked
+def fetch_repo_counts(repo):
+    """Repository-wide totals that don't depend on the period records"""
+    return {
+        "total_contributors": repo.get_contributors().totalCount,
+        "pull_requests_open": repo.get_pulls(state='open').totalCount,
+        "pull_requests_closed": repo.get_pulls(state='closed').totalCount,
+        "issues_closed_last_3_months": repo.get_issues(state='closed', since=three_months_ago).totalCount
+    }
+
+# ==================== CHECKPOINTS ====================
+def checkpoint_path(repo_name):
+    """Checkpoint file of an unfinished collection of owner/repo"""
+    return os.path.join(STATE_DIR, repo_name.replace('/', '__') + '.checkpoint.json')
+
+def new_checkpoint(repo_name, plan, window_start, window_end):
+    """Empty checkpoint for a collection plan ("full", "unchanged" or "incremental") over a fixed window"""
+    return {
+        "repo": repo_name,
+        "plan": plan,
+        "window_start_at": window_start,
+        "collected_at": window_end,
+        "categories": {},
+        "written": time.time()
+    }
+
+def load_checkpoint(repo_name):
+    """Checkpoint left by an interrupted collection, or None"""
+    try:
+        with open(checkpoint_path(repo_name), 'r') as f:
+            checkpoint = decode_record(json.load(f))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    
+    for progress in checkpoint["categories"].values():
+        if isinstance(progress["records"], list):
+            progress["records"] = [decode_record(r) for r in progress["records"]]
+    checkpoint["written"] = time.time()
+    return checkpoint
+
+def write_checkpoint(checkpoint):
+    """Write a checkpoint file (temporary file then rename)"""
+    os.makedirs(STATE_DIR, exist_ok=True)
+    encoded = encode_record({key: value for key, value in checkpoint.items() if key not in ("categories", "written")})
+    encoded["categories"] = {
+        category: {
+            **progress,
+            "records": [encode_record(r) for r in progress["records"]] if isinstance(progress["records"], list) else progress["records"]
+        }
+        for category, progress in checkpoint["categories"].items()
+    }
+    
+    path = checkpoint_path(checkpoint["repo"])
+    with open(path + '.tmp', 'w') as f:
+        json.dump(encoded, f)
+    os.replace(path + '.tmp', path)
+    checkpoint["written"] = time.time()
+
+def save_checkpoint(checkpoint, force=False):
+    """Write the checkpoint if CHECKPOINT_INTERVAL has passed; after Ctrl-C, write it and stop this repo"""
+    if checkpoint is None:
+        return
+    if force or stop_requested.is_set() or time.time() - checkpoint["written"] >= CHECKPOINT_INTERVAL:
+        write_checkpoint(checkpoint)
+    if stop_requested.is_set():
+        raise KeyboardInterrupt
+
+def discard_checkpoint(repo_name):
+    """Remove a repo's checkpoint once its collection is saved"""
+    try:
+        os.remove(checkpoint_path(repo_name))
+    except FileNotFoundError:
+        pass
+
+def checkpoint_progress(checkpoint, category, source):
+    """Partial fetch of one category to continue ({"records", "cursor"}); starts over if another backend made it"""
+    fresh = {"source": source, "records": [], "cursor": None, "kept": 0, "done": False}
+    if checkpoint is None:
+        return fresh
+    
+    progress = checkpoint["categories"].get(category)
+    if progress is None or progress["source"] != source or progress["done"]:
+        progress = checkpoint["categories"][category] = fresh
+    
+    # Records from a page that was only partly processed are fetched again with that page
+    del progress["records"][progress["kept"]:]
+    return progress
+
+def checkpoint_page(checkpoint, progress, cursor):
+    """Mark every record so far as fetched, with the listing continuing at cursor"""
+    progress["cursor"] = cursor
+    progress["kept"] = len(progress["records"])
+    save_checkpoint(checkpoint)
+
+def rest_pages(paginated, checkpoint, progress):
+    """Pages of a REST listing, starting at the checkpointed page"""
+    page = progress["cursor"] or 0
+    while True:
+        items = with_retry(lambda: paginated.get_page(page))
+        if items:
+            yield items
+        if len(items) < client().per_page:
+            return
+        page += 1
+        checkpoint_page(checkpoint, progress, page)
+
+def checkpointed(checkpoint, category, fetch):
+    """A category's records: from the checkpoint if already fetched, else fetched and checkpointed"""
+    progress = checkpoint["categories"].get(category) if checkpoint is not None else None
+    if progress is not None and progress["done"]:
+        return progress["records"]
+    
+    records = fetch()
+    if checkpoint is not None:
+        checkpoint["categories"][category] = {"source": None, "records": records, "cursor": None, "kept": 0, "done": True}
+        save_checkpoint(checkpoint, force=True)
+    return records
+
+# ==================== REPOSITORY COLLECTION ====================
+def fetch_repo_records(repo, repo_name, plan, state, window_start, window_end, checkpoint=None):
+    """Commit, issue, PR and release records and repo totals for a collection plan, continuing a checkpoint
+
+    Plans: "full" fetches the whole window, "unchanged" reuses the stored records and "incremental" merges
+    the activity since the state's collection into its records.
+    """
+    if plan == "full":
+        fetchers = {
+            "commits": lambda: fetch_commit_records(repo, window_start, window_end, repo_name, checkpoint),
+            "issues": lambda: fetch_issue_records(repo, window_start, repo_name, checkpoint),
+            "prs": lambda: fetch_pr_records(repo, time_periods, checkpoint=checkpoint),
+            "releases": lambda: fetch_release_records(repo, window_start),
+            "counts": lambda: fetch_repo_counts(repo)
+        }
+    elif plan == "unchanged":
+        # Nothing happened since the last run: reuse the stored records, only the periods move
+        print(f"{repo_name}: unchanged since last collection, reusing stored records")
+        fetchers = {key: (lambda key=key: state[key]) for key in ("commits", "issues", "prs", "releases", "counts")}
+    else:
+        # Incremental: fetch only activity since the last run and merge it into the stored records
+        since = state["collected_at"]
+        fetchers = {
+            "commits": lambda: merge_records(state["commits"], fetch_commit_records(repo, since - timedelta(days=INCREMENTAL_OVERLAP_DAYS), window_end, repo_name, checkpoint), "sha"),
+            "issues": lambda: merge_records(state["issues"], fetch_issue_records(repo, since, repo_name, checkpoint), "number"),
+            "prs": lambda: merge_records(state["prs"], fetch_pr_records(repo, time_periods, since=since, checkpoint=checkpoint), "number"),
+            "releases": lambda: fetch_release_records(repo, window_start),
+            "counts": lambda: fetch_repo_counts(repo)
+        }
+    
+    # A local clone is re-read over the whole window every run (it costs no API requests)
+    if git_clone_dir:
+        fetchers["commits"] = lambda: fetch_commit_records(repo, window_start, window_end, repo_name)
     
+    records = {}
+    for key, phase in (("commits", "commits"), ("issues", "issues"), ("prs", "pull requests"), ("releases", "releases"), ("counts", "repo totals")):
+        with budget_phase(phase):
+            records[key] = checkpointed(checkpoint, key, fetchers[key])
+    return records
+
+@callstats.tracked
+def collect_repo(repo_name, incremental=False):
+    """Collect every metric for one repository (safe to run on several repos at once)
+
+    With incremental=True and a state file from an earlier run, only activity since that run is
+    fetched and merged into the stored records, and the periods are recomputed over the new window.
+    An interrupted collection continues from its checkpoint without repeating the requests it made.
+    """
     print(f"Collecting: {repo_name}")
-    repo = g.get_repo(repo_name)
+    
+    # Every request made for this repo (including by detail worker threads) is accounted to it
+    with callstats.scope(repo=repo_name):
+        repo = client().get_repo(repo_name)
+        window_start = time_periods["period_1"]["start"]
+        window_end = time_periods["period_4"]["end"]
+        
+        # Continue an interrupted collection from its checkpoint (same plan and window), or plan a new one
+        checkpoint = load_checkpoint(repo_name)
+        if checkpoint is not None:
+            state = load_repo_state(repo_name) if checkpoint["plan"] != "full" else None
+            if checkpoint["plan"] != "full" and state is None:
+                checkpoint = None  # The state it builds on is gone
+            else:
+                print(f"{repo_name}: resuming from checkpoint")
+        if checkpoint is None:
+            state = load_repo_state(repo_name) if incremental else None
+            plan = "full" if state is None else ("unchanged" if repo_unchanged(repo, state) else "incremental")
+            checkpoint = new_checkpoint(repo_name, plan, window_start, window_end)
+        
+        try:
+            return collect_repo_metrics(repo, repo_name, state, checkpoint)
+        except BaseException:
+            # Keep everything fetched so far for the next run (Ctrl-C, network failure, ...)
+            write_checkpoint(checkpoint)
+            raise
+
+def collect_repo_metrics(repo, repo_name, state, checkpoint):
+    """Fetch (or continue fetching) a repository's records and compute its metrics"""
+    window_start = time_periods["period_1"]["start"]
+    window_end = time_periods["period_4"]["end"]
+    records = fetch_repo_records(repo, repo_name, checkpoint["plan"], state,
+                                 checkpoint["window_start_at"], checkpoint["collected_at"], checkpoint)
+    
+    if checkpoint["collected_at"] < window_end:
+        # Resumed after time moved on: add the activity since the interrupted run's window
+        records = fetch_repo_records(repo, repo_name, "incremental", {**records, "collected_at": checkpoint["collected_at"]},
+                                     window_start, window_end)
+        checkpoint.update({"window_start_at": window_start, "collected_at": window_end})
+        for key, value in records.items():
+            checkpoint["categories"][key]["records"] = value
+        save_checkpoint(checkpoint, force=True)
+    
+    commit_records = records["commits"]
+    issue_records = records["issues"]
+    pr_records = records["prs"]
+    release_records = records["releases"]
+    counts = records["counts"]
+    
+    # Drop records that have rolled out of the window (commits newest first)
+    commit_records = sorted(
+        [c for c in commit_records if c["committed_at"] >= window_start],
+        key=lambda c: c["committed_at"],
+        reverse=True
+    )
+    issue_records = [i for i in issue_records if i["updated_at"] >= window_start]
+    pr_records = [p for p in pr_records if p["updated_at"] >= window_start]
     
     # Create dictionary for repo
     repo_data = {
@@ -547,18 +1294,16 @@ for repo_name in repos:
     created_date = repo.created_at
     repo_age_days = (datetime.now(timezone.utc) - created_date).days
 
-    # Calculate evolvability and velocity metrics per time period (consolidated single pass)
+    # Calculate evolvability and velocity metrics per time period
     refactoring_by_period = {}
     feature_growth_by_period = {}
     period_metrics = {}
     
     for period_key, period_bounds in time_periods.items():
-        # Collect commits once per period
         period_data = collect_period_commits(
-            repo,
+            commit_records,
             period_bounds["start"],
-            period_bounds["end"],
-            repo_name
+            period_bounds["end"]
         )
         
         # Process collected data through metric functions
@@ -578,48 +1323,51 @@ for repo_name in repos:
     }
     
     # ==================== VELOCITY (30%) ====================
-    # Get commits
-    commits = repo.get_commits()
-
-    # Last commit date
-    last_commit = commits[0]
-    last_commit_date = last_commit.commit.author.date
+    # Last commit date: the latest author date, as records are ordered by commit date (rebases reorder
+    # author dates); outside the window only for repos with no commits in 24 months
+    if commit_records:
+        last_commit_date = max(c["authored_at"] for c in commit_records)
+    elif git_clone_dir and gitlog.has_commits(gitlog.clone_path(git_clone_dir, repo_name, api_base_url)):
+        last_commit_date = gitlog.last_commit_date(gitlog.clone_path(git_clone_dir, repo_name, api_base_url))
+    elif state is not None:
+        last_commit_date = state["last_commit_at"]
+    else:
+        last_commit_date = repo.get_commits()[0].commit.author.date
     
     # Count commits in last 3 months
-    recent_commit_count = 0
-    for commit in commits:
-        if commit.commit.author.date >= three_months_ago:
-            recent_commit_count += 1
-        else:
-            break
+    recent_commit_count = sum(1 for c in commit_records if c["authored_at"] >= three_months_ago)
+    
+    # Calculate PR merge velocity per time period (PRs split into per-period samples for merge-time and review metrics,
+    # uncapped for adaptive sampling, which spreads its samples over every PR updated in the period)
+    prs_by_period = bucket_prs_by_period(pr_records, time_periods, SAMPLE_LIMIT if sampling_mode == "fixed" else None)
+    
+    # PRs in each period when the listing reached all of them (fixed sampling stops at the cap)
+    pr_population = {
+        period_key: {kind: len(prs) if sampling_mode == "adaptive" or len(prs) < SAMPLE_LIMIT else None for kind, prs in period_prs.items()}
+        for period_key, period_prs in prs_by_period.items()
+    }
     
-    # Calculate PR merge velocity per time period
     pr_metrics_by_period = {}
-    for period_key, period_bounds in time_periods.items():
-        pr_metrics_by_period[period_key] = calculate_pr_metrics(
-            repo,
-            period_bounds["start"],
-            period_bounds["end"]
-        )
+    for period_key in time_periods:
+        period_prs = prs_by_period[period_key]
+        if sampling_mode == "adaptive":
+            # Merge times are on the PR records already, so every closed PR is used
+            period_prs = {**period_prs, "closed": sampling.spread_order(period_prs["closed"], lambda p: p["updated_at"])}
+        pr_metrics_by_period[period_key] = calculate_pr_metrics(period_prs, pr_population[period_key]["closed"])
 
     # Get release info
-    releases = repo.get_releases()
-    latest_release = None
     latest_release_date = None
     recent_releases = 0
     
-    try:
-        latest_release = releases[0]
-        latest_release_date = latest_release.published_at.strftime('%Y-%m-%d')
+    if release_records:
+        latest_release_date = release_records[0]["published_at"].strftime('%Y-%m-%d')
         
         one_year_ago = datetime.now(timezone.utc) - timedelta(days=365)
-        for release in releases:
-            if release.published_at >= one_year_ago:
+        for release in release_records:
+            if release["published_at"] >= one_year_ago:
                 recent_releases += 1
             else:
                 break
-    except (IndexError, StopIteration):
-        pass  # No releases, keep defaults as None/0
     
     # Build velocity data once
     repo_data["velocity"] = {
@@ -632,71 +1380,81 @@ for repo_name in repos:
     }
     
     # ==================== COLLABORATION (25%) ====================
-    # Get contributor info
-    contributors = repo.get_contributors()
-    total_contributors = contributors.totalCount
-    
     # Count active contributors from recent commits
     active_contributors_set = set()
-    for commit in repo.get_commits(since=three_months_ago):
-        if commit.author:
-            active_contributors_set.add(commit.author.login)
+    for commit in commits_in_period(commit_records, three_months_ago, time_periods["period_4"]["end"]):
+        if commit["author"]:
+            active_contributors_set.add(commit["author"])
     
     active_contributors = len(active_contributors_set)
     
     # Calculate contributor growth and retention across periods
-    contributor_metrics_by_period = calculate_contributor_metrics(repo, time_periods)
+    contributor_metrics_by_period = calculate_contributor_metrics(commit_records, time_periods)
+    
+    # Split issues into periods for all issue metrics
+    issues_by_period = bucket_issues_by_period(issue_records, time_periods)
+    
+    # Sample the issues and PRs whose comments, events and reviews are needed, fetching those several at a time
+    responded_samples = period_samples(
+        repo, {k: p["created"] for k, p in issues_by_period.items()}, lambda i: i["created_at"],
+        issue_first_response, "issue comments",
+        lambda k, sample, population: metric_estimate(calculate_issue_response_times(repo, {"created": sample}, population), "avg_response_time_hours"),
+        "mean", checkpoint
+    )
+    reopened_samples = period_samples(
+        repo, {k: p["updated"] for k, p in issues_by_period.items()}, lambda i: i["updated_at"],
+        issue_reopen_dates, "issue events",
+        lambda k, sample, population: metric_estimate(calculate_regression_rate(
+            repo, {"updated": sample}, time_periods[k]["start"], time_periods[k]["end"], population
+        ), "regression_rate"),
+        "proportion", checkpoint
+    )
+    reviewed_samples = period_samples(
+        repo, {k: p["all"] for k, p in prs_by_period.items()}, lambda p: p["updated_at"],
+        pr_review_details, "pr reviews",
+        lambda k, sample, population: metric_estimate(calculate_pr_review_metrics(repo, {"all": sample}, population), "avg_reviews_per_pr"),
+        "mean", checkpoint
+    )
     
     # Calculate issue response times per time period
     issue_response_by_period = {}
-    for period_key, period_bounds in time_periods.items():
+    for period_key in time_periods:
         issue_response_by_period[period_key] = calculate_issue_response_times(
-            repo,
-            period_bounds["start"],
-            period_bounds["end"]
+            repo, {**issues_by_period[period_key], "created": responded_samples[period_key]}, len(issues_by_period[period_key]["created"])
         )
     
     # Calculate PR review participation per time period
     pr_review_by_period = {}
-    for period_key, period_bounds in time_periods.items():
+    for period_key in time_periods:
         pr_review_by_period[period_key] = calculate_pr_review_metrics(
-            repo,
-            period_bounds["start"],
-            period_bounds["end"]
+            repo, {**prs_by_period[period_key], "all": reviewed_samples[period_key]}, pr_population[period_key]["all"]
         )
     
-    # Get pull request info
-    open_prs = repo.get_pulls(state='open').totalCount
-    closed_prs = repo.get_pulls(state='closed').totalCount
-    
     repo_data["collaboration"] = {
-        "total_contributors": total_contributors,
+        "total_contributors": counts["total_contributors"],
         "active_contributors_last_3_months": active_contributors,
         "contributor_metrics_by_period": contributor_metrics_by_period,
-        "pull_requests_open": open_prs,
-        "pull_requests_closed": closed_prs,
+        "pull_requests_open": counts["pull_requests_open"],
+        "pull_requests_closed": counts["pull_requests_closed"],
         "issue_response_by_period": issue_response_by_period,
         "pr_review_by_period": pr_review_by_period
     }
     
     # ==================== QUALITY (25%) ====================
-    # Count closed issues in last 3 months
-    closed_issues = repo.get_issues(state='closed', since=three_months_ago).totalCount
-    
     # Calculate bug vs feature metrics per time period
     bug_feature_by_period = {}
-    for period_key, period_bounds in time_periods.items():
-        bug_feature_by_period[period_key] = calculate_bug_feature_metrics(
-            repo,
-            period_bounds["start"],
-            period_bounds["end"]
-        )
+    for period_key in time_periods:
+        period_issues = issues_by_period[period_key]
+        if sampling_mode == "adaptive":
+            # Labels and states are on the issue records already, so the sample is only spread out
+            period_issues = {**period_issues, "created": sampling.spread_order(period_issues["created"], lambda i: i["created_at"])}
+        bug_feature_by_period[period_key] = calculate_bug_feature_metrics(period_issues, len(issues_by_period[period_key]["created"]))
 
     # Calculate issue accumulation per time period
     issue_accumulation_by_period = {}
     for period_key, period_bounds in time_periods.items():
         issue_accumulation_by_period[period_key] = calculate_issue_accumulation(
-            repo,
+            issues_by_period[period_key],
             period_bounds["start"],
             period_bounds["end"]
         )
@@ -705,7 +1463,8 @@ for repo_name in repos:
     breaking_changes_by_period = {}
     for period_key, period_bounds in time_periods.items():
         breaking_changes_by_period[period_key] = detect_breaking_changes(
-            repo,
+            release_records,
+            commit_records,
             period_bounds["start"],
             period_bounds["end"]
         )
@@ -715,33 +1474,153 @@ for repo_name in repos:
     for period_key, period_bounds in time_periods.items():
         regression_by_period[period_key] = calculate_regression_rate(
             repo,
+            {**issues_by_period[period_key], "updated": reopened_samples[period_key]},
             period_bounds["start"],
-            period_bounds["end"]
+            period_bounds["end"],
+            len(issues_by_period[period_key]["updated"])
         )
     
     repo_data["quality"] = {
         "issues_open": repo.open_issues_count,
-        "issues_closed_last_3_months": closed_issues,
+        "issues_closed_last_3_months": counts["issues_closed_last_3_months"],
         "bug_feature_by_period": bug_feature_by_period,
         "issue_accumulation_by_period": issue_accumulation_by_period,
         "breaking_changes_by_period": breaking_changes_by_period,
         "regression_by_period": regression_by_period
     }
     
-    # Add to collection
-    all_repo_data.append(repo_data)
-    
-    # Save after each repo
-    with open('repo_data.json', 'w') as f:
-        json.dump(all_repo_data, f, indent=2)
+    # Keep the raw records (including per-issue/PR details fetched above) for the next incremental run
+    save_repo_state(repo_name, {
+        "collected_at": window_end,
+        "last_commit_at": last_commit_date,
+        "pushed_at": repo.pushed_at,
+        "updated_at": repo.updated_at,
+        "open_issues_count": repo.open_issues_count,
+        "counts": counts,
+        "commits": commit_records,
+        "issues": issue_records,
+        "prs": pr_records,
+        "releases": release_records
+    })
+    
+    return repo_data
+
+def save_repo_data(store, repo_data, position):
+    """Save one repo's row (existing repos in place, new ones at position) and a snapshot of it with its scores"""
+    from score import score_repo  # Imported on first save: it pulls in NumPy, which importing collect.py doesn't need
+    record = store.put(repo_data, position=position)
+    store.add_snapshot(record, score_repo(record))
+
+def stats_path(store):
+    """API call statistics file of a collection run, next to the collected data"""
+    return os.path.join(os.path.dirname(store.path), callstats.STATS_PATH)
+
+# ==================== COLLECTION RUN ====================
+def collect_repos(repo_names, store=None, workers=1, incremental=False, failures=None):
+    """Collect repos into the store (default repo_data.sqlite), up to workers at once; returns the store
+
+    Repos already in the store are skipped unless incremental, or continued if interrupted earlier.
+    New repos are stored in repo_names order. A repo that fails (e.g. renamed, or a network error)
+    is reported and skipped, keeping its checkpoint, and added to failures (repo -> exception) if
+    given. The periods move up to now first, and the run's API call statistics are written next to
+    the store when it ends (also after Ctrl-C).
+    """
+    client()
+    refresh_time_periods()
+    stop_requested.clear()
+    call_stats.reset()
+    
+    # Open the data store (imports repo_data.json from earlier versions on first use); an empty store is falsy
+    if store is None:
+        store = RepoStore()
+    collected_names = set(store.names())
+    if collected_names:
+        print(f"Found existing data: {len(collected_names)} repos already collected\n")
+    first_new_position = store.next_position()
+    repo_order = {name: i for i, name in enumerate(repo_names)}
+    
+    pending_repos = []
+    for repo_name in repo_names:
+        # Repos with a checkpoint were interrupted mid-collection and always continue
+        if repo_name in collected_names and not incremental and not os.path.exists(checkpoint_path(repo_name)):
+            print(f"Skipping: {repo_name} (already collected)")
+            continue
+        pending_repos.append(repo_name)
     
-    # Clear progress line and print save confirmation
-    print(f"\r{'':80}\r{repo_name}: ✓ Saved ({len(all_repo_data)}/{len(repos)} repos)")
+    # Collect repos concurrently; only this thread writes to the store
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(collect_repo, repo_name, incremental and repo_name in collected_names): repo_name
+                for repo_name in pending_repos
+            }
+            
+            try:
+                for future in as_completed(futures):
+                    repo_name = futures[future]
+                    try:
+                        repo_data = future.result()
+                    except Exception as e:
+                        # collect_repo checkpointed what it fetched; the other repos carry on
+                        print(f"\r{'':80}\r{repo_name}: ✗ Failed ({type(e).__name__}: {e}), skipped")
+                        if failures is not None:
+                            failures[repo_name] = e
+                        continue
+                    
+                    # Save after each repo
+                    save_repo_data(store, repo_data, first_new_position + repo_order[repo_name])
+                    discard_checkpoint(repo_name)
+                    
+                    # Clear progress line and print save confirmation
+                    print(f"\r{'':80}\r{repo_name}: ✓ Saved ({len(store)}/{len(repo_names)} repos)")
+            except KeyboardInterrupt:
+                # Workers write their checkpoint at their next step and stop; rerun collect.py to continue
+                print("\nInterrupted: checkpointing repos in progress (press Ctrl-C again to quit now)...")
+                stop_requested.set()
+                for future in futures:
+                    future.cancel()
+                raise
+    finally:
+        call_stats.write(stats_path(store))
+    
+    return store
 
-# Final save
-with open('repo_data.json', 'w') as f:
-    json.dump(all_repo_data, f, indent=2)
+def main(argv=None):
+    """Command line entry point: collect every repo listed in repos.txt"""
+    parser = argparse.ArgumentParser(description="Collect repository health metrics from GitHub")
+    parser.add_argument('--workers', type=int, default=1, help="number of repositories to collect concurrently (default: 1)")
+    parser.add_argument('--incremental', action='store_true', help="refresh already-collected repos with only the activity since their last collection")
+    parser.add_argument('--no-cache', action='store_true', help="don't use the on-disk HTTP response cache")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_MB, help=f"response cache size limit in MB (default: {DEFAULT_MAX_MB})")
+    parser.add_argument('--git-clones', nargs='?', const='.clones', metavar='DIR', help="read commits from local git clones kept in DIR (default: .clones) instead of the API")
+    parser.add_argument('--detail-workers', type=int, default=8, help="concurrent per-issue/PR detail requests per repository (default: 8)")
+    parser.add_argument('--adaptive-sampling', action='store_true', help="sample issues and PRs until each metric's confidence interval is tight enough, instead of the newest 300 per period")
+    parser.add_argument('--keywords', metavar='PATH', help="keyword vocabularies for commit messages and release notes (default: keywords.json, if it exists)")
+    args = parser.parse_args(argv)
+    
+    configure(workers=args.workers, detail_workers=args.detail_workers, use_cache=not args.no_cache,
+              cache_size=args.cache_size, git_clones=args.git_clones,
+              sampling="adaptive" if args.adaptive_sampling else "fixed", vocabularies=args.keywords)
+    
+    # Read the list of repos
+    with open('repos.txt', 'r') as file:
+        repos = [line.strip() for line in file if line.strip()]
+    
+    failures = {}
+    store = collect_repos(repos, workers=args.workers, incremental=args.incremental, failures=failures)
+    
+    print("-" * 50)
+    print(f"Data collected and saved to {store.path}")
+    print(f"Total repos collected: {len(store)}")
+    if failures:
+        print(f"Failed (rerun collect.py to retry): {', '.join(failures)}")
+    if cache is not None:
+        print(f"Responses served from cache (304 Not Modified): {cache.hits}")
+    for line in budget.report():
+        print(line)
+    for line in call_stats.summary():
+        print(line)
+    print(f"API call details per repo, function and period: {stats_path(store)}")
 
-print("-" * 50)
-print(f"Data collected and saved to repo_data.json")
-print(f"Total repos collected: {len(all_repo_data)}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
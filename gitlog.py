@@ -0,0 +1,127 @@
+import os
+import re
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+# Commit header fields are separated by unit separators and each commit starts with a record separator,
+# so messages (last field, terminated by a unit separator) can span any number of lines
+LOG_FORMAT = "%x1e%H%x1f%cI%x1f%aI%x1f%ae%x1f%B%x1f"
+NOREPLY_EMAIL = re.compile(r'^(?:\d+\+)?([^@]+)@users\.noreply\.github\.com$')
+DEFAULT_API_URL = 'https://api.github.com'
+
+# ==================== CLONES ====================
+def clone_path(clone_dir, repo_name, api_url=DEFAULT_API_URL):
+    """Local bare clone location for owner/repo (prefixed with the host for servers other than github.com)"""
+    host = urlsplit(clone_url(repo_name, api_url)).netloc
+    prefix = "" if host == "github.com" else host.replace(':', '_') + '__'
+    return os.path.join(clone_dir, prefix + repo_name.replace('/', '__') + '.git')
+
+def clone_url(repo_name, api_url=DEFAULT_API_URL):
+    """Git URL of owner/repo on the server of an API URL (api.github.com -> github.com, https://HOST/api/v3 -> HOST)"""
+    parts = urlsplit(api_url or DEFAULT_API_URL)
+    host = parts.netloc.removeprefix("api.")
+    return f"{parts.scheme}://{host}/{repo_name}.git"
+
+def sync_clone(clone_dir, repo_name, api_url=DEFAULT_API_URL):
+    """Clone owner/repo (bare) from the server of api_url on first use, otherwise fetch new commits; returns the clone path
+
+    Clones made by hand work too (bare, regular or blobless). A blobless clone downloads each
+    blob on first use by --numstat, so a full bare clone is faster for the first run.
+    """
+    path = clone_path(clone_dir, repo_name, api_url)
+    if not os.path.exists(path):
+        os.makedirs(clone_dir, exist_ok=True)
+        git(None, "clone", "--bare", "--quiet", clone_url(repo_name, api_url), path)
+    else:
+        git(path, "fetch", "--quiet", "--prune", "origin", "+refs/heads/*:refs/heads/*")
+    return path
+
+def git(path, *arguments):
+    """Run a git command (in the clone at path) and return its output"""
+    command = ["git"] + (["-C", path] if path else []) + list(arguments)
+    return subprocess.run(command, check=True, capture_output=True, text=True).stdout
+
+# ==================== COMMIT LOG ====================
+def author_identity(email):
+    """Contributor identity for a commit author: the GitHub login for noreply addresses, else the email"""
+    email = email.lower()
+    match = NOREPLY_EMAIL.match(email)
+    return match.group(1) if match else (email or None)
+
+def iter_commit_records(path, start_date, end_date):
+    """Stream commit records (same fields as the API backends) from git log --numstat, newest first
+
+    The log is parsed line by line as git writes it, so only one commit is held at a time.
+    Merge commits are counted against their first parent, as GitHub does.
+    """
+    if not has_commits(path):
+        return
+
+    command = [
+        "git", "-C", path, "log", "HEAD",
+        f"--since={start_date.isoformat()}",
+        f"--until={end_date.isoformat()}",
+        "--numstat", "--diff-merges=first-parent",
+        f"--format={LOG_FORMAT}"
+    ]
+    errors = tempfile.TemporaryFile()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=errors,
+                               text=True, encoding="utf-8", errors="replace")
+    record = None
+    header = None
+
+    try:
+        for line in process.stdout:
+            if line.startswith("\x1e"):
+                # Next commit: emit the previous one once its numstat lines are all in
+                if record is not None:
+                    yield record
+                record = None
+                header = line[1:]
+            elif header is not None:
+                header += line
+            elif record is not None and line.strip():
+                added, deleted, _ = line.split("\t", 2)
+                # Binary files show "-" for both counts and count as no line changes
+                record["additions"] += int(added) if added != "-" else 0
+                record["deletions"] += int(deleted) if deleted != "-" else 0
+
+            if header is not None and header.rstrip("\n").endswith("\x1f"):
+                sha, committed, authored, email, message = header.rstrip("\n")[:-1].split("\x1f", 4)
+                record = {
+                    "sha": sha,
+                    "committed_at": datetime.fromisoformat(committed).astimezone(timezone.utc),
+                    "authored_at": datetime.fromisoformat(authored).astimezone(timezone.utc),
+                    "author": author_identity(email),
+                    "message": message.strip().lower(),
+                    "additions": 0,
+                    "deletions": 0
+                }
+                header = None
+
+        if record is not None:
+            yield record
+
+        if process.wait() != 0:
+            errors.seek(0)
+            raise subprocess.CalledProcessError(process.returncode, command, stderr=errors.read().decode(errors="replace"))
+    finally:
+        # Stop git if the caller stopped reading early
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+        errors.close()
+
+def last_commit_date(path):
+    """Author date of the newest commit on the default branch (None for an empty repository)"""
+    if not has_commits(path):
+        return None
+    return datetime.fromisoformat(git(path, "log", "-1", "--format=%aI", "HEAD").strip()).astimezone(timezone.utc)
+
+def has_commits(path):
+    """Whether the clone's HEAD points at a commit"""
+    return subprocess.run(["git", "-C", path, "rev-parse", "--verify", "--quiet", "HEAD"],
+                          capture_output=True).returncode == 0
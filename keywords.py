@@ -0,0 +1,235 @@
+import os
+import re
+import json
+import time
+import random
+import argparse
+
+KEYWORDS_PATH = 'keywords.json'
+
+# Keywords match whole words or phrases ("add" matches "add x" and "feat: add", not "address");
+# a trailing * also matches longer words ("fix*": fix, fixes, fixed, fixup)
+DEFAULT_VOCABULARIES = {
+    "refactoring": ["refactor*", "restructur*", "cleanup", "clean up", "reorganis*", "reorganiz*", "simplif*", "improve code"],
+    "dependency": ["dep", "deps", "dependency", "dependencies", "bump*", "package.json", "requirements.txt", "cargo.toml",
+                   "pom.xml", "build.gradle", "gemfile", "pipfile"],
+    "feature": ["feat", "feature*", "add", "adds", "added", "adding", "new", "implement*", "enhancement*"],
+    "maintenance": ["fix", "fixes", "fixed", "fixing", "fixup", "bug*", "patch", "patches", "patched", "hotfix*", "typo*",
+                    "docs", "documentation"],
+    "breaking": ["breaking", "bc break", "backwards incompatible", "backward incompatible", "major version",
+                 "migration required", "deprecated"]
+}
+
+# Separates the texts of a batch so that no keyword can match across two of them
+BATCH_SEPARATOR = "\x00"
+
+# ==================== VOCABULARIES ====================
+def load_vocabularies(path=KEYWORDS_PATH):
+    """Keyword lists by label: the defaults, with any label listed in path (if it exists) replaced or added"""
+    vocabularies = dict(DEFAULT_VOCABULARIES)
+    if path and os.path.exists(path):
+        with open(path, 'r') as f:
+            vocabularies.update(json.load(f))
+    return vocabularies
+
+def keyword_pattern(keyword):
+    """Regex for one keyword: the whole word or phrase, or with a trailing * any word starting with it"""
+    keyword = keyword.strip().lower()
+    if keyword.endswith("*"):
+        return r"(?<!\w)" + re.escape(keyword[:-1]) + r"\w*"
+    return r"(?<!\w)" + re.escape(keyword) + r"(?!\w)"
+
+def keyword_trie(keywords):
+    """Keywords as nested dicts of characters; "" marks the end of a keyword, "*" the end of a * keyword's stem"""
+    root = {}
+    for keyword in keywords:
+        node = root
+        for char in keyword.rstrip("*"):
+            node = node.setdefault(char, {})
+        node["*" if keyword.endswith("*") else ""] = {}
+    return root
+
+def trie_pattern(node):
+    """Regex matching the rest of any keyword below a trie node, sharing common prefixes (longest keyword first)"""
+    alternatives = [re.escape(char) + trie_pattern(child) for char, child in sorted(node.items()) if char and char != "*"]
+    if "*" in node:
+        # Any word starting with the stem, tried after the longer keywords below it (e.g. "break*" and "breaking change")
+        alternatives.append(r"\w*")
+    elif "" in node:
+        alternatives.append(r"(?!\w)")
+    return alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+
+# ==================== CLASSIFIER ====================
+class KeywordClassifier:
+    """Labels texts by the keyword vocabularies they contain, with one compiled regex for all labels.
+
+    The keywords of every label are merged into a single regex in the form of a trie (keywords
+    sharing a prefix share its branch), so each word of a text is matched once, against all
+    keywords at the same time, and a batch of texts is joined and scanned at once. Each distinct
+    matched text (e.g. "bc break", "bugfixes") is then labelled once with every keyword it contains.
+    """
+
+    def __init__(self, vocabularies):
+        self.vocabularies = {label: list(words) for label, words in vocabularies.items()}
+        self._subsets = {}
+
+        keyword_labels = {}
+        for label, words in self.vocabularies.items():
+            for word in words:
+                keyword_labels.setdefault(word.strip().lower(), set()).add(label)
+        # Labels are bits of an int while a text is scanned, so each match costs one dict lookup and an or
+        self._bits = {label: 1 << bit for bit, label in enumerate(self.vocabularies)}
+        self._keywords = [(re.compile(keyword_pattern(keyword)), sum(self._bits[label] for label in labels))
+                          for keyword, labels in keyword_labels.items()]
+        self._matched_bits = {}
+        self._label_sets = {}
+        self.pattern = re.compile(r"(?<!\w)" + trie_pattern(keyword_trie(keyword_labels)) if keyword_labels else r"(?!)")
+        # Batches: the same scan also matches the separators between texts (as empty strings)
+        self._batch_pattern = re.compile(f"{BATCH_SEPARATOR}|({self.pattern.pattern})")
+
+    def _bits_of(self, matched):
+        """Label bits of one matched text (e.g. "bc break", "bugfixes"): every keyword it contains (worked out once)"""
+        bits = self._matched_bits.get(matched)
+        if bits is None:
+            bits = 0
+            for pattern, keyword_bits in self._keywords:
+                if pattern.search(matched):
+                    bits |= keyword_bits
+            self._matched_bits[matched] = bits
+        return bits
+
+    def _label_set(self, bits):
+        """Frozen set of the labels in bits (shared between texts with the same labels)"""
+        labels = self._label_sets.get(bits)
+        if labels is None:
+            labels = frozenset(label for label, bit in self._bits.items() if bits & bit)
+            self._label_sets[bits] = labels
+        return labels
+
+    def labels(self, text):
+        """Set of labels whose keywords occur in text"""
+        bits = 0
+        for matched in self.pattern.findall(text.lower()):
+            bits |= self._bits_of(matched)
+        return self._label_set(bits)
+
+    def label_batch(self, texts):
+        """Set of labels for each text, in order, from a single scan of the whole batch"""
+        # A separator inside a text (e.g. a NUL byte in a release note) would shift every later text's labels
+        texts = [text.replace(BATCH_SEPARATOR, " ") for text in texts]
+        found = [0] * len(texts)
+        index = 0
+        for matched in self._batch_pattern.findall(BATCH_SEPARATOR.join(texts).lower()):
+            if matched:
+                found[index] |= self._bits_of(matched)
+            else:
+                index += 1
+        return [self._label_set(bits) for bits in found]
+
+    def count(self, texts):
+        """Number of texts carrying each label"""
+        counts = {label: 0 for label in self.vocabularies}
+        for labels in self.label_batch(texts):
+            for label in labels:
+                counts[label] += 1
+        return counts
+
+    def select(self, *labels):
+        """Classifier for only some of the labels (built once, then reused)"""
+        if labels not in self._subsets:
+            self._subsets[labels] = KeywordClassifier({label: self.vocabularies[label] for label in labels})
+        return self._subsets[labels]
+
+# ==================== THROUGHPUT BENCHMARK ====================
+# Words for synthetic commit messages: keywords, words that merely contain one, and filler
+MESSAGE_WORDS = [
+    "fix", "fixes", "bug", "typo", "docs", "feat:", "add", "added", "new", "implement", "refactor", "cleanup", "simplify",
+    "bump", "deps", "package.json", "breaking", "deprecated", "address", "padding", "renew", "prefix", "depend", "fixture",
+    "debugger", "update", "handle", "parser", "config", "error", "when", "the", "for", "in", "of", "to", "user", "api",
+    "test", "build", "release", "support", "option", "module", "remove", "check", "path", "value", "cache", "request"
+]
+
+def synthetic_messages(count, seed=0):
+    """Lowercased commit-message-like texts (3 to 12 words, some with a second line), the same on every run"""
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        message = " ".join(rng.choices(MESSAGE_WORDS, k=rng.randint(3, 12)))
+        if rng.random() < 0.3:
+            message += "\n\n" + " ".join(rng.choices(MESSAGE_WORDS, k=rng.randint(5, 30)))
+        messages.append(message)
+    return messages
+
+def substring_counts(vocabularies, texts):
+    """Number of texts carrying each label by plain substring search for each keyword (the old matching, for comparison)"""
+    vocabularies = {label: [word.rstrip("*") for word in words] for label, words in vocabularies.items()}
+    counts = {label: 0 for label in vocabularies}
+    for text in texts:
+        for label, words in vocabularies.items():
+            if any(word in text for word in words):
+                counts[label] += 1
+    return counts
+
+def benchmark(count, batch_size, vocabularies):
+    """Messages per second labelled by substring search, by the classifier one text at a time, and in batches"""
+    texts = synthetic_messages(count)
+    classifier = KeywordClassifier(vocabularies)
+
+    def one_at_a_time():
+        counts = {label: 0 for label in vocabularies}
+        for text in texts:
+            for label in classifier.labels(text):
+                counts[label] += 1
+        return counts
+
+    def batched():
+        counts = {label: 0 for label in vocabularies}
+        for start in range(0, len(texts), batch_size):
+            for label, number in classifier.count(texts[start:start + batch_size]).items():
+                counts[label] += number
+        return counts
+
+    results = {}
+    for name, run in [("substring search", lambda: substring_counts(vocabularies, texts)),
+                      ("classifier, per message", one_at_a_time),
+                      (f"classifier, batches of {batch_size:,}", batched)]:
+        started = time.perf_counter()
+        counts = run()
+        seconds = time.perf_counter() - started
+        results[name] = {"seconds": seconds, "per_second": len(texts) / seconds, "counts": counts}
+    return results
+
+# ==================== VOCABULARIES / BENCHMARK ====================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write the keyword vocabularies for editing, label texts, or benchmark the classifier")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help=f"write the vocabularies in use to a JSON file for editing (default {KEYWORDS_PATH})")
+    export_parser.add_argument("path", nargs="?", default=KEYWORDS_PATH)
+    label_parser = subparsers.add_parser("label", help="print the labels of each text given")
+    label_parser.add_argument("texts", nargs="+")
+    benchmark_parser = subparsers.add_parser("benchmark", help="messages per second on synthetic commit messages")
+    benchmark_parser.add_argument("--messages", type=int, default=1_000_000, help="number of messages (default 1,000,000)")
+    benchmark_parser.add_argument("--batch", type=int, default=10_000, help="messages per batch (default 10,000)")
+    parser.add_argument("--keywords", default=KEYWORDS_PATH, help=f"vocabularies file (default {KEYWORDS_PATH}, if it exists)")
+    args = parser.parse_args()
+
+    vocabularies = load_vocabularies(args.keywords)
+
+    if args.command == "export":
+        with open(args.path, 'w') as f:
+            json.dump(vocabularies, f, indent=2)
+        print(f"✓ Wrote {len(vocabularies)} vocabularies to {args.path}")
+    elif args.command == "label":
+        classifier = KeywordClassifier(vocabularies)
+        for text, labels in zip(args.texts, classifier.label_batch(text.lower() for text in args.texts)):
+            print(f"{', '.join(sorted(labels)) or '-':<40} {text}")
+    else:
+        print(f"Labelling {args.messages:,} synthetic commit messages with {sum(map(len, vocabularies.values()))} keywords in {len(vocabularies)} vocabularies")
+        print("-" * 100)
+        print(f"{'Method':<34} {'Time':>9} {'Messages/s':>12}  Labelled messages")
+        print("-" * 100)
+        for name, result in benchmark(args.messages, args.batch, vocabularies).items():
+            counts = ", ".join(f"{label} {count:,}" for label, count in result["counts"].items())
+            print(f"{name:<34} {result['seconds']:>8.2f}s {result['per_second']:>12,.0f}  {counts}")
+        print("-" * 100)
+        print("Substring search also counts words that merely contain a keyword (address, depend, fixture, ...)")
@@ -0,0 +1,187 @@
+import time
+import threading
+from collections import deque, defaultdict
+from contextlib import contextmanager
+
+# ==================== TOKEN POOL ====================
+class TokenPool:
+    """GitHub tokens with the quota each has left, as reported by the rate-limit response headers.
+
+    Quotas are tracked per token and per resource (core, graphql, search). A token is spent freely
+    while it has more than pace_below of its limit left; below that its remaining requests are
+    spread evenly until the reset, so the quota runs out at the reset rather than before it.
+    """
+
+    def __init__(self, tokens, reserve=50, pace_below=0.5):
+        self.tokens = list(tokens)
+        self.reserve = reserve
+        self.pace_below = pace_below
+        self._quota = {}  # (token, resource) -> {"remaining", "limit", "reset", "blocked_until", "last_used"}
+
+    def ready_at(self, token, resource, now):
+        """Earliest time (epoch seconds) a request for resource may be sent with token"""
+        quota = self._quota.get((token, resource))
+        if quota is None:
+            return now
+
+        if quota["blocked_until"] > now:
+            return quota["blocked_until"]
+        if quota["reset"] <= now:
+            return now  # New window, full quota again
+        if quota["remaining"] <= self.reserve:
+            return quota["reset"]
+        if quota["remaining"] < quota["limit"] * self.pace_below:
+            interval = (quota["reset"] - now) / (quota["remaining"] - self.reserve)
+            return max(now, quota["last_used"] + interval)
+        return now
+
+    def choose(self, resource, now):
+        """(token, wait_seconds): the token that can be used soonest, preferring the most remaining quota"""
+        def sort_key(token):
+            quota = self._quota.get((token, resource))
+            remaining = quota["remaining"] if quota and quota["reset"] > now else float('inf')
+            return (self.ready_at(token, resource, now), -remaining)
+
+        token = min(self.tokens, key=sort_key)
+        return token, max(0.0, self.ready_at(token, resource, now) - now)
+
+    def spend(self, token, resource, now):
+        """Count a request against the local estimate until its response headers arrive"""
+        quota = self._quota.get((token, resource))
+        if quota is not None:
+            if quota["reset"] > now:
+                quota["remaining"] -= 1
+            quota["last_used"] = now
+
+    def observe(self, token, resource, status, headers, now):
+        """Update a token's quota from response headers (remaining, limit, reset, retry-after)"""
+        resource = headers.get("x-ratelimit-resource", resource)
+        quota = self._quota.setdefault((token, resource), {
+            "remaining": 0, "limit": 0, "reset": 0.0, "blocked_until": 0.0, "last_used": now
+        })
+
+        if "x-ratelimit-remaining" in headers:
+            remaining = int(headers["x-ratelimit-remaining"])
+            reset = float(headers.get("x-ratelimit-reset", now + 3600))
+            if reset > quota["reset"]:
+                # First response of a new window
+                quota["remaining"] = remaining
+                quota["reset"] = reset
+            else:
+                # Responses can arrive out of order across workers: keep the lowest reading
+                quota["remaining"] = min(quota["remaining"], remaining)
+            quota["limit"] = int(headers.get("x-ratelimit-limit", quota["limit"]))
+
+        # Secondary limit hit: back off for as long as GitHub asks (default one minute)
+        if status == 429 or (status == 403 and "retry-after" in headers):
+            quota["blocked_until"] = now + float(headers.get("retry-after", 60))
+
+# ==================== SHARED REQUEST BUDGET ====================
+class RequestBudget:
+    """Request budget shared by every collection worker.
+
+    Keeps all workers together under GitHub's limits:
+    - Primary: paced from the rate-limit headers of each response, rotating across the token pool,
+      with at most hourly_limit requests per token in any rolling hour as a backstop
+    - Secondary: at most max_concurrent requests in flight, request starts spaced min_interval apart
+
+    Also accounts the requests spent in each phase (set per thread with phase()).
+    """
+
+    def __init__(self, tokens=(), hourly_limit=4500, max_concurrent=4, min_interval=0.1):
+        self.pool = TokenPool(tokens or [None])
+        self.hourly_limit = hourly_limit * len(self.pool.tokens)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._recent = deque()  # Start times of requests in the last hour
+        self._next_start = 0.0
+        self._local = threading.local()
+        self.usage = defaultdict(lambda: defaultdict(int))  # phase -> resource -> requests
+        self.requests_made = 0
+        self.seconds_waited = 0.0
+
+    @contextmanager
+    def phase(self, name):
+        """Attribute requests made by this thread to a named phase"""
+        previous = getattr(self._local, "phase", None)
+        self._local.phase = name
+        try:
+            yield
+        finally:
+            self._local.phase = previous
+
+    def acquire(self, resource="core"):
+        """Block until a request may start without breaking any limit; returns the token to send it with"""
+        self._slots.acquire()
+        while True:
+            with self._lock:
+                now = time.time()
+                while self._recent and now - self._recent[0] >= 3600:
+                    self._recent.popleft()
+
+                token, token_wait = self.pool.choose(resource, now)
+                if len(self._recent) >= self.hourly_limit:
+                    wait = 3600 - (now - self._recent[0])
+                else:
+                    wait = max(token_wait, self._next_start - now)
+
+                if wait <= 0:
+                    self._recent.append(now)
+                    self._local.started = now  # release() drops this entry again if the response is a 304
+                    self._next_start = now + self.min_interval
+                    self.pool.spend(token, resource, now)
+                    self.requests_made += 1
+                    return token
+
+                self.seconds_waited += wait
+            if wait > 60:
+                print(f"\nRate limit budget low on every token. Pacing: waiting {wait/60:.1f} minutes...")
+            time.sleep(wait)
+
+    def release(self, token, resource="core", status=None, headers=None):
+        """Free the in-flight slot taken by acquire() and learn the token's quota from the response"""
+        with self._lock:
+            if headers is not None:
+                self.pool.observe(token, resource, status, headers, time.time())
+            if status == 304:
+                # Not Modified responses don't count against the GitHub rate limit: forget this request's start
+                # (other threads may have started requests since, so it isn't necessarily the newest)
+                try:
+                    self._recent.remove(self._local.started)
+                except ValueError:
+                    pass  # Already over an hour old
+                self.requests_made -= 1
+            elif status is not None:
+                self.usage[getattr(self._local, "phase", None) or "other"][resource] += 1
+        self._slots.release()
+
+    def quota(self, resource="core"):
+        """(remaining, limit, reset) for resource over every token GitHub has reported on, or None before any response
+
+        A token whose window has reset counts with its full limit again; reset is the earliest
+        upcoming reset (epoch seconds).
+        """
+        with self._lock:
+            now = time.time()
+            quotas = [quota for (_, quota_resource), quota in self.pool._quota.items() if quota_resource == resource]
+            if not quotas:
+                return None
+            remaining = sum(quota["remaining"] if quota["reset"] > now else quota["limit"] for quota in quotas)
+            limit = sum(quota["limit"] for quota in quotas)
+            reset = min((quota["reset"] for quota in quotas if quota["reset"] > now), default=now)
+            return remaining, limit, reset
+
+    def report(self):
+        """Lines summarising requests spent per phase and the quota left on each token"""
+        lines = ["Rate limit budget by phase:"]
+        with self._lock:
+            for phase_name, by_resource in sorted(self.usage.items()):
+                spent = ", ".join(f"{resource} {count:,}" for resource, count in sorted(by_resource.items()))
+                lines.append(f"  {phase_name:<16} {spent}")
+            for i, token in enumerate(self.pool.tokens, 1):
+                quotas = [f"{resource} {quota['remaining']:,}/{quota['limit']:,}"
+                          for (quota_token, resource), quota in sorted(self.pool._quota.items()) if quota_token == token]
+                lines.append(f"  token {i}: {', '.join(quotas) or 'unused'} remaining")
+            lines.append(f"  paced for {self.seconds_waited / 60:.1f} minutes in total")
+        return lines
@@ -1,97 +1,186 @@
-import json
+import os
+import hashlib
+import inspect
+import sqlite3
+import argparse
 from datetime import datetime
+from storage import RepoStore
 
-# Load the data
-with open('repo_data.json', 'r') as f:
-    repos = json.load(f)
-
-# Generate markdown report
-report = []
-
-# Header
-report.append("# GitHub Repository Health - Validation Dataset")
-report.append(f"\n**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-report.append(f"\n**Total Repositories:** {len(repos)}\n")
-
-# Classification summary
-classifications = {}
-for repo in repos:
-    status = repo.get('classification', 'Unknown')
-    classifications[status] = classifications.get(status, 0) + 1
-
-report.append("## Classification Summary\n")
-for status, count in sorted(classifications.items()):
-    report.append(f"- **{status}:** {count} repos")
-report.append("\n---\n")
-
-# Repository details
-for repo in repos:
-    report.append(f"\n### {repo['name']}")
-    report.append(f"\n**Classification:** {repo['classification']}")
-    report.append(f"\n**Evidence:** {repo['classification_evidence']}")
+REPORT_PATH = 'report.md'
+SECTION_CACHE_PATH = os.path.join('.cache', 'report_sections.sqlite')
+# Bump when a section's output changes without repo_section's source changing (e.g. a helper it calls)
+SECTION_LAYOUT_VERSION = 1
+
+# ==================== REPOSITORY SECTION ====================
+def repo_section(repo):
+    """Markdown lines for one repository"""
+    lines = []
+    lines.append(f"\n### {repo['name']}")
+    lines.append(f"\n**Classification:** {repo['classification']}")
+    lines.append(f"\n**Evidence:** {repo['classification_evidence']}")
     
     if 'official_statement' in repo:
-        report.append(f"\n**Official Statement:** {repo['official_statement']}")
+        lines.append(f"\n**Official Statement:** {repo['official_statement']}")
     
     # Evolvability
-    report.append(f"\n**Evolvability:**")
-    report.append(f"- Created: {repo['evolvability']['created_date']}")
-    report.append(f"- Age: {repo['evolvability']['age_days']} days")
-    report.append(f"- Stars: {repo['evolvability']['stars']:,}")
-    report.append(f"- Forks: {repo['evolvability']['forks']:,}")
+    lines.append(f"\n**Evolvability:**")
+    lines.append(f"- Created: {repo['evolvability']['created_date']}")
+    lines.append(f"- Age: {repo['evolvability']['age_days']} days")
+    lines.append(f"- Stars: {repo['evolvability']['stars']:,}")
+    lines.append(f"- Forks: {repo['evolvability']['forks']:,}")
     
     # Velocity trends
-    report.append(f"\n**Velocity Trends:**")
+    lines.append(f"\n**Velocity Trends:**")
     vm = repo['velocity']['period_metrics']
-    report.append(f"- Commits: P1={vm['period_1']['commit_count']}, P2={vm['period_2']['commit_count']}, P3={vm['period_3']['commit_count']}, P4={vm['period_4']['commit_count']}")
-    report.append(f"- Code churn (P4): {vm['period_4']['total_changes']:,} lines changed")
-    report.append(f"- Churn rate (P4): {vm['period_4']['churn_rate']:.1f} lines/commit")
+    lines.append(f"- Commits: P1={vm['period_1']['commit_count']}, P2={vm['period_2']['commit_count']}, P3={vm['period_3']['commit_count']}, P4={vm['period_4']['commit_count']}")
+    lines.append(f"- Code churn (P4): {vm['period_4']['total_changes']:,} lines changed")
+    lines.append(f"- Churn rate (P4): {vm['period_4']['churn_rate']:.1f} lines/commit")
     
     # PR metrics
     prm = repo['velocity']['pr_metrics_by_period']['period_4']
-    report.append(f"- PR merge time (P4): {prm['avg_merge_time_hours']}hrs average")
-    report.append(f"- PRs merged (P4): {prm['merged_count']}")
+    lines.append(f"- PR merge time (P4): {prm['avg_merge_time_hours']}hrs average")
+    lines.append(f"- PRs merged (P4): {prm['merged_count']}")
     
     # Collaboration trends
-    report.append(f"\n**Collaboration Trends:**")
+    lines.append(f"\n**Collaboration Trends:**")
     cm = repo['collaboration']['contributor_metrics_by_period']
-    report.append(f"- Contributors: P1={cm['period_1']['total_contributors']}, P2={cm['period_2']['total_contributors']}, P3={cm['period_3']['total_contributors']}, P4={cm['period_4']['total_contributors']}")
-    report.append(f"- New contributors (P4): {cm['period_4']['new_contributors']}")
-    report.append(f"- Retention rate (P4): {cm['period_4']['retention_rate']:.0%}")
+    lines.append(f"- Contributors: P1={cm['period_1']['total_contributors']}, P2={cm['period_2']['total_contributors']}, P3={cm['period_3']['total_contributors']}, P4={cm['period_4']['total_contributors']}")
+    lines.append(f"- New contributors (P4): {cm['period_4']['new_contributors']}")
+    lines.append(f"- Retention rate (P4): {cm['period_4']['retention_rate']:.0%}")
     
     # Issue response
     irm = repo['collaboration']['issue_response_by_period']['period_4']
-    report.append(f"- Issue response time (P4): {irm['avg_response_time_hours']}hrs average")
-    report.append(f"- Issues without response (P4): {irm['issues_without_response']}")
+    lines.append(f"- Issue response time (P4): {irm['avg_response_time_hours']}hrs average")
+    lines.append(f"- Issues without response (P4): {irm['issues_without_response']}")
     
     # Quality metrics
-    report.append(f"\n**Quality Metrics:**")
+    lines.append(f"\n**Quality Metrics:**")
     bfm = repo['quality']['bug_feature_by_period']['period_4']
-    report.append(f"- Bug closure rate (P4): {bfm['bug_closure_rate']:.0%}")
-    report.append(f"- Bugs opened (P4): {bfm['bugs_opened']}")
+    lines.append(f"- Bug closure rate (P4): {bfm['bug_closure_rate']:.0%}")
+    lines.append(f"- Bugs opened (P4): {bfm['bugs_opened']}")
     
     iam = repo['quality']['issue_accumulation_by_period']['period_4']
-    report.append(f"- Issue accumulation (P4): {iam['net_accumulation']} net change")
+    lines.append(f"- Issue accumulation (P4): {iam['net_accumulation']} net change")
     
     regm = repo['quality']['regression_by_period']['period_4']
-    report.append(f"- Regression rate (P4): {regm['regression_rate']:.1%}")
+    lines.append(f"- Regression rate (P4): {regm['regression_rate']:.1%}")
     
     # Evolvability metrics
-    report.append(f"\n**Evolvability Metrics:**")
+    lines.append(f"\n**Evolvability Metrics:**")
     refm = repo['evolvability']['refactoring_by_period']['period_4']
-    report.append(f"- Refactoring rate (P4): {refm['refactoring_rate']:.1%}")
-    report.append(f"- Dependency updates (P4): {refm['dependency_commits']}")
+    lines.append(f"- Refactoring rate (P4): {refm['refactoring_rate']:.1%}")
+    lines.append(f"- Dependency updates (P4): {refm['dependency_commits']}")
 
     # Net LOC growth derived from velocity data (additions - deletions)
     p4v = repo['velocity']['period_metrics']['period_4']
     net_loc = p4v['additions'] - p4v['deletions']
-    report.append(f"- Net LOC growth (P4): {net_loc:,} lines")
+    lines.append(f"- Net LOC growth (P4): {net_loc:,} lines")
     
-    report.append("\n---")
+    lines.append("\n---")
+    return lines
+
+# ==================== SECTION CACHE ====================
+class SectionCache:
+    """Rendered report sections, one per repository, with the digest they were rendered from.
+
+    The digest combines the stored record's digest with one of repo_section's source and
+    SECTION_LAYOUT_VERSION, so a section is rendered again when either its repository's record
+    or the section layout changes.
+    """
+
+    def __init__(self, path=SECTION_CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS sections (
+                name TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                classification TEXT NOT NULL,
+                section TEXT NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    def digests(self):
+        """Repository name -> digest its cached section was rendered from"""
+        return dict(self._db.execute("SELECT name, digest FROM sections"))
+
+    def section(self, name):
+        return self._db.execute("SELECT section FROM sections WHERE name = ?", (name,)).fetchone()[0]
+
+    def put(self, name, digest, classification, section):
+        self._db.execute("INSERT OR REPLACE INTO sections VALUES (?, ?, ?, ?)", (name, digest, classification, section))
+
+    def remove(self, names):
+        self._db.executemany("DELETE FROM sections WHERE name = ?", [(name,) for name in names])
+
+    def classification_counts(self):
+        """Classification -> number of cached repositories with it"""
+        return dict(self._db.execute("SELECT classification, COUNT(*) FROM sections GROUP BY classification"))
+
+    def clear(self):
+        self._db.execute("DELETE FROM sections")
+        self._db.commit()
+
+    def commit(self):
+        self._db.commit()
+
+def renderer_digest():
+    """Digest of the section layout (repo_section's source code and SECTION_LAYOUT_VERSION)"""
+    return hashlib.sha256(f"{SECTION_LAYOUT_VERSION}\n{inspect.getsource(repo_section)}".encode()).hexdigest()
+
+# ==================== REPORT ====================
+def report_header(total, classifications):
+    """Title and classification summary lines"""
+    header = []
+    header.append("# GitHub Repository Health - Validation Dataset")
+    header.append(f"\n**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    header.append(f"\n**Total Repositories:** {total}\n")
+
+    header.append("## Classification Summary\n")
+    for status, count in sorted(classifications.items()):
+        header.append(f"- **{status}:** {count} repos")
+    header.append("\n---\n")
+    return header
+
+def write_report(path=REPORT_PATH, cache_path=SECTION_CACHE_PATH, rebuild=False, store=None):
+    """Write the report, rendering only sections whose repository changed since the last run; returns how many
+
+    The output is the same as rendering every section again. Unchanged repositories are never
+    read from the store, and sections are written one at a time.
+    """
+    if store is None:
+        store = RepoStore()
+    cache = SectionCache(cache_path)
+    if rebuild:
+        cache.clear()
+
+    entries = store.digests()
+    cached = cache.digests()
+    renderer = renderer_digest()
+    rendered = 0
+    for name, digest in entries:
+        key = f"{digest}:{renderer}"
+        if cached.get(name) != key:
+            repo = store.get(name)
+            cache.put(name, key, repo.get('classification', 'Unknown'), "\n".join(repo_section(repo)))
+            rendered += 1
+    cache.remove(set(cached) - {name for name, _ in entries})
+    cache.commit()
+
+    header = report_header(len(entries), cache.classification_counts())
+    with open(path + '.tmp', 'w') as f:
+        f.write("\n".join(header))
+        for name, _ in entries:
+            f.write("\n" + cache.section(name))
+    os.replace(path + '.tmp', path)
+    return rendered
 
-# Save report
-report_text = "\n".join(report)
-with open('report.md', 'w') as f:
-    f.write(report_text)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate report.md from the collected data")
+    parser.add_argument("--rebuild", action="store_true", help="render every section again instead of reusing unchanged ones")
+    args = parser.parse_args()
 
-print("✓ Validation report generated: report.md")
\ No newline at end of file
+    rendered = write_report(rebuild=args.rebuild)
+    print(f"✓ Validation report generated: {REPORT_PATH} ({rendered} new or changed repo sections rendered)")
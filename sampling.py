@@ -0,0 +1,102 @@
+import math
+
+# 95% confidence intervals
+Z = 1.96
+
+# Adaptive sampling: records taken before the first check, records added between checks, and the
+# interval half-width at which an estimate is tight enough (means: share of the mean; proportions: absolute)
+MIN_SAMPLE = 30
+BATCH_SIZE = 30
+TOLERANCES = {
+    "mean": 0.10,
+    "proportion": 0.05
+}
+
+# ==================== SAMPLE ORDER ====================
+def reverse_bits(value, bits):
+    return int(format(value, f'0{bits}b')[::-1], 2)
+
+def spread_order(records, key):
+    """Records reordered so that every prefix is spread evenly over key (e.g. creation time)
+
+    Records are sorted by key and then taken in bit-reversed position order (first, middle,
+    quarters, eighths, ...), so a sample cut off at any size covers the whole period instead of
+    only its newest end. The order is the same on every run.
+    """
+    ordered = sorted(records, key=key)
+    bits = max(1, (len(ordered) - 1).bit_length())
+    return [ordered[i] for i in sorted(range(len(ordered)), key=lambda i: reverse_bits(i, bits))]
+
+# ==================== CONFIDENCE INTERVALS ====================
+def population_correction(sampled, population):
+    """Finite population correction for a sample of sampled items out of population (None: unknown, no correction)"""
+    if not population:
+        return 1.0
+    return math.sqrt(max(0.0, 1 - sampled / population))
+
+def mean_interval(values, sampled=None, population=None, digits=2):
+    """95% confidence interval [low, high] for a mean (normal approximation), or None below two values
+
+    sampled/population narrow the interval when the sample covers much of the population
+    (down to the mean itself once every item is sampled).
+    """
+    n = len(values)
+    if n == 0:
+        return None
+    mean = sum(values) / n
+    correction = population_correction(sampled or n, population)
+    if correction == 0:
+        return [round(mean, digits), round(mean, digits)]
+    if n < 2:
+        return None
+    variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+    half_width = Z * math.sqrt(variance / n) * correction
+    low = mean - half_width
+    if min(values) >= 0:
+        low = max(0.0, low)  # Times and counts can't be negative
+    return [round(low, digits), round(mean + half_width, digits)]
+
+def proportion_interval(successes, n, sampled=None, population=None, digits=3):
+    """95% Wilson score interval [low, high] for a proportion, or None with no observations
+
+    sampled/population narrow the interval as for mean_interval, by scoring the sample as if it
+    were larger (n divided by the squared finite population correction).
+    """
+    if n == 0:
+        return None
+    p = successes / n
+    correction = population_correction(sampled or n, population)
+    if correction == 0:
+        return [round(p, digits), round(p, digits)]
+    n = n / (correction * correction)
+    centre = (p + Z * Z / (2 * n)) / (1 + Z * Z / n)
+    half_width = Z * math.sqrt(p * (1 - p) / n + Z * Z / (4 * n * n)) / (1 + Z * Z / n)
+    return [round(max(0.0, centre - half_width), digits), round(min(1.0, centre + half_width), digits)]
+
+def tight_enough(estimate, interval, kind):
+    """Whether an estimate's interval is within the tolerance for its kind ("mean" or "proportion")"""
+    if interval is None:
+        return False
+    half_width = (interval[1] - interval[0]) / 2
+    if kind == "mean":
+        return half_width <= TOLERANCES["mean"] * abs(estimate)
+    return half_width <= TOLERANCES["proportion"]
+
+# ==================== ADAPTIVE SAMPLE ====================
+def adaptive_sample(records, fetch_batch, measure, kind, limit):
+    """Shortest prefix of records (in spread order) whose estimate is tight enough, at most limit records
+
+    fetch_batch(batch) fetches whatever the estimate needs for a batch of records (None: nothing to
+    fetch); measure(sample) returns (estimate, interval) for a sample. Records are added a batch at
+    a time, so requests are only spent while the interval is still too wide.
+    """
+    limit = min(limit, len(records))
+    taken = 0
+    while taken < limit:
+        batch = records[taken:min(limit, max(MIN_SAMPLE, taken + BATCH_SIZE))]
+        if fetch_batch is not None:
+            fetch_batch(batch)
+        taken += len(batch)
+        if tight_enough(*measure(records[:taken]), kind):
+            break
+    return records[:taken]
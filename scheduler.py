@@ -0,0 +1,185 @@
+import os
+import math
+import time
+import heapq
+import argparse
+from datetime import datetime, timedelta, timezone
+import collect
+from storage import RepoStore, STORE_PATH
+from score import score_repo, BAND_THRESHOLDS, THRESHOLDS
+
+REPOS_PATH = 'repos.txt'
+
+# Repos collected less than this long ago aren't refreshed
+MIN_AGE_HOURS = 24
+
+# Score points from a band boundary within which a repo's refresh is worth more (up to double at the boundary)
+BOUNDARY_MARGIN = 5
+
+# Share of each rate limit the daemon may spend; the rest is left for other tools using the same tokens
+BUDGET_SHARE = 0.8
+
+# Requests per resource assumed for a repo before its first collection by the daemon
+DEFAULT_COST = {"core": 1000, "graphql": 100}
+
+# A repo whose collection failed is retried after this long, doubling with each failure in a row (up to a day)
+RETRY_MINUTES = 15
+MAX_RETRY_HOURS = 24
+
+# Longest sleep between checks for repos falling due (repos.txt edits are picked up then)
+POLL_SECONDS = 300
+
+# ==================== PRIORITY ====================
+def collected_at(record):
+    return datetime.strptime(record["collection_date"], "%Y-%m-%d %H:%M:%S UTC").replace(tzinfo=timezone.utc)
+
+def band_distance(health_score):
+    """Score points to the nearest band boundary"""
+    return min(abs(health_score - threshold) for threshold, _ in BAND_THRESHOLDS)
+
+def priority(record, scores, now):
+    """Value of refreshing a repo now: days since its collection, up to doubled for activity and again for a score near a band boundary"""
+    age_days = (now - collected_at(record)).total_seconds() / 86400
+    activity = 1 + min(1, record["velocity"]["commits_last_3_months"] / THRESHOLDS["commits"])
+    nearness = 1 + max(0, 1 - band_distance(scores["health_score"]) / BOUNDARY_MARGIN)
+    return age_days * activity * nearness
+
+def refresh_queue(repo_names, store, now, min_age_hours=MIN_AGE_HOURS, retry_at=None):
+    """(heap, next_due): heap of (-priority, position, name) for repos due a refresh, never-collected ones first,
+    and when the next repo not yet due becomes due (None if none); retry_at holds back failed repos (repo -> time)"""
+    heap = []
+    next_due = None
+    for position, name in enumerate(repo_names):
+        retry = (retry_at or {}).get(name)
+        if retry is not None and retry > now:
+            next_due = min(next_due or retry, retry)
+            continue
+        record = store.get(name)
+        if record is None:
+            heap.append((-math.inf, position, name))
+            continue
+        due = collected_at(record) + timedelta(hours=min_age_hours)
+        if due > now:
+            next_due = min(next_due or due, due)
+            continue
+        heap.append((-priority(record, score_repo(record), now), position, name))
+    heapq.heapify(heap)
+    return heap, next_due
+
+# ==================== BUDGET ====================
+def budget_wait(cost, share=BUDGET_SHARE):
+    """Seconds until the rate-limit budget covers cost (requests per resource) within share of each limit
+
+    Resources GitHub hasn't reported on yet are assumed to be available. A cost larger than
+    share of the limit only needs a fresh window.
+    """
+    wait = 0.0
+    for resource, requests in cost.items():
+        quota = collect.budget.quota(resource)
+        if quota is None:
+            continue
+        remaining, limit, reset = quota
+        if remaining - limit * (1 - share) < min(requests, limit * share):
+            wait = max(wait, reset - time.time())
+    return wait
+
+def repo_cost(report, repo_name):
+    """Requests per resource the repo's last collection consumed (from the call statistics), or None"""
+    repo_stats = report["repos"].get(repo_name)
+    return dict(repo_stats["totals"]["rate_limit"]) if repo_stats else None
+
+def retry_delay(attempts):
+    """Wait before retrying a repo that failed attempts times in a row"""
+    return min(timedelta(minutes=RETRY_MINUTES * 2 ** (attempts - 1)), timedelta(hours=MAX_RETRY_HOURS))
+
+def batch_cost(costs, repo_names):
+    """Expected requests per resource for collecting some repos"""
+    total = {}
+    for repo_name in repo_names:
+        for resource, requests in costs.get(repo_name, DEFAULT_COST).items():
+            total[resource] = total.get(resource, 0) + requests
+    return total
+
+# ==================== DAEMON ====================
+def read_repos(path=REPOS_PATH):
+    with open(path, 'r') as file:
+        return [line.strip() for line in file if line.strip()]
+
+def run(repos_path=REPOS_PATH, store=None, workers=1, min_age_hours=MIN_AGE_HOURS, share=BUDGET_SHARE, once=False):
+    """Keep refreshing the most valuable repos of repos_path within the rate-limit budget (once: one pass, then return)
+
+    Each pass queues every repo due a refresh by priority and collects them incrementally, workers
+    at a time, highest priority first, waiting whenever the budget can't cover the next batch. The
+    queue is rebuilt when the pass ends or repos_path changes. Returns the number of repos refreshed.
+    """
+    collect.client()
+    if store is None:
+        store = RepoStore()  # Not 'store or': an empty store is falsy
+    costs = {}  # repo -> requests per resource its last collection consumed
+    failed = {}  # repo -> collections failed in a row
+    retry_at = {}  # repo -> earliest retry of a failed repo
+    refreshed = 0
+
+    while True:
+        repos_modified = os.path.getmtime(repos_path)
+        heap, next_due = refresh_queue(read_repos(repos_path), store, datetime.now(timezone.utc), min_age_hours, retry_at)
+        if heap:
+            print(f"Refresh queue: {len(heap)} repos due, {heap[0][2]} first")
+
+        while heap and os.path.getmtime(repos_path) == repos_modified:
+            batch = [heapq.heappop(heap)[2] for _ in range(min(workers, len(heap)))]
+            wait = budget_wait(batch_cost(costs, batch), share)
+            if wait > 0:
+                if once:
+                    print(f"Rate-limit budget spent; stopping with {len(heap) + len(batch)} repos still due")
+                    return refreshed
+                print(f"Rate-limit budget low: waiting {wait / 60:.1f} minutes for the reset")
+                time.sleep(wait)
+
+            failures = {}
+            try:
+                collect.collect_repos(batch, store, workers=workers, incremental=True, failures=failures)
+            except Exception as e:
+                failures = {repo_name: e for repo_name in batch}
+            report = collect.call_stats.report()
+            for repo_name in batch:
+                costs[repo_name] = repo_cost(report, repo_name) or costs.get(repo_name, DEFAULT_COST)
+                if repo_name in failures:
+                    # Back off so that a broken repo (e.g. renamed) doesn't hold up the queue
+                    failed[repo_name] = failed.get(repo_name, 0) + 1
+                    retry_at[repo_name] = datetime.now(timezone.utc) + retry_delay(failed[repo_name])
+                    print(f"{repo_name}: collection failed ({type(failures[repo_name]).__name__}: {failures[repo_name]}),"
+                          f" retrying after {retry_at[repo_name]:%Y-%m-%d %H:%M} UTC")
+                else:
+                    failed.pop(repo_name, None)
+                    retry_at.pop(repo_name, None)
+            batch = [repo_name for repo_name in batch if repo_name not in failures]
+            refreshed += len(batch)
+            if not batch:
+                continue
+            quota = collect.budget.quota("core")
+            print(f"Refreshed {', '.join(batch)}: {report['totals']['requests']:,} requests"
+                  + (f", {quota[0]:,}/{quota[1]:,} core requests left" if quota else ""))
+
+        if once and not heap:
+            return refreshed
+        if not heap:
+            sleep = POLL_SECONDS if next_due is None else (next_due - datetime.now(timezone.utc)).total_seconds()
+            time.sleep(min(POLL_SECONDS, max(1, sleep)))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep the collected data fresh: refresh the most valuable repos of repos.txt within the rate-limit budget")
+    parser.add_argument("--repos", default=REPOS_PATH, help=f"repositories to keep fresh (default {REPOS_PATH}, re-read when it changes)")
+    parser.add_argument("--store", default=STORE_PATH, help=f"collected data (default {STORE_PATH})")
+    parser.add_argument("--workers", type=int, default=1, help="repositories collected at once (default 1)")
+    parser.add_argument("--min-age", type=float, default=MIN_AGE_HOURS, help=f"hours before a repo is refreshed again (default {MIN_AGE_HOURS})")
+    parser.add_argument("--share", type=float, default=BUDGET_SHARE, help=f"share of each rate limit to spend (default {BUDGET_SHARE})")
+    parser.add_argument("--once", action="store_true", help="refresh every due repo the budget allows, then exit")
+    args = parser.parse_args()
+
+    collect.configure(workers=args.workers)
+    try:
+        refreshed = run(args.repos, RepoStore(args.store), args.workers, args.min_age, args.share, args.once)
+        print(f"✓ Refreshed {refreshed} repos")
+    except KeyboardInterrupt:
+        print("\nStopped (repos in progress continue from their checkpoint on the next run)")
@@ -1,5 +1,11 @@
-import json
+import sys
 from datetime import datetime, timezone
+from storage import iter_repo_data
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Optional: batch scoring falls back to score_repo per repo
 
 # ==================== CONFIGURATION ====================
 CATEGORY_WEIGHTS = {
@@ -9,6 +15,27 @@ CATEGORY_WEIGHTS = {
     "evolvability": 0.15   # Decreased - weakest signal
 }
 
+# Metric values that earn a full (or zero) category sub-score, and the maintenance mode penalty
+THRESHOLDS = {
+    "commits": 90,                # P4 commits for a full commit score
+    "churn": 8000,                # P4 lines changed for a full churn score
+    "merge_hours": 500,           # Average PR merge time scoring zero
+    "contributors": 20,           # P4 contributors for a full contributor score
+    "reviews_per_pr": 1.0,        # Average reviews per PR for a full review score
+    "response_hours": 100,        # Average first response time scoring zero
+    "refactoring_rate": 0.10,     # Share of refactoring commits for a full score
+    "dependency_rate": 0.20,      # Share of dependency update commits for a full score
+    "net_loc": 3000,              # P4 net lines added for a full growth score
+    "maintenance_penalty": -30    # Low activity, high quality, no growth
+}
+
+# Lowest score of each band, best band first (anything lower is Critical)
+BAND_THRESHOLDS = [
+    (75, "Healthy"),
+    (50, "Moderate"),
+    (25, "Declining")
+]
+
 # ==================== HELPERS ====================
 def normalise_higher(value, cap):
     """Higher = better. Returns 0-1."""
@@ -42,11 +69,11 @@ def score_velocity(repo):
     p4pr = repo["velocity"]["pr_metrics_by_period"]["period_4"]
 
     # Lower thresholds to boost Active repos
-    commit_score = normalise_higher(p4v["commit_count"], 90)
-    churn_score = normalise_higher(p4v["total_changes"], 8000)
+    commit_score = normalise_higher(p4v["commit_count"], THRESHOLDS["commits"])
+    churn_score = normalise_higher(p4v["total_changes"], THRESHOLDS["churn"])
     merge_score = handle_zero(
         p4pr["merged_count"],
-        lambda: normalise_lower(p4pr["avg_merge_time_hours"], 500)
+        lambda: normalise_lower(p4pr["avg_merge_time_hours"], THRESHOLDS["merge_hours"])
     )
 
     return (commit_score + churn_score + merge_score) / 3
@@ -57,15 +84,15 @@ def score_collaboration(repo):
     p4r = repo["collaboration"]["pr_review_by_period"]["period_4"]
     p4i = repo["collaboration"]["issue_response_by_period"]["period_4"]
 
-    contrib_score = normalise_higher(p4c["total_contributors"], 20)
+    contrib_score = normalise_higher(p4c["total_contributors"], THRESHOLDS["contributors"])
     retention_score = p4c["retention_rate"]
     review_score = handle_zero(
         p4r["total_prs"],
-        lambda: normalise_higher(p4r["avg_reviews_per_pr"], 1.0)
+        lambda: normalise_higher(p4r["avg_reviews_per_pr"], THRESHOLDS["reviews_per_pr"])
     )
     response_score = handle_zero(
         p4i["issues_created"],
-        lambda: normalise_lower(p4i["avg_response_time_hours"], 100)
+        lambda: normalise_lower(p4i["avg_response_time_hours"], THRESHOLDS["response_hours"])
     )
 
     return (contrib_score + retention_score + review_score + response_score) / 4
@@ -95,9 +122,9 @@ def score_evolvability(repo):
     p4rf = repo["evolvability"]["refactoring_by_period"]["period_4"]
     p4g = repo["evolvability"]["feature_growth_by_period"]["period_4"]
 
-    refactor_score = normalise_higher(p4rf["refactoring_rate"], 0.10)
-    dep_score = normalise_higher(p4rf["dependency_update_rate"], 0.20)
-    growth_score = normalise_higher(max(0, p4g["net_loc_change"]), 3000)
+    refactor_score = normalise_higher(p4rf["refactoring_rate"], THRESHOLDS["refactoring_rate"])
+    dep_score = normalise_higher(p4rf["dependency_update_rate"], THRESHOLDS["dependency_rate"])
+    growth_score = normalise_higher(max(0, p4g["net_loc_change"]), THRESHOLDS["net_loc"])
 
     return (refactor_score + dep_score + growth_score) / 3
 
@@ -239,20 +266,16 @@ def calculate_maintenance_mode_penalty(repo):
 
     # Pattern: Low activity, high quality, no growth
     if p4_commits < 60 and quality_score > 75 and trend == 0:
-        return -30
+        return THRESHOLDS["maintenance_penalty"]
     return 0
 
 # ==================== BAND CLASSIFICATION ====================
 def get_band(score):
     """Map score to health band."""
-    if score >= 75:
-        return "Healthy"
-    elif score >= 50:
-        return "Moderate"
-    elif score >= 25:
-        return "Declining"
-    else:
-        return "Critical"
+    for threshold, band in BAND_THRESHOLDS:
+        if score >= threshold:
+            return band
+    return "Critical"
 
 # ==================== MAIN SCORING ====================
 def score_repo(repo):
@@ -298,18 +321,204 @@ def score_repo(repo):
         "health_band": get_band(round(final, 1))
     }
 
+def score_breakdown(scores):
+    """A score_repo result by category: each category score, its weight and the points it adds, then the modifiers"""
+    return {
+        "categories": {
+            category: {
+                "score": scores[f"{category}_score"],
+                "weight": weight,
+                "points": round(scores[f"{category}_score"] * weight, 1)
+            }
+            for category, weight in CATEGORY_WEIGHTS.items()
+        },
+        "raw_score": scores["raw_score"],
+        "modifiers": {
+            name: scores[name]
+            for name in ["trend_modifier", "recency_bonus", "self_regulation", "org_stability", "high_activity", "maintenance_penalty"]
+        },
+        "health_score": scores["health_score"],
+        "health_band": scores["health_band"]
+    }
+
+# ==================== BATCH SCORING ====================
+BATCH_SIZE = 1000  # Repos scored together when streaming
+
+def batch_fields(repos):
+    """Every field score_repo reads, as one row of floats per repo (None for periods the repo lacks)"""
+    rows = []
+    for repo in repos:
+        vm = repo["velocity"]["period_metrics"]
+        cm = repo["collaboration"]["contributor_metrics_by_period"]
+        p4pr = repo["velocity"]["pr_metrics_by_period"]["period_4"]
+        p4r = repo["collaboration"]["pr_review_by_period"]["period_4"]
+        p4i = repo["collaboration"]["issue_response_by_period"]["period_4"]
+        p4b = repo["quality"]["bug_feature_by_period"]["period_4"]
+        p4rf = repo["evolvability"]["refactoring_by_period"]["period_4"]
+        p1v, p2v, p3v = vm.get("period_1"), vm.get("period_2"), vm.get("period_3")
+        p1c, p2c, p3c = cm.get("period_1"), cm.get("period_2"), cm.get("period_3")
+        rows.append((
+            p1v and p1v["commit_count"], p2v and p2v["commit_count"], p3v and p3v["commit_count"],
+            vm["period_4"]["commit_count"],
+            p1c and p1c["total_contributors"], p2c and p2c["total_contributors"], p3c and p3c["total_contributors"],
+            cm["period_4"]["total_contributors"],
+            vm["period_4"]["total_changes"],
+            p4pr["merged_count"], p4pr["avg_merge_time_hours"],
+            cm["period_4"]["retention_rate"],
+            p4r["total_prs"], p4r["avg_reviews_per_pr"],
+            p4i["issues_created"], p4i["avg_response_time_hours"],
+            p4b["bugs_opened"], p4b["bug_closure_rate"],
+            repo["quality"]["issue_accumulation_by_period"]["period_4"]["accumulation_rate"],
+            repo["quality"]["breaking_changes_by_period"]["period_4"]["breaking_change_rate"],
+            repo["quality"]["regression_by_period"]["period_4"]["regression_rate"],
+            p4rf["refactoring_rate"], p4rf["dependency_update_rate"],
+            repo["evolvability"]["feature_growth_by_period"]["period_4"]["net_loc_change"]
+        ))
+
+    columns = np.array(rows, dtype=float).reshape(len(rows), 24).T
+    days = (np.array([repo["collection_date"][:10] for repo in repos], dtype="datetime64[D]") -
+            np.array([repo["velocity"]["last_commit_date"] for repo in repos], dtype="datetime64[D]"))
+    return columns, days.astype(float)
+
+def score_batch(repos):
+    """Score many repos at once: score_repo's output as NumPy columns (identical values, same keys)"""
+    return score_fields(*batch_fields(repos))[0]
+
+def score_fields(columns, days, weights=None, thresholds=None):
+    """Score batch_fields output; returns (score_batch columns, which health scores were clamped to 0 or 100)
+
+    Weights and thresholds default to CATEGORY_WEIGHTS and THRESHOLDS. Any of their values can be
+    an array of shape (configurations, 1) to score every configuration at once, giving columns of
+    shape (configurations, repos).
+    """
+    weights = {**CATEGORY_WEIGHTS, **(weights or {})}
+    limits = {**THRESHOLDS, **(thresholds or {})}
+    (c1, c2, c3, c4, n1, n2, n3, n4, changes, merged, merge_hours, retention, total_prs, reviews_per_pr,
+     issues, response_hours, bugs, bug_closure, accumulation, breaking, regression,
+     refactoring, dependency, net_loc) = columns
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        abandoned = (c4 == 0) & ((c3 == 0) | (days > 280))
+
+        # Categories: each line mirrors its scalar function, in the same order of operations
+        vel = (np.minimum(1.0, c4 / limits["commits"]) + np.minimum(1.0, changes / limits["churn"]) +
+               np.where(merged == 0, 0.5, np.maximum(0.0, 1.0 - merge_hours / limits["merge_hours"]))) / 3
+        collab = (np.minimum(1.0, n4 / limits["contributors"]) + retention +
+                  np.where(total_prs == 0, 0.5, np.minimum(1.0, reviews_per_pr / limits["reviews_per_pr"])) +
+                  np.where(issues == 0, 0.5, np.maximum(0.0, 1.0 - response_hours / limits["response_hours"]))) / 4
+        qual = np.where(abandoned, 0.1, (
+            np.where(bugs == 0, 0.5, bug_closure) + (1.0 - np.minimum(1.0, accumulation)) +
+            (1.0 - np.minimum(1.0, breaking)) + (1.0 - np.minimum(1.0, regression))) / 4)
+        evol = np.where(abandoned, 0.0, (
+            np.minimum(1.0, refactoring / limits["refactoring_rate"]) +
+            np.minimum(1.0, dependency / limits["dependency_rate"]) +
+            np.minimum(1.0, np.maximum(0, net_loc) / limits["net_loc"])) / 3)
+
+        raw = (
+            vel * weights["velocity"] +
+            collab * weights["collaboration"] +
+            qual * weights["quality"] +
+            evol * weights["evolvability"]
+        ) * 100
+
+        # Trend against P1, else P3, else none
+        earlier = np.where(np.isnan(c1), c3, c1)
+        trend = np.where(np.isnan(earlier), 0, np.where(
+            earlier == 0, np.where(c4 > 0, 10, 0), np.where(c4 / earlier >= 1.2, 10, 0)))
+        recency = np.where((days < 30) & (c4 > 0), 5, 0)
+        self_reg = batch_stability([c1, c2, c3, c4])
+        org_stab = batch_stability([n1, n2, n3, n4])
+        high_activity = np.where(c4 > 500, 5, 0)
+        maintenance_penalty = np.where((c4 < 60) & (qual * 100 > 75) & (trend == 0), limits["maintenance_penalty"], 0)
+
+    final = raw + trend + recency + self_reg + org_stab + high_activity + maintenance_penalty
+    clamped = (final <= 0) | (final >= 100)
+    health_score = round_batch(np.clip(final, 0, 100))
+
+    bands = np.full(health_score.shape, "Critical", dtype=object)
+    for threshold, band in reversed(BAND_THRESHOLDS):
+        bands[health_score >= threshold] = band
+
+    return {
+        "velocity_score": round_batch(vel * 100),
+        "collaboration_score": round_batch(collab * 100),
+        "quality_score": round_batch(qual * 100),
+        "evolvability_score": round_batch(evol * 100),
+        "self_regulation": self_reg,
+        "org_stability": org_stab,
+        "high_activity": high_activity,
+        "maintenance_penalty": maintenance_penalty,
+        "trend_modifier": trend,
+        "recency_bonus": recency,
+        "raw_score": round_batch(raw),
+        "health_score": health_score,
+        "health_band": bands
+    }, clamped
+
+def batch_stability(counts):
+    """calculate_self_regulation / calculate_org_stability over columns of per-period counts (NaN = no period)"""
+    present = [~np.isnan(column) for column in counts]
+    periods = sum(mask.astype(int) for mask in present)
+    mean = sum(np.where(mask, column, 0) for mask, column in zip(present, counts)) / periods
+
+    # Variance summed the way the built-in sum() adds floats (compensated from Python 3.12)
+    total = np.zeros(len(mean))
+    compensation = np.zeros(len(mean))
+    for mask, column in zip(present, counts):
+        term = np.where(mask, (column - mean) ** 2, 0.0)
+        if sys.version_info >= (3, 12):
+            added = total + term
+            compensation += np.where(np.abs(total) >= np.abs(term), (total - added) + term, (term - added) + total)
+            total = added
+        else:
+            total = total + term
+    if sys.version_info >= (3, 12):
+        total = np.where(np.isfinite(compensation), total + compensation, total)
+
+    cv = (total / periods) ** 0.5 / mean
+    return np.where((periods < 2) | (mean == 0), 0, np.where(cv < 0.3, 3, np.where(cv > 0.6, -3, 0)))
+
+def round_batch(values):
+    """round(value, 1) over an array, exactly as Python rounds (correctly rounded, ties to even)"""
+    scaled = values * 10
+    rounded = np.rint(scaled) / 10
+
+    # x * 10 can land on the wrong side of a .x5 boundary; settle those few with round()
+    near_tie = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    rounded.flat[near_tie] = [round(value, 1) for value in values.flat[near_tie].tolist()]
+    return rounded
+
+def score_repos(repos):
+    """score_repo for every repo (list of result dicts), scored in one batch when NumPy is installed"""
+    repos = list(repos)
+    if np is None or not repos:
+        return [score_repo(repo) for repo in repos]
+
+    columns, clamped = score_fields(*batch_fields(repos))
+    columns = {key: values.tolist() for key, values in columns.items()}
+    # score_repo clamps with min()/max(), which return the int bound
+    columns["health_score"] = [int(score) if bound else score
+                               for score, bound in zip(columns["health_score"], clamped.tolist())]
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+def iter_scores(repos, batch_size=BATCH_SIZE):
+    """(repo, score_repo result) for each repo of any iterable, scored in batches so streams stay streamed"""
+    batch = []
+    for repo in repos:
+        batch.append(repo)
+        if len(batch) == batch_size:
+            yield from zip(batch, score_repos(batch))
+            batch = []
+    yield from zip(batch, score_repos(batch))
+
 # ==================== TEST ====================
 if __name__ == "__main__":
-    with open('repo_data.json') as f:
-        repos = json.load(f)
-
     print("Repository Health Scores")
     print("-" * 125)
     print(f"{'Repository':<20} {'Vel':>6} {'Collab':>6} {'Qual':>6} {'Evol':>6} {'SelfReg':>8} {'OrgStab':>8} {'HiAct':>6} {'Maint':>6} {'Raw':>6} {'Trend':>6} {'Recncy':>6} {'Final':>6}  {'Band':<10}")
     print("-" * 125)
 
-    for repo in repos:
-        scores = score_repo(repo)
+    for repo, scores in iter_scores(iter_repo_data()):
 
         # Format diagnostic values as bonus/penalty
         self_reg_str = f"{scores['self_regulation']:+d}" if scores['self_regulation'] != 0 else "0"
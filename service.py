@@ -0,0 +1,175 @@
+import json
+import threading
+import argparse
+from urllib.parse import urlsplit, parse_qs, unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from storage import RepoStore, STORE_PATH, BAND_ORDER
+from score import iter_scores, score_breakdown
+
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 8750
+
+# ==================== SCORE CACHE ====================
+def repo_entry(record, scores):
+    """One repository's response: its scores and their breakdown by category"""
+    return {
+        "name": record["name"],
+        "collection_date": record.get("collection_date"),
+        "classification": record.get("classification"),
+        "scores": scores,
+        "breakdown": score_breakdown(scores)
+    }
+
+class ScoreCache:
+    """score_repo results for every stored repository, held in memory as ready-encoded responses.
+
+    Each lookup first asks SQLite whether anything committed to the store since the last one
+    (PRAGMA data_version, a few microseconds). Only then are the record digests compared, and
+    only repositories whose record changed are scored again; the ranking is rebuilt after any change.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._version = None
+        self._digests = {}   # name -> digest of the record its entry was scored from
+        self._entries = {}   # name -> (scores, encoded response)
+        self._names = {}     # lowercased name -> name (repository names are case-insensitive on GitHub)
+        self._ranking = None
+        self._ranking_body = None
+        self.refresh()
+
+    def refresh(self):
+        """Score repositories added or changed since the last refresh and forget removed ones; returns how many changed"""
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self):
+        version = self.store.data_version()
+        if version == self._version:
+            return 0
+
+        digests = dict(self.store.digests())
+        changed = [name for name, digest in digests.items() if self._digests.get(name) != digest]
+        removed = set(self._entries) - set(digests)
+        records = (self.store.get(name) for name in changed)
+        for record, scores in iter_scores(record for record in records if record is not None):
+            self._entries[record["name"]] = (scores, json.dumps(repo_entry(record, scores)).encode())
+        for name in removed:
+            del self._entries[name]
+
+        self._digests = digests
+        self._names = {name.lower(): name for name in self._entries}
+        self._version = version
+        if changed or removed:
+            self._ranking = None
+            self._ranking_body = None
+        return len(changed) + len(removed)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def lookup(self, name):
+        """Encoded response for one repository (owner/repo, any case), or None"""
+        with self._lock:
+            self._refresh()
+            entry = self._entries.get(name) or self._entries.get(self._names.get(name.lower()))
+            return entry[1] if entry else None
+
+    def ranking(self, band=None, limit=None):
+        """Encoded portfolio ranking, healthiest first (optionally one band only, and at most limit repos)"""
+        with self._lock:
+            self._refresh()
+            if self._ranking is None:
+                ordered = sorted(self._entries.items(), key=lambda item: (-item[1][0]["health_score"], item[0]))
+                self._ranking = [{
+                    "rank": rank,
+                    "name": name,
+                    "health_score": scores["health_score"],
+                    "health_band": scores["health_band"],
+                    "velocity_score": scores["velocity_score"],
+                    "collaboration_score": scores["collaboration_score"],
+                    "quality_score": scores["quality_score"],
+                    "evolvability_score": scores["evolvability_score"]
+                } for rank, (name, (scores, _)) in enumerate(ordered, 1)]
+                self._ranking_body = json.dumps({"total": len(self._ranking), "repos": self._ranking}).encode()
+            if band is None and limit is None:
+                return self._ranking_body
+            repos = [repo for repo in self._ranking if band is None or repo["health_band"] == band]
+            return json.dumps({"total": len(repos), "repos": repos[:limit]}).encode()
+
+# ==================== HTTP SERVICE ====================
+class ScoreRequestHandler(BaseHTTPRequestHandler):
+    """GET /repos/OWNER/REPO, GET /ranking[?band=BAND&limit=N] and GET /status, answered from the score cache"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so repeated lookups skip the connection setup
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = unquote(url.path).rstrip("/")
+        query = parse_qs(url.query)
+        cache = self.server.cache
+
+        if path.startswith("/repos/"):
+            body = cache.lookup(path[len("/repos/"):])
+            if body is None:
+                return self.send_error_json(404, f"No collected data for {path[len('/repos/'):]}")
+            return self.send_body(body)
+
+        if path == "/ranking":
+            band = query.get("band", [None])[0]
+            limit = query.get("limit", [None])[0]
+            if band is not None and band not in BAND_ORDER:
+                return self.send_error_json(400, f"Unknown band {band} (one of {', '.join(BAND_ORDER)})")
+            if limit is not None and not limit.isdigit():
+                return self.send_error_json(400, "limit must be a whole number")
+            return self.send_body(cache.ranking(band, int(limit) if limit is not None else None))
+
+        if path == "/status":
+            cache.refresh()
+            return self.send_body(json.dumps({"repos": len(cache), "store": cache.store.path}).encode())
+
+        self.send_error_json(404, "Unknown path (use /repos/OWNER/REPO, /ranking or /status)")
+
+    def send_error_json(self, status, message):
+        self.send_body(json.dumps({"error": message}).encode(), status)
+
+    def send_body(self, body, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class ScoreService(ThreadingHTTPServer):
+    """Local HTTP/JSON scoring service over one repository store (scored once at startup)"""
+
+    daemon_threads = True
+    request_queue_size = 64
+
+    def __init__(self, store_path=STORE_PATH, host=SERVICE_HOST, port=SERVICE_PORT):
+        self.cache = ScoreCache(RepoStore(store_path))
+        super().__init__((host, port), ScoreRequestHandler)
+        self.url = f"http://{host}:{self.server_address[1]}"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve health scores of the collected repos over local HTTP/JSON")
+    parser.add_argument("--host", default=SERVICE_HOST, help=f"address to listen on (default {SERVICE_HOST})")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT, help=f"port to listen on (default {SERVICE_PORT})")
+    parser.add_argument("--store", default=STORE_PATH, help=f"collected data (default {STORE_PATH})")
+    args = parser.parse_args()
+
+    service = ScoreService(args.store, args.host, args.port)
+    print(f"✓ Serving scores of {len(service.cache)} repos from {args.store} on {service.url}")
+    print("  GET /repos/OWNER/REPO, /ranking[?band=Healthy&limit=10], /status (Ctrl-C to stop)")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.server_close()
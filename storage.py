@@ -0,0 +1,275 @@
+import os
+import json
+import hashlib
+import sqlite3
+import textwrap
+import argparse
+import threading
+from datetime import datetime, timezone
+
+STORE_PATH = 'repo_data.sqlite'
+JSON_PATH = 'repo_data.json'
+READ_BATCH = 100  # Rows read per query when streaming records
+
+# Health bands from worst to best, as score.get_band assigns them
+BAND_ORDER = ["Critical", "Declining", "Moderate", "Healthy"]
+
+# ==================== REPOSITORY STORE ====================
+class RepoStore:
+    """Collected repository records, one SQLite row per repository keyed by name.
+
+    Saving a repository writes only its own row in a single transaction, so the cost doesn't
+    grow with the number of repositories and an interrupted write never damages the others.
+    A repo_data.json from earlier versions is imported the first time the store is opened.
+
+    Every saved collection is also kept as a snapshot (raw metrics and score_repo output), indexed
+    by repository and collection date for trend and band-change queries.
+    """
+
+    def __init__(self, path=STORE_PATH, json_path=JSON_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        new_store = not os.path.exists(path)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS repos (
+                name TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                digest TEXT
+            )
+        """)
+        if "digest" not in [column[1] for column in self._db.execute("PRAGMA table_info(repos)")]:
+            # Stores from before record digests
+            self._db.execute("ALTER TABLE repos ADD COLUMN digest TEXT")
+            for name, data in self._db.execute("SELECT name, data FROM repos").fetchall():
+                self._db.execute("UPDATE repos SET digest = ? WHERE name = ?", (record_digest(data), name))
+        self._db.execute("CREATE INDEX IF NOT EXISTS repos_position ON repos (position)")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                name TEXT NOT NULL,
+                collected_at TEXT NOT NULL,
+                health_score REAL NOT NULL,
+                health_band TEXT NOT NULL,
+                scores TEXT NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (name, collected_at)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS snapshots_collected ON snapshots (collected_at)")
+        self._db.commit()
+
+        if new_store and json_path and os.path.exists(json_path):
+            with open(json_path, 'r') as f:
+                self.import_records(json.load(f))
+
+    def names(self):
+        """Names of all stored repositories, in order"""
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT name FROM repos ORDER BY position, rowid")]
+
+    def get(self, name):
+        """Stored record for one repository, or None"""
+        with self._lock:
+            row = self._db.execute("SELECT data FROM repos WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __iter__(self):
+        """Stored records in order, read a batch of rows at a time and decoded one at a time"""
+        after = (-1, -1)
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT position, rowid, data FROM repos WHERE (position, rowid) > (?, ?)"
+                    " ORDER BY position, rowid LIMIT ?", (*after, READ_BATCH)
+                ).fetchall()
+            for position, rowid, data in rows:
+                yield json.loads(data)
+            if len(rows) < READ_BATCH:
+                return
+            after = rows[-1][:2]
+
+    def digests(self):
+        """(name, digest of the stored record) for every repository, in order, without decoding any record"""
+        with self._lock:
+            return self._db.execute("SELECT name, digest FROM repos ORDER BY position, rowid").fetchall()
+
+    def data_version(self):
+        """Number that changes whenever another connection (e.g. a running collect.py) commits to the store"""
+        with self._lock:
+            return self._db.execute("PRAGMA data_version").fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM repos").fetchone()[0]
+
+    def next_position(self):
+        """Position after the last stored repository"""
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM repos").fetchone()[0]
+
+    def put(self, record, position=None):
+        """Save one repository: merged into its stored record (keeping its place), else added at position (default: last)
+
+        Returns the merged record.
+        """
+        with self._lock:
+            record = self._merge(record, position)
+            self._db.commit()
+        return record
+
+    def import_records(self, records):
+        """Merge a list of records (e.g. an edited repo_data.json) into the store in one transaction"""
+        with self._lock:
+            for record in records:
+                self._merge(record)
+            self._db.commit()
+
+    def _merge(self, record, position=None):
+        """Upsert one row; fields added outside collect.py (e.g. classification) survive a refresh"""
+        row = self._db.execute("SELECT position, data FROM repos WHERE name = ?", (record["name"],)).fetchone()
+        if row:
+            position, record = row[0], {**json.loads(row[1]), **record}
+        elif position is None:
+            position = self._db.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM repos").fetchone()[0]
+        data = json.dumps(record)
+        self._db.execute("INSERT OR REPLACE INTO repos VALUES (?, ?, ?, ?)", (record["name"], position, data, record_digest(data)))
+        return record
+
+    def add_snapshot(self, record, scores):
+        """Keep one collection of a repository and its score_repo output (replaces a snapshot of the same collection)"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?)",
+                (record["name"], snapshot_date(record), scores["health_score"], scores["health_band"],
+                 json.dumps(scores), json.dumps(record))
+            )
+            self._db.commit()
+
+    def history(self, name, since=None):
+        """(collected_at, health_score, health_band) of every snapshot of a repository, oldest first"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT collected_at, health_score, health_band FROM snapshots"
+                " WHERE name = ? AND collected_at >= ? ORDER BY collected_at",
+                (name, since or "")
+            ).fetchall()
+
+    def snapshot(self, name, collected_at):
+        """Raw metrics and scores of one snapshot as (record, scores), or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data, scores FROM snapshots WHERE name = ? AND collected_at = ?", (name, collected_at)
+            ).fetchone()
+        return (json.loads(row[0]), json.loads(row[1])) if row else None
+
+    def band_changes(self, since):
+        """Band at since (last snapshot then, else the first one after it) and now, for every repository
+
+        Returns dicts with name, from/to band, score and date, and change (negative = dropped bands).
+        """
+        with self._lock:
+            rows = self._db.execute("""
+                WITH latest AS (
+                    SELECT name, MAX(collected_at) AS collected_at FROM snapshots GROUP BY name
+                ),
+                baseline AS (
+                    SELECT name, COALESCE(
+                        (SELECT MAX(collected_at) FROM snapshots s WHERE s.name = latest.name AND s.collected_at <= :since),
+                        (SELECT MIN(collected_at) FROM snapshots s WHERE s.name = latest.name AND s.collected_at > :since)
+                    ) AS collected_at
+                    FROM latest
+                )
+                SELECT before.name, before.collected_at, before.health_score, before.health_band,
+                       after.collected_at, after.health_score, after.health_band
+                FROM baseline
+                JOIN snapshots before ON before.name = baseline.name AND before.collected_at = baseline.collected_at
+                JOIN latest ON latest.name = baseline.name
+                JOIN snapshots after ON after.name = latest.name AND after.collected_at = latest.collected_at
+                ORDER BY before.name
+            """, {"since": since}).fetchall()
+
+        return [{
+            "name": name,
+            "from_date": from_date, "from_score": from_score, "from_band": from_band,
+            "to_date": to_date, "to_score": to_score, "to_band": to_band,
+            "change": BAND_ORDER.index(to_band) - BAND_ORDER.index(from_band)
+        } for name, from_date, from_score, from_band, to_date, to_score, to_band in rows]
+
+    def band_drops(self, since):
+        """Repositories whose band dropped since a date (ISO, e.g. the start of the quarter)"""
+        return [change for change in self.band_changes(since) if change["change"] < 0]
+
+    def export_json(self, path=JSON_PATH):
+        """Write all records to a JSON file in the repo_data.json format, one record at a time (temporary file then rename)"""
+        with open(path + '.tmp', 'w') as f:
+            separator = "[\n"
+            for record in self:
+                # Same layout as json.dump(records, f, indent=2)
+                f.write(separator + textwrap.indent(json.dumps(record, indent=2), "  "))
+                separator = ",\n"
+            f.write("\n]" if separator == ",\n" else "[]")
+        os.replace(path + '.tmp', path)
+
+def record_digest(data):
+    """Digest of a stored record's JSON text; changes whenever any field of the record does"""
+    return hashlib.sha256(data.encode()).hexdigest()
+
+def snapshot_date(record):
+    """Sortable collection date of a record ("2025-01-31 09:00:00" from "2025-01-31 09:00:00 UTC")"""
+    return record["collection_date"].removesuffix(" UTC")
+
+def load_repo_data(path=STORE_PATH):
+    """All collected repository records, in order, as a list"""
+    return list(RepoStore(path))
+
+def iter_repo_data(path=STORE_PATH):
+    """Collected repository records, in order, one at a time (shared loader for score.py and calibrate.py)"""
+    yield from RepoStore(path)
+
+# ==================== EXPORT / IMPORT / HISTORY ====================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export or import the collected repository data, or query its score history")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="write all records to a JSON file")
+    export_parser.add_argument("path", nargs="?", default=JSON_PATH)
+    import_parser = subparsers.add_parser("import", help="merge records from a JSON file (e.g. added classifications)")
+    import_parser.add_argument("path", nargs="?", default=JSON_PATH)
+    subparsers.add_parser("snapshot", help="record a snapshot of every stored repo (skips ones already recorded)")
+    history_parser = subparsers.add_parser("history", help="health score over time for one repo")
+    history_parser.add_argument("name", help="owner/repo")
+    drops_parser = subparsers.add_parser("drops", help="repos whose health band dropped")
+    drops_parser.add_argument("--since", help="date to compare against (YYYY-MM-DD, default: start of this quarter)")
+    args = parser.parse_args()
+
+    store = RepoStore()
+
+    if args.command == "export":
+        store.export_json(args.path)
+        print(f"✓ Exported {len(store)} repos to {args.path}")
+    elif args.command == "import":
+        with open(args.path, 'r') as f:
+            records = json.load(f)
+        store.import_records(records)
+        print(f"✓ Imported {len(records)} repos from {args.path}")
+    elif args.command == "snapshot":
+        from score import score_repo
+        added = 0
+        for record in store:
+            if store.snapshot(record["name"], snapshot_date(record)) is None:
+                store.add_snapshot(record, score_repo(record))
+                added += 1
+        print(f"✓ Recorded {added} snapshots")
+    elif args.command == "history":
+        print(f"{'Collected':<20} {'Score':>6}  {'Band':<10}")
+        for collected_at, health_score, health_band in store.history(args.name):
+            print(f"{collected_at:<20} {health_score:>6.1f}  {health_band:<10}")
+    else:
+        today = datetime.now(timezone.utc).date()
+        since = args.since or today.replace(month=(today.month - 1) // 3 * 3 + 1, day=1).isoformat()
+        drops = store.band_drops(since)
+        print(f"Band drops since {since}: {len(drops)} repos")
+        for drop in drops:
+            print(f"{drop['name']:<40} {drop['from_band']:>10} ({drop['from_score']:.1f}, {drop['from_date'][:10]})"
+                  f" -> {drop['to_band']:<10} ({drop['to_score']:.1f}, {drop['to_date'][:10]})")
@@ -0,0 +1,14 @@
+import os
+import sys
+import json
+import pytest
+
+# The modules live at the top level of the repository, next to this directory
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+@pytest.fixture
+def repo_records():
+    """The collected records in repo_data.json (a fresh copy for each test)"""
+    with open(os.path.join(REPO_ROOT, "repo_data.json"), 'r') as f:
+        return json.load(f)
@@ -0,0 +1,86 @@
+import pytest
+import cache
+from cache import ResponseCache, cache_key, token_fingerprint
+
+URL = "https://api.github.com:443/repos/a/b/issues?state=all&page=2"
+VALIDATOR = {"etag": '"abc"'}
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    return now
+
+@pytest.fixture
+def response_cache(tmp_path, clock):
+    return ResponseCache(str(tmp_path / "http_cache.sqlite"), max_bytes=1000)
+
+# ==================== KEYS ====================
+def test_key_ignores_parameter_order():
+    assert cache_key(URL) == cache_key("https://api.github.com:443/repos/a/b/issues?page=2&state=all")
+    assert cache_key(URL) != cache_key("https://api.github.com:443/repos/a/b/issues?state=all&page=3")
+
+def test_key_separates_servers_and_tokens():
+    keys = {
+        cache_key(URL),
+        cache_key(URL.replace("api.github.com:443", "github.example.com:443")),
+        cache_key(URL.replace("https://api.github.com:443", "http://127.0.0.1:8000")),
+        cache_key(URL, token_fingerprint(["token-a"])),
+        cache_key(URL, token_fingerprint(["token-b"]))
+    }
+    assert len(keys) == 5
+    assert token_fingerprint(["token-a", "token-b"]) == token_fingerprint(["token-b", "token-a"])
+    assert "token-a" not in cache_key(URL, token_fingerprint(["token-a"]))
+
+# ==================== STORE / REVALIDATE ====================
+def test_store_and_lookup(response_cache):
+    response_cache.store(URL, {**VALIDATOR, "last-modified": "Mon", "content-type": "json"}, "[1]", "me")
+    entry = response_cache.lookup(URL, "me")
+    assert (entry["etag"], entry["last_modified"], entry["body"]) == ('"abc"', "Mon", "[1]")
+    assert response_cache.conditional_headers(entry) == {"If-None-Match": '"abc"', "If-Modified-Since": "Mon"}
+    assert response_cache.lookup(URL, "someone else") is None
+
+def test_responses_without_validator_are_not_stored(response_cache):
+    response_cache.store(URL, {"content-type": "json"}, "[1]")
+    assert response_cache.lookup(URL) is None
+
+def test_revalidated_entry_counts_as_fresh(response_cache, clock):
+    response_cache.store(URL, {**VALIDATOR, "x-ratelimit-remaining": "10"}, "[1]")
+    clock[0] += 10 * 86400
+    headers = response_cache.revalidated(response_cache.lookup(URL), {"x-ratelimit-remaining": "9", "etag": "other"})
+
+    assert headers == {**VALIDATOR, "x-ratelimit-remaining": "9"}
+    assert response_cache.hits == 1
+    assert response_cache.purge(older_than_days=7) == 0
+    clock[0] += 8 * 86400
+    assert response_cache.purge(older_than_days=7) == 1
+
+# ==================== SIZE LIMIT / PURGE ====================
+def test_size_counts_bytes(response_cache):
+    response_cache.store(URL, VALIDATOR, "é" * 100)
+    assert response_cache.stats()["bytes"] == 200
+
+def test_least_recently_used_entries_are_evicted(response_cache, clock):
+    for page in range(4):
+        clock[0] += 1
+        response_cache.store(f"{URL}&n={page}", VALIDATOR, "x" * 300)
+        if page == 1:
+            # Using the first entry again keeps it over the second
+            clock[0] += 1
+            response_cache.revalidated(response_cache.lookup(f"{URL}&n=0"), {})
+
+    # The fourth entry takes the cache past 1000 bytes; eviction stops once it is back under 90%
+    assert response_cache.stats()["bytes"] == 900
+    assert [response_cache.lookup(f"{URL}&n={page}") is not None for page in range(4)] == [True, False, True, True]
+
+def test_purge(response_cache, clock):
+    response_cache.store("https://api.github.com:443/repos/a/b", VALIDATOR, "{}")
+    clock[0] += 3 * 86400
+    response_cache.store("https://api.github.com:443/repos/c/d", VALIDATOR, "{}")
+    response_cache.store("https://api.github.com:443/repos/c/d/pulls", VALIDATOR, "[]")
+
+    assert response_cache.purge(older_than_days=2) == 1
+    assert response_cache.purge(match="repos/c/d/") == 1
+    assert response_cache.stats()["entries"] == 1
+    assert response_cache.purge() == 1
+    assert response_cache.stats() == {"entries": 0, "bytes": 0, "oldest": None, "newest": None}
@@ -0,0 +1,140 @@
+from types import SimpleNamespace
+from datetime import datetime, timedelta, timezone
+import pytest
+import collect
+
+NOW = datetime(2026, 6, 15, 13, 30, tzinfo=timezone.utc)
+START = NOW - timedelta(days=730)
+
+# Items per page of the stand-in listings (small, so that fetches span several pages)
+PER_PAGE = 7
+
+@pytest.fixture(autouse=True)
+def stand_in_client(monkeypatch, tmp_path):
+    monkeypatch.setattr(collect, "client", lambda: SimpleNamespace(per_page=PER_PAGE))
+    monkeypatch.setattr(collect, "STATE_DIR", str(tmp_path / "state"))
+    yield
+    collect.stop_requested.clear()
+
+# ==================== STAND-IN REPOSITORY ====================
+class Listing:
+    """A REST listing read a page at a time, recording the pages requested"""
+
+    def __init__(self, items, on_page=None):
+        self.items = items
+        self.on_page = on_page
+        self.pages = []
+
+    def get_page(self, page):
+        self.pages.append(page)
+        if self.on_page:
+            self.on_page(page)
+        return self.items[page * PER_PAGE:(page + 1) * PER_PAGE]
+
+class StandInRepo:
+    def __init__(self, issues=None, commits=None):
+        self.issues = issues
+        self.commits = commits
+
+    def get_issues(self, state, since, sort, direction):
+        return self.issues
+
+    def get_commits(self, since, until):
+        return self.commits
+
+class StandInCommit:
+    """A commit whose stats request fails while failing is set"""
+    failing = set()
+
+    def __init__(self, number):
+        date = NOW - timedelta(hours=number)
+        self.sha = f"{number:040x}"
+        self.author = None
+        self.commit = SimpleNamespace(committer=SimpleNamespace(date=date), author=SimpleNamespace(date=date), message=f"Commit {number}")
+
+    @property
+    def stats(self):
+        if self.sha in self.failing:
+            raise ConnectionResetError("connection reset")
+        return SimpleNamespace(additions=1, deletions=0)
+
+def make_issues(count):
+    return [SimpleNamespace(number=number, created_at=NOW - timedelta(days=number), updated_at=NOW - timedelta(hours=number),
+                            closed_at=None, state='open', labels=[], pull_request=None)
+            for number in range(count)]
+
+def interrupted(checkpoint, fetch):
+    """Run a fetch until it fails, then keep its progress the way collect_repo does"""
+    with pytest.raises(BaseException) as failure:
+        fetch()
+    collect.write_checkpoint(checkpoint)
+    collect.stop_requested.clear()
+    return failure.value
+
+def encoded(records):
+    return [collect.encode_record(record) for record in records]
+
+# ==================== CHECKPOINT / RESUME ====================
+def test_ctrl_c_resumes_at_the_checkpointed_page():
+    issues = make_issues(20)
+    complete = collect.fetch_issue_records_rest(StandInRepo(issues=Listing(issues)), START)
+
+    def stop_after_second_page(page):
+        if page == 1:
+            collect.stop_requested.set()
+
+    checkpoint = collect.new_checkpoint("a/b", "full", START, NOW)
+    listing = Listing(issues, stop_after_second_page)
+    failure = interrupted(checkpoint, lambda: collect.fetch_issue_records_rest(StandInRepo(issues=listing), START, checkpoint))
+    assert isinstance(failure, KeyboardInterrupt)
+    assert listing.pages == [0, 1]
+
+    resumed = collect.load_checkpoint("a/b")
+    assert (resumed["plan"], resumed["window_start_at"], resumed["collected_at"]) == ("full", START, NOW)
+    listing = Listing(issues)
+    records = collect.fetch_issue_records_rest(StandInRepo(issues=listing), START, resumed)
+    assert listing.pages == [2]
+    assert encoded(records) == encoded(complete)
+
+def test_failure_inside_a_page_fetches_that_page_again(monkeypatch):
+    commits = [StandInCommit(number) for number in range(20)]
+    complete = collect.fetch_commit_records_rest(StandInRepo(commits=Listing(commits)), START, NOW)
+
+    monkeypatch.setattr(StandInCommit, "failing", {commits[10].sha})  # Second page, after three of its commits
+    checkpoint = collect.new_checkpoint("a/b", "full", START, NOW)
+    failure = interrupted(checkpoint, lambda: collect.fetch_commit_records_rest(StandInRepo(commits=Listing(commits)), START, NOW, "a/b", checkpoint))
+    assert isinstance(failure, ConnectionResetError)
+
+    monkeypatch.setattr(StandInCommit, "failing", set())
+    listing = Listing(commits)
+    records = collect.fetch_commit_records_rest(StandInRepo(commits=listing), START, NOW, "a/b", collect.load_checkpoint("a/b"))
+    assert listing.pages == [1, 2]
+    assert encoded(records) == encoded(complete)
+
+def test_finished_category_is_not_fetched_again():
+    checkpoint = collect.new_checkpoint("a/b", "full", START, NOW)
+    releases = [{"tag": "v1", "published_at": NOW}]
+    assert collect.checkpointed(checkpoint, "releases", lambda: releases) == releases
+
+    def fetch():
+        raise AssertionError("fetched again")
+
+    assert collect.checkpointed(collect.load_checkpoint("a/b"), "releases", fetch) == releases
+
+def test_progress_of_another_backend_starts_over():
+    checkpoint = collect.new_checkpoint("a/b", "full", START, NOW)
+    progress = collect.checkpoint_progress(checkpoint, "commits", "graphql")
+    progress["records"].append({"sha": "0" * 40})
+    collect.checkpoint_page(checkpoint, progress, "cursor-1")
+
+    assert collect.checkpoint_progress(checkpoint, "commits", "graphql")["cursor"] == "cursor-1"
+    assert collect.checkpoint_progress(checkpoint, "commits", "rest") == {
+        "source": "rest", "records": [], "cursor": None, "kept": 0, "done": False
+    }
+
+def test_checkpoint_is_discarded_once_saved():
+    collect.write_checkpoint(collect.new_checkpoint("a/b", "full", START, NOW))
+    assert collect.load_checkpoint("a/b") is not None
+    collect.discard_checkpoint("a/b")
+    assert collect.load_checkpoint("a/b") is None
+    collect.discard_checkpoint("a/b")  # Already gone
@@ -0,0 +1,140 @@
+import os
+import shutil
+import subprocess
+from datetime import datetime, timezone
+import pytest
+import gitlog
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+# Fields of the commit records made by fetch_commit_records_graphql and fetch_commit_records_rest
+API_RECORD_FIELDS = {"sha", "committed_at", "authored_at", "author", "message", "additions", "deletions"}
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+END = datetime(2024, 12, 31, tzinfo=timezone.utc)
+
+# ==================== TEST REPOSITORY ====================
+def run_git(path, *arguments, email="dev@example.com", date="2024-03-01T12:00:00+00:00"):
+    env = dict(os.environ, GIT_AUTHOR_NAME="Dev", GIT_AUTHOR_EMAIL=email, GIT_AUTHOR_DATE=date,
+               GIT_COMMITTER_NAME="Dev", GIT_COMMITTER_EMAIL=email, GIT_COMMITTER_DATE=date,
+               GIT_CONFIG_GLOBAL=os.devnull, GIT_CONFIG_NOSYSTEM="1")
+    return subprocess.run(["git", "-C", str(path)] + list(arguments), check=True, capture_output=True, text=True, env=env).stdout
+
+def write(path, name, content):
+    mode = 'wb' if isinstance(content, bytes) else 'w'
+    with open(os.path.join(path, name), mode) as f:
+        f.write(content)
+
+def commit(path, message, email, date):
+    run_git(path, "add", "-A")
+    run_git(path, "commit", "--quiet", "-m", message, email=email, date=date)
+    return run_git(path, "rev-parse", "HEAD").strip()
+
+@pytest.fixture
+def repo(tmp_path):
+    """Repository with a plain, a multi-line, a binary and a merge commit (shas by name)"""
+    run_git(tmp_path, "init", "--quiet", "--initial-branch=main")
+    shas = {}
+
+    write(tmp_path, "a.txt", "one\ntwo\nthree\n")
+    shas["initial"] = commit(tmp_path, "Initial commit", "Alice@Example.com", "2024-02-01T09:00:00+02:00")
+
+    run_git(tmp_path, "checkout", "--quiet", "-b", "feature")
+    write(tmp_path, "b.txt", "feature\nmore\n")
+    shas["feature"] = commit(tmp_path, "Add feature\n\nLonger body\nspanning lines", "12345+bob@users.noreply.github.com",
+                             "2024-02-02T10:00:00+00:00")
+
+    run_git(tmp_path, "checkout", "--quiet", "main")
+    write(tmp_path, "a.txt", "one\n2\nthree\n")
+    shas["fix"] = commit(tmp_path, "fix: typo", "alice@example.com", "2024-02-03T10:00:00+00:00")
+
+    write(tmp_path, "logo.png", bytes(range(256)) * 4)
+    write(tmp_path, "notes.txt", "notes\n")
+    shas["binary"] = commit(tmp_path, "Add logo", "bob@users.noreply.github.com", "2024-02-04T10:00:00+00:00")
+
+    run_git(tmp_path, "merge", "--quiet", "--no-ff", "-m", "Merge branch 'feature'", "feature",
+            email="carol@example.com", date="2024-02-05T10:00:00+00:00")
+    shas["merge"] = run_git(tmp_path, "rev-parse", "HEAD").strip()
+    return tmp_path, shas
+
+def records_by_sha(path, start=START, end=END):
+    return {record["sha"]: record for record in gitlog.iter_commit_records(str(path), start, end)}
+
+# ==================== COMMIT RECORDS ====================
+def test_records_have_the_api_shape(repo):
+    path, shas = repo
+    records = list(gitlog.iter_commit_records(str(path), START, END))
+
+    assert [record["sha"] for record in records] == run_git(path, "rev-list", "HEAD").split()
+    for record in records:
+        assert set(record) == API_RECORD_FIELDS
+        assert record["committed_at"].tzinfo == timezone.utc
+        assert record["authored_at"].tzinfo == timezone.utc
+        assert isinstance(record["additions"], int) and isinstance(record["deletions"], int)
+        assert record["message"] == record["message"].lower()
+
+    initial = records_by_sha(path)[shas["initial"]]
+    assert initial["authored_at"] == datetime(2024, 2, 1, 7, tzinfo=timezone.utc)
+    assert (initial["additions"], initial["deletions"]) == (3, 0)
+
+def test_multi_line_message(repo):
+    path, shas = repo
+    assert records_by_sha(path)[shas["feature"]]["message"] == "add feature\n\nlonger body\nspanning lines"
+
+def test_modified_line(repo):
+    path, shas = repo
+    record = records_by_sha(path)[shas["fix"]]
+    assert (record["additions"], record["deletions"]) == (1, 1)
+    assert record["message"] == "fix: typo"
+
+def test_binary_file_counts_no_lines(repo):
+    path, shas = repo
+    assert "-\t-\tlogo.png" in run_git(path, "show", "--numstat", "--format=", shas["binary"])
+
+    record = records_by_sha(path)[shas["binary"]]
+    assert (record["additions"], record["deletions"]) == (1, 0)
+
+def test_merge_commit_counts_against_first_parent(repo):
+    path, shas = repo
+    record = records_by_sha(path)[shas["merge"]]
+    assert (record["additions"], record["deletions"]) == (2, 0)
+    assert record["message"] == "merge branch 'feature'"
+
+def test_authors(repo):
+    path, shas = repo
+    records = records_by_sha(path)
+    assert records[shas["initial"]]["author"] == "alice@example.com"
+    assert records[shas["fix"]]["author"] == "alice@example.com"
+    assert records[shas["feature"]]["author"] == "bob"
+    assert records[shas["binary"]]["author"] == "bob"
+    assert records[shas["merge"]]["author"] == "carol@example.com"
+
+def test_window(repo):
+    path, shas = repo
+    records = records_by_sha(path, datetime(2024, 2, 3, tzinfo=timezone.utc), datetime(2024, 2, 4, 12, tzinfo=timezone.utc))
+    assert set(records) == {shas["fix"], shas["binary"]}
+
+def test_empty_repository(tmp_path):
+    run_git(tmp_path, "init", "--quiet")
+    assert list(gitlog.iter_commit_records(str(tmp_path), START, END)) == []
+    assert gitlog.last_commit_date(str(tmp_path)) is None
+
+# ==================== CLONES ====================
+@pytest.mark.parametrize("api_url, expected", [
+    (None, "https://github.com/a/b.git"),
+    ("https://api.github.com", "https://github.com/a/b.git"),
+    ("https://ghe.example.com/api/v3", "https://ghe.example.com/a/b.git"),
+    ("https://api.acme.ghe.com", "https://acme.ghe.com/a/b.git"),
+])
+def test_clone_url_follows_the_api_server(api_url, expected):
+    assert gitlog.clone_url("a/b", api_url) == expected
+
+def test_clones_of_other_servers_are_kept_apart():
+    assert gitlog.clone_path("clones", "a/b") == os.path.join("clones", "a__b.git")
+    assert gitlog.clone_path("clones", "a/b", "https://ghe.example.com/api/v3") == os.path.join("clones", "ghe.example.com__a__b.git")
+
+def test_author_identity():
+    assert gitlog.author_identity("12345+Bob@users.noreply.github.com") == "bob"
+    assert gitlog.author_identity("bob@users.noreply.github.com") == "bob"
+    assert gitlog.author_identity("Bob@Example.com") == "bob@example.com"
+    assert gitlog.author_identity("") is None
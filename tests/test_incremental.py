@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+from datetime import timedelta
+import pytest
+import collect
+
+WINDOW_START = collect.time_periods["period_1"]["start"]
+WINDOW_END = collect.time_periods["period_4"]["end"]
+COLLECTED_AT = WINDOW_END - timedelta(days=30)
+
+@pytest.fixture(autouse=True)
+def stand_in_client(monkeypatch, tmp_path):
+    monkeypatch.setattr(collect, "STATE_DIR", str(tmp_path / "state"))
+    monkeypatch.setattr(collect, "budget", None)
+    monkeypatch.setattr(collect, "git_clone_dir", None)
+
+@pytest.fixture
+def fetches(monkeypatch):
+    """Stand-in fetchers returning fresh records; each call is logged as (category, since)"""
+    calls = []
+
+    def fetcher(category, records):
+        def fetch(repo, since, *arguments, **options):
+            calls.append((category, options.get("since", since)))
+            return records
+        return fetch
+
+    monkeypatch.setattr(collect, "fetch_commit_records", fetcher("commits", [commit("b", 2), commit("c", 1)]))
+    monkeypatch.setattr(collect, "fetch_issue_records", fetcher("issues", [{"number": 2, "state": "closed", "updated_at": WINDOW_END}]))
+    monkeypatch.setattr(collect, "fetch_pr_records", lambda repo, periods, since=None, checkpoint=None:
+                        calls.append(("prs", since)) or [{"number": 7, "state": "open", "updated_at": WINDOW_END}])
+    monkeypatch.setattr(collect, "fetch_release_records", fetcher("releases", [{"published_at": WINDOW_END, "body": ""}]))
+    monkeypatch.setattr(collect, "fetch_repo_counts", lambda repo: calls.append(("counts", None)) or {"total_contributors": 9})
+    return calls
+
+def commit(sha, days_ago):
+    moment = WINDOW_END - timedelta(days=days_ago)
+    return {"sha": sha, "committed_at": moment, "authored_at": moment, "author": None, "message": sha,
+            "additions": 1, "deletions": 0}
+
+def stored_state():
+    return {
+        "collected_at": COLLECTED_AT,
+        "pushed_at": COLLECTED_AT, "updated_at": COLLECTED_AT, "open_issues_count": 3,
+        "commits": [commit("a", 60), commit("b", 40)],
+        "issues": [{"number": 1, "state": "open", "updated_at": COLLECTED_AT}, {"number": 2, "state": "open", "updated_at": COLLECTED_AT}],
+        "prs": [{"number": 7, "state": "draft", "updated_at": COLLECTED_AT}],
+        "releases": [],
+        "counts": {"total_contributors": 8}
+    }
+
+def stand_in_repo(**changes):
+    markers = {"pushed_at": COLLECTED_AT, "updated_at": COLLECTED_AT, "open_issues_count": 3}
+    return SimpleNamespace(**{**markers, **changes})
+
+# ==================== PLAN ====================
+@pytest.mark.parametrize("incremental, saved, changes, expected", [
+    (True, False, {}, "full"),                                           # No state yet
+    (False, True, {}, "full"),                                           # Not asked for
+    (True, True, {}, "unchanged"),
+    (True, True, {"pushed_at": COLLECTED_AT + timedelta(hours=1)}, "incremental"),
+    (True, True, {"open_issues_count": 4}, "incremental"),
+])
+def test_plan(monkeypatch, incremental, saved, changes, expected):
+    monkeypatch.setattr(collect, "client", lambda: SimpleNamespace(get_repo=lambda name: stand_in_repo(**changes)))
+    monkeypatch.setattr(collect, "collect_repo_metrics", lambda repo, name, state, checkpoint: (state is not None, checkpoint["plan"]))
+    if saved:
+        collect.save_repo_state("a/b", stored_state())
+
+    uses_state, plan = collect.collect_repo("a/b", incremental=incremental)
+    assert plan == expected
+    assert uses_state == (expected != "full")
+
+def test_checkpoint_without_its_state_is_planned_again(monkeypatch):
+    monkeypatch.setattr(collect, "client", lambda: SimpleNamespace(get_repo=lambda name: stand_in_repo()))
+    monkeypatch.setattr(collect, "collect_repo_metrics", lambda repo, name, state, checkpoint: checkpoint["plan"])
+    collect.write_checkpoint(collect.new_checkpoint("a/b", "incremental", WINDOW_START, WINDOW_END))
+    assert collect.collect_repo("a/b", incremental=True) == "full"
+
+def test_state_round_trip():
+    collect.save_repo_state("a/b", stored_state())
+    assert collect.load_repo_state("a/b") == stored_state()
+    assert collect.load_repo_state("missing/repo") is None
+
+# ==================== RECORDS ====================
+def test_unchanged_plan_makes_no_requests(fetches):
+    state = stored_state()
+    records = collect.fetch_repo_records(stand_in_repo(), "a/b", "unchanged", state, WINDOW_START, WINDOW_END)
+    assert fetches == []
+    assert records == {key: state[key] for key in ("commits", "issues", "prs", "releases", "counts")}
+
+def test_incremental_plan_merges_activity_since_the_last_collection(fetches):
+    records = collect.fetch_repo_records(stand_in_repo(), "a/b", "incremental", stored_state(), WINDOW_START, WINDOW_END)
+
+    assert fetches == [
+        ("commits", COLLECTED_AT - timedelta(days=collect.INCREMENTAL_OVERLAP_DAYS)),
+        ("issues", COLLECTED_AT),
+        ("prs", COLLECTED_AT),
+        ("releases", WINDOW_START),
+        ("counts", None)
+    ]
+    # Fresh records replace stored ones with the same key; the others are kept
+    assert [c["sha"] for c in records["commits"]] == ["a", "b", "c"]
+    assert records["issues"] == [{"number": 1, "state": "open", "updated_at": COLLECTED_AT},
+                                 {"number": 2, "state": "closed", "updated_at": WINDOW_END}]
+    assert records["prs"] == [{"number": 7, "state": "open", "updated_at": WINDOW_END}]
+    assert records["counts"] == {"total_contributors": 9}
+
+def test_full_plan_fetches_the_whole_window(fetches):
+    collect.fetch_repo_records(stand_in_repo(), "a/b", "full", None, WINDOW_START, WINDOW_END)
+    assert fetches == [("commits", WINDOW_START), ("issues", WINDOW_START), ("prs", None), ("releases", WINDOW_START), ("counts", None)]
@@ -0,0 +1,43 @@
+import re
+import pytest
+from keywords import KeywordClassifier, DEFAULT_VOCABULARIES, keyword_pattern, synthetic_messages
+
+# Keywords of one label extending a * stem of another, and plain keywords extending a stem
+OVERLAPPING_VOCABULARIES = {
+    "breaking": ["breaking change", "break it", "breakdown"],
+    "fragile": ["break*"],
+    "fix": ["fix", "fix*", "fixup!"],
+    "docs": ["fixup docs", "doc*"]
+}
+
+def reference_labels(vocabularies, text):
+    """Labels whose keywords occur in text, one keyword regex at a time"""
+    return {label for label, words in vocabularies.items()
+            if any(re.search(keyword_pattern(word), text.lower()) for word in words)}
+
+@pytest.mark.parametrize("text, labels", [
+    ("breaking change in the api", {"breaking", "fragile"}),
+    ("Breaking Changes", {"fragile"}),
+    ("break it down", {"breaking", "fragile"}),
+    ("breakdown of costs", {"breaking", "fragile"}),
+    ("breakdowns", {"fragile"}),
+    ("it breaks", {"fragile"}),
+    ("fixup! typo", {"fix"}),
+    ("fixup docs", {"fix", "docs"}),
+    ("prefix docs", {"docs"}),
+    ("nothing here", set())
+])
+def test_keywords_extending_a_stem(text, labels):
+    classifier = KeywordClassifier(OVERLAPPING_VOCABULARIES)
+    assert classifier.labels(text) == labels == reference_labels(OVERLAPPING_VOCABULARIES, text)
+
+@pytest.mark.parametrize("vocabularies", [DEFAULT_VOCABULARIES, OVERLAPPING_VOCABULARIES])
+def test_classifier_matches_keyword_by_keyword_search(vocabularies):
+    classifier = KeywordClassifier(vocabularies)
+    texts = synthetic_messages(2000) + ["breaking change", "bc breaking", "bugfixes", "re-add deps", "fixup docs"]
+    assert [set(labels) for labels in classifier.label_batch(texts)] == [reference_labels(vocabularies, text) for text in texts]
+
+def test_batch_matches_one_at_a_time():
+    classifier = KeywordClassifier(DEFAULT_VOCABULARIES)
+    texts = synthetic_messages(500) + ["", "fix\x00bug", "\x00", "breaking\x00\x00change", "add\x00 docs"]
+    assert classifier.label_batch(texts) == [classifier.labels(text) for text in texts]
@@ -0,0 +1,411 @@
+import random
+from types import SimpleNamespace
+from datetime import datetime, timedelta, timezone
+import pytest
+import collect
+
+NOW = datetime(2026, 6, 15, 13, 30, tzinfo=timezone.utc)
+PERIODS, _ = collect.make_time_periods(NOW)
+START = PERIODS["period_1"]["start"]
+
+# Items per page of the stand-in listings (small, so that fetches span several pages)
+PER_PAGE = 7
+
+@pytest.fixture(autouse=True)
+def small_pages(monkeypatch):
+    monkeypatch.setattr(collect, "client", lambda: SimpleNamespace(per_page=PER_PAGE))
+
+# ==================== STAND-IN REPOSITORY ====================
+class Listing:
+    """A REST listing, iterated like PyGithub's PaginatedList or read a page at a time"""
+
+    def __init__(self, items):
+        self.items = items
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def get_page(self, page):
+        return self.items[page * PER_PAGE:(page + 1) * PER_PAGE]
+
+class StandInRepo:
+    def __init__(self, issues=(), prs=()):
+        # Listings sort newest first; ties keep the order of the most-recently-updated listing
+        self.issues = sorted(issues, key=lambda i: i.updated_at, reverse=True)
+        self.prs = sorted(prs, key=lambda p: p.updated_at, reverse=True)
+
+    def get_issues(self, state, since, sort, direction):
+        assert (state, direction) == ('all', 'desc')
+        issues = [issue for issue in self.issues if issue.updated_at >= since]
+        if sort == 'created':
+            issues = sorted(issues, key=lambda i: i.created_at, reverse=True)
+        return Listing(issues)
+
+    def get_pulls(self, state, sort, direction):
+        assert (sort, direction) == ('updated', 'desc')
+        return Listing([pr for pr in self.prs if state == 'all' or pr.state == state])
+
+def make_issue(number, created_at, updated_at, closed_at=None, labels=(), first_comment_at=None, reopened_at=()):
+    return SimpleNamespace(
+        number=number,
+        created_at=created_at,
+        updated_at=updated_at,
+        closed_at=closed_at,
+        state='closed' if closed_at else 'open',
+        labels=[SimpleNamespace(name=label) for label in labels],
+        pull_request=None,
+        get_comments=lambda: [SimpleNamespace(created_at=first_comment_at)] if first_comment_at else [],
+        get_events=lambda: [SimpleNamespace(event='reopened', created_at=moment) for moment in reopened_at]
+    )
+
+def make_pr(number, created_at, updated_at, state='open', merged_at=None, reviewers=(), review_comments=0):
+    return SimpleNamespace(
+        number=number,
+        state=state,
+        created_at=created_at,
+        updated_at=updated_at,
+        merged_at=merged_at,
+        review_comments=review_comments,
+        get_reviews=lambda: [SimpleNamespace(user=SimpleNamespace(login=login) if login else None) for login in reviewers]
+    )
+
+def random_moments(rng, count):
+    """Times over the window and a little before it, including every period boundary (so that items tie and sit on them)"""
+    span = (NOW - START + timedelta(days=120)).total_seconds()
+    moments = {START - timedelta(days=120) + timedelta(seconds=rng.uniform(0, span)) for _ in range(count)}
+    for bounds in PERIODS.values():
+        moments.update((bounds["start"], bounds["end"]))
+    return sorted(moments)
+
+def random_issues(rng, count, moments):
+    issues = []
+    for number in range(1, count + 1):
+        created = rng.choice(moments)
+        later = [moment for moment in moments if moment >= created]
+        updated = rng.choice(later)
+        between = [moment for moment in later if moment <= updated]
+        issues.append(make_issue(
+            number, created, updated,
+            closed_at=rng.choice(between) if rng.random() < 0.5 else None,
+            labels=rng.sample(["Bug", "enhancement", "question", "type: feature", "error handling"], rng.randint(0, 2)),
+            first_comment_at=rng.choice(later) if rng.random() < 0.7 else None,
+            reopened_at=rng.sample(between, min(len(between), rng.randint(0, 2)))
+        ))
+    return issues
+
+def random_prs(rng, count, moments, closed_share):
+    prs = []
+    for number in range(1, count + 1):
+        created = rng.choice(moments)
+        updated = rng.choice([moment for moment in moments if moment >= created])
+        closed = rng.random() < closed_share
+        prs.append(make_pr(
+            number, created, updated,
+            state='closed' if closed else 'open',
+            merged_at=rng.choice([moment for moment in moments if created <= moment <= updated]) if closed and rng.random() < 0.7 else None,
+            reviewers=rng.choices(["ann", "ben", "cy", None], k=rng.randint(0, 3)),
+            review_comments=rng.randint(0, 4)
+        ))
+    return prs
+
+# ==================== PER-PERIOD ISSUE FUNCTIONS (before the shared issue scan) ====================
+def old_issue_response_times(repo, start_date, end_date):
+    issues = repo.get_issues(state='all', since=start_date, sort='created', direction='desc')
+    response_times = []
+    issues_without_response = 0
+    issues_counted = 0
+    for issue in issues:
+        if issues_counted >= collect.SAMPLE_LIMIT:
+            break
+        if issue.created_at > end_date:
+            continue
+        if issue.created_at < start_date:
+            break
+        if issue.pull_request:
+            continue
+        issues_counted += 1
+        comments = issue.get_comments()
+        try:
+            first_comment = comments[0]
+            time_to_response = (first_comment.created_at - issue.created_at).total_seconds() / 3600
+            response_times.append(time_to_response)
+        except (IndexError, StopIteration):
+            issues_without_response += 1
+    avg_response_time = sum(response_times) / len(response_times) if response_times else 0
+    return {
+        "issues_created": issues_counted,
+        "issues_with_response": len(response_times),
+        "issues_without_response": issues_without_response,
+        "avg_response_time_hours": round(avg_response_time, 2),
+        "response_times_sample": [round(t, 2) for t in response_times[:5]]
+    }
+
+def old_bug_feature_metrics(repo, start_date, end_date):
+    issues = repo.get_issues(state='all', since=start_date, sort='created', direction='desc')
+    bugs_opened = bugs_closed = features_opened = features_closed = other_issues = processed = 0
+    for issue in issues:
+        if processed >= collect.SAMPLE_LIMIT:
+            break
+        if issue.created_at > end_date:
+            continue
+        if issue.created_at < start_date:
+            break
+        if issue.pull_request:
+            continue
+        processed += 1
+        labels = [label.name.lower() for label in issue.labels]
+        is_bug = any(term in label for label in labels for term in ['bug', 'defect', 'error'])
+        is_feature = any(term in label for label in labels for term in ['feature', 'enhancement', 'improvement'])
+        if is_bug:
+            bugs_opened += 1
+            if issue.state == 'closed':
+                bugs_closed += 1
+        elif is_feature:
+            features_opened += 1
+            if issue.state == 'closed':
+                features_closed += 1
+        else:
+            other_issues += 1
+    return {
+        "bugs_opened": bugs_opened,
+        "bugs_closed": bugs_closed,
+        "bug_closure_rate": round(bugs_closed / bugs_opened if bugs_opened > 0 else 0, 2),
+        "features_opened": features_opened,
+        "features_closed": features_closed,
+        "feature_closure_rate": round(features_closed / features_opened if features_opened > 0 else 0, 2),
+        "other_issues": other_issues
+    }
+
+def old_issue_accumulation(repo, start_date, end_date):
+    issues = repo.get_issues(state='all', since=start_date, sort='created', direction='desc')
+    opened = 0
+    closed = 0
+    for issue in issues:
+        if issue.pull_request:
+            continue
+        if start_date <= issue.created_at <= end_date:
+            opened += 1
+        if issue.closed_at and start_date <= issue.closed_at <= end_date:
+            closed += 1
+        if issue.created_at < start_date:
+            break
+    net_accumulation = opened - closed
+    return {
+        "issues_opened": opened,
+        "issues_closed": closed,
+        "net_accumulation": net_accumulation,
+        "accumulation_rate": round(net_accumulation / opened, 2) if opened > 0 else 0
+    }
+
+def old_regression_rate(repo, start_date, end_date):
+    issues = repo.get_issues(state='all', since=start_date, sort='updated', direction='desc')
+    reopened_count = 0
+    total_issues = 0
+    for issue in issues:
+        if total_issues >= collect.SAMPLE_LIMIT:
+            break
+        if issue.updated_at < start_date:
+            break
+        if issue.updated_at > end_date:
+            continue
+        if issue.pull_request:
+            continue
+        total_issues += 1
+        for event in issue.get_events():
+            if event.event == 'reopened':
+                if start_date <= event.created_at <= end_date:
+                    reopened_count += 1
+                    break
+    return {
+        "total_issues": total_issues,
+        "reopened_issues": reopened_count,
+        "regression_rate": round(reopened_count / total_issues if total_issues > 0 else 0, 3)
+    }
+
+# ==================== ISSUES ====================
+def shared_issue_metrics(repo):
+    """Issue metrics per period the way collect_repo computes them: one listing, split by bucket_issues_by_period"""
+    issues_by_period = collect.bucket_issues_by_period(collect.fetch_issue_records_rest(repo, START), PERIODS)
+    metrics = {}
+    for period_key, bounds in PERIODS.items():
+        period_issues = issues_by_period[period_key]
+        created, updated = len(period_issues["created"]), len(period_issues["updated"])
+        metrics[period_key] = {
+            "response": collect.calculate_issue_response_times(repo, period_issues, created),
+            "bug_feature": collect.calculate_bug_feature_metrics(period_issues, created),
+            "accumulation": collect.calculate_issue_accumulation(period_issues, bounds["start"], bounds["end"]),
+            "regression": collect.calculate_regression_rate(repo, period_issues, bounds["start"], bounds["end"], updated)
+        }
+    return metrics
+
+def per_period_issue_metrics(repo):
+    metrics = {}
+    for period_key, bounds in PERIODS.items():
+        metrics[period_key] = {
+            "response": old_issue_response_times(repo, bounds["start"], bounds["end"]),
+            "bug_feature": old_bug_feature_metrics(repo, bounds["start"], bounds["end"]),
+            "accumulation": old_issue_accumulation(repo, bounds["start"], bounds["end"]),
+            "regression": old_regression_rate(repo, bounds["start"], bounds["end"])
+        }
+    return metrics
+
+def assert_same_issue_metrics(issues):
+    expected = per_period_issue_metrics(StandInRepo(issues))
+    shared = shared_issue_metrics(StandInRepo(issues))
+    for period_key in PERIODS:
+        for metric, old in expected[period_key].items():
+            # The shared scan adds confidence intervals; every field the old functions had must match
+            new = shared[period_key][metric]
+            assert {field: new[field] for field in old} == old, (period_key, metric)
+
+@pytest.mark.parametrize("seed", range(40))
+@pytest.mark.parametrize("limit", [3, 300])
+def test_issue_buckets_match_per_period_scans(monkeypatch, seed, limit):
+    monkeypatch.setattr(collect, "SAMPLE_LIMIT", limit)
+    rng = random.Random(seed)
+    # Few distinct moments for many issues, so created and updated times often tie
+    assert_same_issue_metrics(random_issues(rng, rng.randint(0, 60), random_moments(rng, rng.randint(5, 40))))
+
+def test_issues_on_period_boundaries(monkeypatch):
+    monkeypatch.setattr(collect, "SAMPLE_LIMIT", 2)
+    p1, p2, p3 = PERIODS["period_1"], PERIODS["period_2"], PERIODS["period_3"]
+    issues = [
+        make_issue(1, p1["start"], p1["start"], closed_at=p1["start"], labels=["bug"]),
+        make_issue(2, p1["end"], p2["start"], first_comment_at=p2["end"], reopened_at=[p2["start"]]),
+        make_issue(3, p2["start"], p2["end"], closed_at=p2["end"], labels=["enhancement"], reopened_at=[p2["end"]]),
+        make_issue(4, p2["start"], p3["end"], closed_at=p3["start"]),
+        make_issue(5, p2["start"], p2["start"], first_comment_at=p2["start"]),
+        make_issue(6, START - timedelta(days=30), p1["start"], closed_at=p1["start"]),
+        make_issue(7, START - timedelta(days=30), START - timedelta(seconds=1), closed_at=START - timedelta(seconds=1)),
+        make_issue(8, p3["end"], NOW, closed_at=NOW, labels=["bug"], reopened_at=[NOW])
+    ]
+    assert_same_issue_metrics(issues)
+
+def test_periods_without_issues(monkeypatch):
+    monkeypatch.setattr(collect, "SAMPLE_LIMIT", 3)
+    p2 = PERIODS["period_2"]
+    middle = p2["start"] + (p2["end"] - p2["start"]) / 2
+    issues = [make_issue(number, middle, middle + timedelta(hours=number), labels=["bug"]) for number in range(1, 6)]
+    issues_by_period = collect.bucket_issues_by_period(collect.fetch_issue_records_rest(StandInRepo(issues), START), PERIODS)
+
+    assert [len(issues_by_period[k]["created"]) for k in PERIODS] == [0, 5, 0, 0]
+    assert_same_issue_metrics(issues)
+    assert_same_issue_metrics([])
+
+# ==================== PER-PERIOD PR FUNCTIONS (before the shared PR pass) ====================
+def old_pr_metrics(repo, start_date, end_date):
+    prs = repo.get_pulls(state='closed', sort='updated', direction='desc')
+    merge_times = []
+    merged_count = 0
+    closed_without_merge = 0
+    processed = 0
+    for pr in prs:
+        if processed >= collect.SAMPLE_LIMIT:
+            break
+        if pr.updated_at < start_date:
+            break
+        if pr.updated_at > end_date:
+            continue
+        processed += 1
+        if pr.merged_at:
+            merge_times.append((pr.merged_at - pr.created_at).total_seconds() / 3600)
+            merged_count += 1
+        else:
+            closed_without_merge += 1
+    avg_merge_time = sum(merge_times) / len(merge_times) if merge_times else 0
+    return {
+        "merged_count": merged_count,
+        "closed_without_merge": closed_without_merge,
+        "avg_merge_time_hours": round(avg_merge_time, 2),
+        "merge_times_sample": [round(t, 2) for t in merge_times[:5]]
+    }
+
+def old_pr_review_metrics(repo, start_date, end_date):
+    prs = repo.get_pulls(state='all', sort='updated', direction='desc')
+    total_reviewers = set()
+    total_reviews = prs_with_reviews = prs_without_reviews = review_comments = processed = 0
+    for pr in prs:
+        if processed >= collect.SAMPLE_LIMIT:
+            break
+        if pr.updated_at < start_date:
+            break
+        if pr.updated_at > end_date:
+            continue
+        processed += 1
+        review_count = 0
+        for review in pr.get_reviews():
+            review_count += 1
+            total_reviews += 1
+            if review.user:
+                total_reviewers.add(review.user.login)
+        review_comments += pr.review_comments
+        if review_count > 0:
+            prs_with_reviews += 1
+        else:
+            prs_without_reviews += 1
+    total_prs = prs_with_reviews + prs_without_reviews
+    return {
+        "total_prs": total_prs,
+        "prs_with_reviews": prs_with_reviews,
+        "prs_without_reviews": prs_without_reviews,
+        "unique_reviewers": len(total_reviewers),
+        "total_reviews": total_reviews,
+        "review_comments": review_comments,
+        "avg_reviews_per_pr": round(total_reviews / total_prs, 2) if total_prs > 0 else 0
+    }
+
+# ==================== PULL REQUESTS ====================
+def shared_pr_metrics(repo):
+    """PR metrics per period the way collect_repo computes them: one descending pass, split by bucket_prs_by_period"""
+    prs_by_period = collect.bucket_prs_by_period(collect.fetch_pr_records(repo, PERIODS), PERIODS, collect.SAMPLE_LIMIT)
+    metrics = {}
+    for period_key, period_prs in prs_by_period.items():
+        population = {kind: len(prs) if len(prs) < collect.SAMPLE_LIMIT else None for kind, prs in period_prs.items()}
+        metrics[period_key] = {
+            "merge": collect.calculate_pr_metrics(period_prs, population["closed"]),
+            "review": collect.calculate_pr_review_metrics(repo, period_prs, population["all"])
+        }
+    return metrics
+
+def per_period_pr_metrics(repo):
+    metrics = {}
+    for period_key, bounds in PERIODS.items():
+        metrics[period_key] = {
+            "merge": old_pr_metrics(repo, bounds["start"], bounds["end"]),
+            "review": old_pr_review_metrics(repo, bounds["start"], bounds["end"])
+        }
+    return metrics
+
+def assert_same_pr_metrics(prs):
+    expected = per_period_pr_metrics(StandInRepo(prs=prs))
+    shared = shared_pr_metrics(StandInRepo(prs=prs))
+    for period_key in PERIODS:
+        for metric, old in expected[period_key].items():
+            new = shared[period_key][metric]
+            assert {field: new[field] for field in old} == old, (period_key, metric)
+
+@pytest.mark.parametrize("seed", range(40))
+@pytest.mark.parametrize("limit", [3, 300])
+@pytest.mark.parametrize("closed_share", [0.05, 0.5])
+def test_pr_buckets_match_per_period_scans(monkeypatch, seed, limit, closed_share):
+    monkeypatch.setattr(collect, "SAMPLE_LIMIT", limit)
+    rng = random.Random(seed)
+    assert_same_pr_metrics(random_prs(rng, rng.randint(0, 80), random_moments(rng, rng.randint(5, 40)), closed_share))
+
+def test_sparse_closed_prs_are_all_reached(monkeypatch):
+    monkeypatch.setattr(collect, "SAMPLE_LIMIT", 3)
+    p1 = PERIODS["period_1"]
+    # Many open PRs in every period fill the "all" samples long before the few closed ones are reached; the
+    # earliest period never fills its closed sample, so the pass must go on to its start
+    moments = [p1["start"] + timedelta(days=day) for day in range(0, (NOW - p1["start"]).days, 3)]
+    prs = [make_pr(number, moment, moment, reviewers=["ann"]) for number, moment in enumerate(moments, 1)]
+    prs += [make_pr(1000 + number, p1["start"], p1["start"] + timedelta(days=day), state='closed',
+                    merged_at=p1["start"] + timedelta(days=day // 2) if number % 2 else None)
+            for number, day in enumerate([1, 250, 400, 700])]
+    prs.append(make_pr(2000, p1["start"] - timedelta(days=5), p1["start"], state='closed', merged_at=p1["start"]))
+    prs.append(make_pr(2001, p1["start"] - timedelta(days=5), p1["start"] - timedelta(days=1), state='closed'))
+    assert_same_pr_metrics(prs)
+
+    pr_records = collect.fetch_pr_records(StandInRepo(prs=prs), PERIODS)
+    assert 2000 in [record["number"] for record in pr_records]
+    assert 2001 not in [record["number"] for record in pr_records]
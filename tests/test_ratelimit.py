@@ -0,0 +1,51 @@
+import threading
+import pytest
+import ratelimit
+from ratelimit import RequestBudget
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Stand-in for time.time whose sleep() advances it; waits lists every sleep"""
+    clock = type("Clock", (), {"now": 0.0, "waits": []})()
+
+    def sleep(seconds):
+        clock.waits.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(ratelimit.time, "time", lambda: clock.now)
+    monkeypatch.setattr(ratelimit.time, "sleep", sleep)
+    return clock
+
+def test_not_modified_frees_its_own_hourly_slot(clock):
+    budget = RequestBudget(tokens=["token"], hourly_limit=2, max_concurrent=4, min_interval=0)
+    token = budget.acquire()
+
+    # Another worker starts a request while the first is still in flight
+    clock.now = 10.0
+    worker = threading.Thread(target=budget.acquire)
+    worker.start()
+    worker.join()
+
+    clock.now = 20.0
+    budget.release(token, "core", 304, None)
+    assert budget.requests_made == 1
+
+    # The 304 gave its slot back, so a request starts at once
+    budget.acquire()
+    assert clock.waits == []
+
+    # The hour is full again: the next request waits for the other worker's request (at 10s) to age out,
+    # which it wouldn't if the 304 had freed that one
+    clock.now = 30.0
+    budget.acquire()
+    assert clock.waits == [3600 - 20]
+    assert budget.seconds_waited == 3600 - 20
+    assert budget.requests_made == 3
+
+def test_request_starts_are_spaced(clock):
+    budget = RequestBudget(tokens=["token"], hourly_limit=100, max_concurrent=4, min_interval=0.5)
+    for _ in range(3):
+        budget.release(budget.acquire(), "core", 200, None)
+    assert clock.waits == [0.5, 0.5]
+    assert budget.requests_made == 3
+    assert budget.usage["other"]["core"] == 3
@@ -0,0 +1,47 @@
+import pytest
+import report
+from storage import RepoStore
+
+@pytest.fixture
+def store(tmp_path, repo_records):
+    store = RepoStore(str(tmp_path / "repo_data.sqlite"), json_path=None)
+    for record in repo_records:
+        classification = "Active" if record["velocity"]["commits_last_3_months"] else "Abandoned"
+        store.put({**record, "classification": classification, "classification_evidence": "test"})
+    return store
+
+def read_report(path):
+    """Report text without the Generated line, which changes on every run"""
+    with open(path, 'r') as f:
+        return [line for line in f.read().split("\n") if not line.startswith("**Generated:**")]
+
+def write_both(tmp_path, store):
+    """Report written incrementally and with --rebuild, as (rendered, incremental lines, rebuilt lines)"""
+    rendered = report.write_report(str(tmp_path / "report.md"), str(tmp_path / "sections.sqlite"), store=store)
+    report.write_report(str(tmp_path / "rebuilt.md"), str(tmp_path / "rebuilt.sqlite"), rebuild=True, store=store)
+    return rendered, read_report(tmp_path / "report.md"), read_report(tmp_path / "rebuilt.md")
+
+# ==================== INCREMENTAL REPORT ====================
+def test_incremental_report_matches_a_rebuild(tmp_path, store, repo_records):
+    rendered, incremental, rebuilt = write_both(tmp_path, store)
+    assert rendered == len(repo_records)
+    assert incremental == rebuilt
+
+    changed = store.get(repo_records[3]["name"])
+    changed["classification"] = "Abandoned" if changed["classification"] == "Active" else "Active"
+    changed["evolvability"]["stars"] += 1000
+    store.put(changed)
+    store.put({**repo_records[0], "name": "new/repo", "classification": "Active", "classification_evidence": "test"})
+
+    rendered, incremental, rebuilt = write_both(tmp_path, store)
+    assert rendered == 2
+    assert incremental == rebuilt
+    assert f"**Total Repositories:** {len(repo_records) + 1}" in incremental
+
+def test_layout_version_renders_every_section_again(tmp_path, store, monkeypatch, repo_records):
+    cache_path = str(tmp_path / "sections.sqlite")
+    report.write_report(str(tmp_path / "report.md"), cache_path, store=store)
+    assert report.write_report(str(tmp_path / "report.md"), cache_path, store=store) == 0
+
+    monkeypatch.setattr(report, "SECTION_LAYOUT_VERSION", report.SECTION_LAYOUT_VERSION + 1)
+    assert report.write_report(str(tmp_path / "report.md"), cache_path, store=store) == len(repo_records)
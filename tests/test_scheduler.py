@@ -0,0 +1,125 @@
+import math
+from datetime import datetime, timedelta, timezone
+import pytest
+import collect
+import scheduler
+from storage import RepoStore
+
+NOW = datetime(2026, 6, 15, 12, 0, tzinfo=timezone.utc)
+
+def collected(record, days_ago):
+    return {**record, "collection_date": (NOW - timedelta(days=days_ago)).strftime("%Y-%m-%d %H:%M:%S UTC")}
+
+@pytest.fixture
+def records(repo_records):
+    return {record["name"]: record for record in repo_records}
+
+@pytest.fixture
+def store(tmp_path):
+    return RepoStore(str(tmp_path / "repo_data.sqlite"), json_path=None)
+
+class StubBudget:
+    """Quota by resource as (remaining, limit, reset), as RequestBudget.quota reports it"""
+
+    def __init__(self, quotas=None):
+        self.quotas = quotas or {}
+
+    def quota(self, resource="core"):
+        return self.quotas.get(resource)
+
+# ==================== PRIORITY ====================
+def test_queue_order(monkeypatch, store, records):
+    scores = {"moment/moment": 12.0, "vitejs/vite": 100.0, "jquery/jquery": 49.9}
+    monkeypatch.setattr(scheduler, "score_repo", lambda record: {"health_score": scores[record["name"]]})
+    # moment/moment: 13 points from a boundary, no recent commits -> priority = age = 30
+    # vitejs/vite: 25 points from a boundary, 265 recent commits -> priority = 2 x age = 40
+    # jquery/jquery: 0.1 points from a boundary, 26 recent commits -> priority = 1.29 x 1.98 x age = 51
+    store.put(collected(records["moment/moment"], 30))
+    store.put(collected(records["vitejs/vite"], 20))
+    store.put(collected(records["jquery/jquery"], 20))
+    store.put(collected(records["lodash/lodash"], 0.5))  # Not due yet
+
+    names = ["moment/moment", "vitejs/vite", "jquery/jquery", "lodash/lodash", "new/repo"]
+    heap, next_due = scheduler.refresh_queue(names, store, NOW, min_age_hours=24)
+
+    assert [scheduler.heapq.heappop(heap)[2] for _ in range(len(heap))] == ["new/repo", "jquery/jquery", "vitejs/vite", "moment/moment"]
+    assert next_due == NOW + timedelta(hours=12)
+
+def test_priority_grows_with_age_activity_and_boundary_nearness(records):
+    quiet = collected(records["moment/moment"], 10)
+    scores = {"health_score": 12.0}
+    assert scheduler.priority(quiet, scores, NOW) == pytest.approx(10)
+    assert scheduler.priority(collected(quiet, 20), scores, NOW) == pytest.approx(20)
+
+    busy = {**quiet, "velocity": {**quiet["velocity"], "commits_last_3_months": 500}}
+    assert scheduler.priority(busy, scores, NOW) == pytest.approx(20)
+    assert scheduler.priority(quiet, {"health_score": 75.0}, NOW) == pytest.approx(20)
+    assert scheduler.priority(quiet, {"health_score": 72.5}, NOW) == pytest.approx(15)
+
+def test_never_collected_repos_keep_list_order(store):
+    heap, next_due = scheduler.refresh_queue(["b/b", "a/a", "c/c"], store, NOW)
+    assert [scheduler.heapq.heappop(heap) for _ in range(3)] == [(-math.inf, 0, "b/b"), (-math.inf, 1, "a/a"), (-math.inf, 2, "c/c")]
+    assert next_due is None
+
+# ==================== FAILURE BACKOFF ====================
+def test_retry_delay_doubles_up_to_a_day():
+    delays = [scheduler.retry_delay(attempts) for attempts in range(1, 10)]
+    assert delays[:4] == [timedelta(minutes=15), timedelta(minutes=30), timedelta(hours=1), timedelta(hours=2)]
+    assert delays[-1] == timedelta(hours=scheduler.MAX_RETRY_HOURS)
+
+def test_failed_repo_is_held_back_until_its_retry(store):
+    retry_at = {"bad/repo": NOW + timedelta(minutes=15)}
+    heap, next_due = scheduler.refresh_queue(["bad/repo", "new/repo"], store, NOW, retry_at=retry_at)
+    assert [entry[2] for entry in heap] == ["new/repo"]
+    assert next_due == NOW + timedelta(minutes=15)
+
+    heap, _ = scheduler.refresh_queue(["bad/repo", "new/repo"], store, NOW + timedelta(minutes=15), retry_at=retry_at)
+    assert sorted(entry[2] for entry in heap) == ["bad/repo", "new/repo"]
+
+@pytest.mark.parametrize("whole_batch_fails", [False, True])
+def test_run_keeps_going_after_a_failure(monkeypatch, tmp_path, store, records, whole_batch_fails, capsys):
+    repos_path = tmp_path / "repos.txt"
+    repos_path.write_text("bad/repo\nvitejs/vite\n")
+    batches = []
+
+    def collect_repos(batch, store_used, workers=1, incremental=False, failures=None):
+        batches.append(list(batch))
+        assert store_used is store  # The empty store passed in, not the default one
+        if whole_batch_fails:
+            raise OSError("disk full")
+        for name in batch:
+            if name == "bad/repo":
+                failures[name] = ValueError("renamed")
+            else:
+                store_used.put(collected(records[name], 0))
+
+    monkeypatch.setattr(collect, "client", lambda: None)
+    monkeypatch.setattr(collect, "collect_repos", collect_repos)
+    monkeypatch.setattr(collect, "budget", StubBudget())
+
+    refreshed = scheduler.run(str(repos_path), store, workers=1, once=True)
+
+    assert batches == [["bad/repo"], ["vitejs/vite"]]
+    assert refreshed == (0 if whole_batch_fails else 1)
+    assert "bad/repo: collection failed" in capsys.readouterr().out
+
+# ==================== BUDGET ====================
+def test_budget_wait(monkeypatch):
+    monkeypatch.setattr(scheduler.time, "time", lambda: 1000.0)
+    monkeypatch.setattr(collect, "budget", StubBudget({"core": (3000, 5000, 1600.0), "graphql": (4000, 5000, 1900.0)}))
+
+    # 20% of each limit is left for other tools: 3000 - 1000 = 2000 core requests may be spent
+    assert scheduler.budget_wait({"core": 2000}) == 0
+    assert scheduler.budget_wait({"core": 2001}) == 600.0
+    assert scheduler.budget_wait({"core": 100, "graphql": 3001}) == 900.0
+    # Resources not reported yet are assumed available; a cost beyond the share only needs a fresh window
+    assert scheduler.budget_wait({"search": 10**6}) == 0
+    assert scheduler.budget_wait({"graphql": 10**6}) == 900.0
+    monkeypatch.setattr(collect, "budget", StubBudget({"core": (5000, 5000, 1600.0)}))
+    assert scheduler.budget_wait({"core": 10**6}) == 0
+
+def test_batch_cost_falls_back_to_the_default():
+    costs = {"a/a": {"core": 10, "graphql": 2}}
+    assert scheduler.batch_cost(costs, ["a/a", "b/b"]) == {
+        "core": 10 + scheduler.DEFAULT_COST["core"], "graphql": 2 + scheduler.DEFAULT_COST["graphql"]
+    }
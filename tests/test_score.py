@@ -0,0 +1,68 @@
+import copy
+import pytest
+import score
+
+pytest.importorskip("numpy")
+
+def variants(records):
+    """The collected records plus edge cases for each branch score_repo takes"""
+    repos = list(records)
+    base = records[0]
+
+    # No P1 or P2 (repos younger than 24 months)
+    repo = copy.deepcopy(base)
+    for key in ("period_1", "period_2"):
+        del repo["velocity"]["period_metrics"][key]
+        del repo["collaboration"]["contributor_metrics_by_period"][key]
+    repos.append(repo)
+
+    # Abandoned (no P4 or P3 commits), and zero counts taking the neutral 0.5 branches
+    repo = copy.deepcopy(base)
+    for key in ("period_3", "period_4"):
+        repo["velocity"]["period_metrics"][key]["commit_count"] = 0
+    repo["velocity"]["pr_metrics_by_period"]["period_4"]["merged_count"] = 0
+    repo["collaboration"]["pr_review_by_period"]["period_4"]["total_prs"] = 0
+    repo["collaboration"]["issue_response_by_period"]["period_4"]["issues_created"] = 0
+    repo["quality"]["bug_feature_by_period"]["period_4"]["bugs_opened"] = 0
+    repos.append(repo)
+
+    # Very active with a recent last commit (high activity, recency and trend bonuses, clamped at 100)
+    repo = copy.deepcopy(base)
+    repo["velocity"]["period_metrics"]["period_4"]["commit_count"] = 5000
+    repo["velocity"]["last_commit_date"] = repo["collection_date"][:10]
+    repos.append(repo)
+
+    # Full marks everywhere (clamped to 100), and a last commit exactly on the recency bound
+    repo = copy.deepcopy(base)
+    for key in ("period_1", "period_2", "period_3", "period_4"):
+        repo["velocity"]["period_metrics"][key]["commit_count"] = 600
+        repo["collaboration"]["contributor_metrics_by_period"][key]["total_contributors"] = 50
+    repo["velocity"]["period_metrics"]["period_4"]["total_changes"] = 10**6
+    repo["collaboration"]["contributor_metrics_by_period"]["period_4"]["retention_rate"] = 1.0
+    repo["quality"]["bug_feature_by_period"]["period_4"]["bug_closure_rate"] = 1.0
+    repo["evolvability"]["refactoring_by_period"]["period_4"].update(refactoring_rate=1.0, dependency_update_rate=1.0)
+    repo["evolvability"]["feature_growth_by_period"]["period_4"]["net_loc_change"] = 10**6
+    repo["velocity"]["last_commit_date"] = repo["collection_date"][:10]
+    repos.append(repo)
+    boundary = copy.deepcopy(base)
+    boundary["collection_date"] = "2026-03-31 12:00:00 UTC"
+    boundary["velocity"]["last_commit_date"] = "2026-03-01"
+    boundary["velocity"]["period_metrics"]["period_4"]["commit_count"] = 10
+    repos.append(boundary)
+    return repos
+
+# ==================== BATCH SCORING ====================
+def test_batch_scores_equal_score_repo(repo_records):
+    repos = variants(repo_records)
+    batch = score.score_repos(repos)
+    assert len(batch) == len(repos)
+    for repo, scores in zip(repos, batch):
+        expected = score.score_repo(repo)
+        assert scores == expected, repo["name"]
+        assert [type(value) for value in scores.values()] == [type(value) for value in expected.values()], repo["name"]
+
+def test_iter_scores_batches_keep_order(repo_records):
+    repos = variants(repo_records)
+    pairs = list(score.iter_scores(iter(repos), batch_size=4))
+    assert [repo for repo, _ in pairs] == repos
+    assert [scores for _, scores in pairs] == [score.score_repo(repo) for repo in repos]
@@ -0,0 +1,107 @@
+import json
+import pytest
+from storage import RepoStore
+
+@pytest.fixture
+def store(tmp_path):
+    return RepoStore(str(tmp_path / "repo_data.sqlite"), json_path=None)
+
+# ==================== REPOSITORY STORE ====================
+def test_put_keeps_the_position_of_a_stored_repo(store, repo_records):
+    for record in repo_records[:3]:
+        store.put(record)
+    names = [record["name"] for record in repo_records[:3]]
+
+    store.put({**repo_records[0], "collection_date": "2026-06-01 00:00:00 UTC"})
+    assert store.names() == names
+    assert store.get(names[0])["collection_date"] == "2026-06-01 00:00:00 UTC"
+
+    store.put(repo_records[3], position=-1)
+    assert store.names() == [repo_records[3]["name"]] + names
+
+def test_fields_added_outside_collection_survive_a_refresh(store, repo_records):
+    record = repo_records[0]
+    store.put(record)
+    store.import_records([{"name": record["name"], "classification": "Active", "classification_evidence": "releases"}])
+
+    refreshed = {**record, "collection_date": "2026-06-01 00:00:00 UTC"}
+    assert store.put(refreshed) == {**refreshed, "classification": "Active", "classification_evidence": "releases"}
+    assert store.get(record["name"])["classification"] == "Active"
+
+def test_repo_data_json_is_imported_once(tmp_path, repo_records):
+    json_path = tmp_path / "repo_data.json"
+    json_path.write_text(json.dumps(repo_records))
+    path = str(tmp_path / "repo_data.sqlite")
+
+    store = RepoStore(path, json_path=str(json_path))
+    assert list(store) == repo_records
+
+    # An existing store isn't overwritten by the JSON file again
+    store.put({**repo_records[0], "collection_date": "2026-06-01 00:00:00 UTC"})
+    json_path.write_text(json.dumps(repo_records[:1]))
+    reopened = RepoStore(path, json_path=str(json_path))
+    assert len(reopened) == len(repo_records)
+    assert reopened.get(repo_records[0]["name"])["collection_date"] == "2026-06-01 00:00:00 UTC"
+
+@pytest.mark.parametrize("count", [0, 1, 22])
+def test_export_matches_json_dump(tmp_path, store, repo_records, count):
+    store.import_records(repo_records[:count])
+    path = str(tmp_path / "export.json")
+    store.export_json(path)
+
+    with open(path, 'r') as f:
+        assert f.read() == json.dumps(repo_records[:count], indent=2)
+
+# ==================== SNAPSHOTS ====================
+def add_snapshots(store, name, snapshots):
+    """Snapshots of one repo from (collection date, health score, health band)"""
+    for collected_at, health_score, health_band in snapshots:
+        store.add_snapshot({"name": name, "collection_date": f"{collected_at} UTC"},
+                           {"health_score": health_score, "health_band": health_band})
+
+@pytest.fixture
+def snapshots(store):
+    # Baseline is the last snapshot on or before the date
+    add_snapshots(store, "a/dropped", [("2026-01-15 09:00:00", 80.0, "Healthy"), ("2026-03-20 09:00:00", 60.0, "Moderate"),
+                                       ("2026-05-01 09:00:00", 20.0, "Critical")])
+    # No snapshot before the date: baseline is the first one after it
+    add_snapshots(store, "b/new", [("2026-04-10 09:00:00", 30.0, "Declining"), ("2026-05-01 09:00:00", 55.0, "Moderate"),
+                                   ("2026-06-01 09:00:00", 52.0, "Moderate")])
+    # Unchanged band
+    add_snapshots(store, "c/steady", [("2026-02-01 09:00:00", 78.0, "Healthy"), ("2026-05-01 09:00:00", 76.0, "Healthy")])
+    return store
+
+def test_history_is_oldest_first_and_filtered_by_date(snapshots):
+    assert snapshots.history("a/dropped") == [
+        ("2026-01-15 09:00:00", 80.0, "Healthy"), ("2026-03-20 09:00:00", 60.0, "Moderate"), ("2026-05-01 09:00:00", 20.0, "Critical")
+    ]
+    assert snapshots.history("a/dropped", since="2026-03-20") == [
+        ("2026-03-20 09:00:00", 60.0, "Moderate"), ("2026-05-01 09:00:00", 20.0, "Critical")
+    ]
+    assert snapshots.history("missing/repo") == []
+
+def test_band_changes(snapshots):
+    changes = {change["name"]: change for change in snapshots.band_changes("2026-04-01")}
+    assert set(changes) == {"a/dropped", "b/new", "c/steady"}
+
+    dropped = changes["a/dropped"]
+    assert (dropped["from_date"], dropped["from_band"], dropped["to_date"], dropped["to_band"]) == (
+        "2026-03-20 09:00:00", "Moderate", "2026-05-01 09:00:00", "Critical")
+    assert dropped["change"] == -2
+
+    new = changes["b/new"]
+    assert (new["from_date"], new["from_score"], new["to_date"], new["to_score"]) == (
+        "2026-04-10 09:00:00", 30.0, "2026-06-01 09:00:00", 52.0)
+    assert new["change"] == 1
+
+    assert changes["c/steady"]["change"] == 0
+
+def test_snapshot_on_the_date_is_the_baseline(snapshots):
+    # A snapshot taken exactly at since is the baseline; before the first snapshot, the first one is
+    change = {change["name"]: change for change in snapshots.band_changes("2026-03-20 09:00:00")}["a/dropped"]
+    assert change["from_date"] == "2026-03-20 09:00:00"
+    assert snapshots.band_changes("2026-01-15 08:59:59")[0]["from_date"] == "2026-01-15 09:00:00"
+
+def test_band_drops_keeps_only_drops(snapshots):
+    assert [drop["name"] for drop in snapshots.band_drops("2026-04-01")] == ["a/dropped"]
+    assert snapshots.band_drops("2026-06-30") == []
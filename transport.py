@@ -0,0 +1,134 @@
+import time
+import threading
+from github.Requester import (
+    Requester,
+    RequestsResponse,
+    HTTPSRequestsConnectionClass,
+)
+from cache import CachedResponse, token_fingerprint
+
+# ==================== GITHUB CONNECTION ====================
+class GitHubConnection(HTTPSRequestsConnectionClass):
+    """HTTPS connection used by PyGithub for every GitHub API request.
+
+    Safe to share between threads (pending request state is per thread). Draws each
+    request (and the token it is sent with) from the shared request budget and, when a
+    response cache is installed, turns GETs into conditional requests answered from the
+    cache on 304. Every response is accounted in the call statistics, when installed.
+    """
+
+    budget = None
+    cache = None
+    stats = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = threading.local()
+
+    def request(self, verb, url, input, headers, stream=False):
+        self._pending.request = (verb, url, input, headers)
+        self._pending.waited = 0.0
+
+    def getresponse(self):
+        verb, url, input, headers = self._pending.request
+
+        # Revalidate cached GETs instead of downloading them again
+        cache_url = identity = entry = None
+        if self.cache is not None and verb == "GET":
+            cache_url = f"{self.protocol}://{self.host}:{self.port}{url}"
+            identity = self._identity(headers)
+            entry = self.cache.lookup(cache_url, identity)
+        if entry:
+            headers = {**headers, **self.cache.conditional_headers(entry)}
+
+        started = time.monotonic()
+        r = self._send(verb, url, input, headers)
+        response_headers = {k.lower(): v for k, v in r.headers.items()}
+        if self.stats is not None:
+            self._record(verb, url, r, entry, time.monotonic() - started)
+
+        if entry and r.status_code == 304:
+            return CachedResponse(self.cache.revalidated(entry, response_headers), entry["body"])
+
+        if self.cache is not None and verb == "GET" and r.status_code == 200:
+            self.cache.store(cache_url, response_headers, r.text, identity)
+
+        return RequestsResponse(r)
+
+    def _identity(self, headers):
+        """Token fingerprint for the response cache: the budget's whole pool (any token may send the revalidation), else the request's"""
+        if self.budget is not None:
+            return token_fingerprint(self.budget.pool.tokens)
+        return token_fingerprint([headers.get("Authorization")])
+
+    def _send(self, verb, url, input, headers):
+        if self.budget is None:
+            return self._request(verb, url, input, headers)
+
+        # The budget picks the token (from the pool) and paces the request from earlier responses' quota headers
+        resource = request_resource(url)
+        started = time.monotonic()
+        token = self.budget.acquire(resource)
+        self._pending.waited = time.monotonic() - started
+        r = None
+        try:
+            if token:
+                headers = {**headers, "Authorization": f"token {token}"}
+            r = self._request(verb, url, input, headers)
+            return r
+        finally:
+            if r is None:
+                self.budget.release(token, resource)
+            else:
+                self.budget.release(token, resource, r.status_code, {k.lower(): v for k, v in r.headers.items()})
+
+    def _record(self, verb, url, r, entry, seconds):
+        """Account one response: listing pages are REST arrays (or cached ones) and GraphQL queries"""
+        resource = request_resource(url)
+        body = entry["body"] if entry and r.status_code == 304 else r.text
+        retries = getattr(r.raw, "retries", None)
+        self.stats.record(
+            resource, r.status_code, seconds - self._pending.waited,
+            size=len(r.content),
+            page=resource == "graphql" or (verb == "GET" and body.startswith("[")),
+            retries=len(retries.history) if retries else 0,
+            waited=self._pending.waited
+        )
+
+    def _request(self, verb, url, input, headers):
+        return self.session.request(
+            verb,
+            f"{self.protocol}://{self.host}:{self.port}{url}",
+            headers=headers,
+            data=input,
+            timeout=self.timeout,
+            verify=self.verify,
+            allow_redirects=False,
+        )
+
+class GitHubHTTPConnection(GitHubConnection):
+    """GitHubConnection over plain HTTP (an API server without TLS, e.g. benchmark.py's stand-in server)"""
+
+    def __init__(self, host, port=None, *args, **kwargs):
+        super().__init__(host, port or 80, *args, **kwargs)
+        self.protocol = "http"
+        self.session.mount("http://", self.adapter)
+
+def request_resource(url):
+    """Rate-limit resource a request counts against"""
+    path = url.split('?')[0]
+    if path.endswith('/graphql'):
+        return "graphql"
+    if '/search/' in path:
+        return "search"
+    return "core"
+
+def install(budget=None, cache=None, stats=None):
+    """Route PyGithub clients created after this call through GitHubConnection"""
+    GitHubConnection.budget = budget
+    GitHubConnection.cache = cache
+    GitHubConnection.stats = stats
+    Requester.injectConnectionClasses(GitHubHTTPConnection, GitHubConnection)
+    # injectConnectionClasses also turns off connection reuse (it is meant for PyGithub's
+    # replay tests); switch it back on so one pooled session serves every request
+    Requester._Requester__persist = True